@@ -0,0 +1,246 @@
+"""Beykoz haber kayıtları: değişiklik geçmişi ve geri yükleme
+
+Yazıcı her yazmayı (ekleme, tablo düzenlemesi, temizleme) bir değişiklik
+bölümüne tek satır olarak ekler; veritabanı yeniden yazılmaz. Belirli
+aralıklarla tüm kayıtların sıkıştırılmış bir taban görüntüsü alınır ve yeni bir
+bölüm başlar. Bir ana geri dönmek için o andan önceki en yakın taban okunup
+yalnızca ondan sonraki değişiklikler uygulanır. Saklama süresinden eski
+tabanlar ve bölümleri silinir.
+
+Kullanım:
+    python anlik_goruntu.py --liste
+    python anlik_goruntu.py --geri-yukle "2026-10-18 14:30"
+"""
+import argparse
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from haber_veri import (
+    DATA_DIR, KIMLIK, KOLONLAR, VERI_DEPOSU, YAZMA_KILIDI,
+    VeriYazici, degisiklikleri_uygula, depo_olustur, kayit_metinleri, veri_hazirla,
+)
+from haber_kayit import tablo_birlestir
+
+GECMIS_KLASORU = os.path.join(DATA_DIR, "gecmis")
+
+# Değişiklik olduysa yeni taban en geç bu aralıkla (sn) ya da bölüm bu boyutu aşınca alınır
+TABAN_ARALIGI = 24 * 60 * 60
+BOLUM_BOYUT_SINIRI = 64 * 1024 * 1024
+
+# Bu kadar gün öncesine kadar her ana geri dönülebilir
+SAKLAMA_GUNU = int(os.getenv("GECMIS_SAKLAMA_GUN", "30"))
+
+# Dosya adlarındaki zaman (taban_<zaman>.csv.gz, degisiklik_<zaman>.jsonl)
+DOSYA_ZAMANI = "%Y%m%dT%H%M%S%f"
+
+def tablo_yaz(df, yol):
+    """Kayıtları (kimlikleriyle) sıkıştırılmış CSV olarak geçici dosyaya yazıp yerine taşı"""
+    metinler = kayit_metinleri(df)
+    metinler.insert(0, KIMLIK, df[KIMLIK].astype('int64').values)
+    metinler.to_csv(yol + ".tmp", index=False, encoding='utf-8', compression='gzip')
+    os.replace(yol + ".tmp", yol)
+
+class DegisiklikGecmisi:
+    """Taban görüntüleri ve değişiklik bölümlerinden oluşan geçmiş
+    
+    Bölüm satırları "başlık<TAB>veri" biçimindedir; başlık (zaman, işlem, kayıt
+    sayısı) veri ayrıştırılmadan okunabilir. Yazmalar yazıcının dosya kilidi
+    altında yapıldığından birden çok süreç aynı geçmişe yazabilir.
+    """
+    
+    def __init__(self, klasor=GECMIS_KLASORU, saklama_gunu=SAKLAMA_GUNU):
+        self.klasor = klasor
+        self.saklama_gunu = saklama_gunu
+        self._taban_yazimi = None
+        os.makedirs(self.klasor, exist_ok=True)
+    
+    def _dosyalar(self, onek, sonek):
+        """Klasördeki (zaman, yol) çiftleri, zamana göre sıralı"""
+        dosyalar = []
+        for ad in os.listdir(self.klasor):
+            if ad.startswith(onek) and ad.endswith(sonek):
+                try:
+                    zaman = datetime.strptime(ad[len(onek):-len(sonek)], DOSYA_ZAMANI)
+                except ValueError:
+                    continue
+                dosyalar.append((zaman, os.path.join(self.klasor, ad)))
+        return sorted(dosyalar)
+    
+    def tabanlar(self):
+        """Tamamlanmış taban görüntüleri: [(zaman, yol), ...]"""
+        return self._dosyalar("taban_", ".csv.gz")
+    
+    def bolumler(self):
+        """Değişiklik bölümleri: [(başlangıç zamanı, yol), ...]"""
+        return self._dosyalar("degisiklik_", ".jsonl")
+    
+    def en_eski(self):
+        """Geri dönülebilecek en eski an; taban yoksa None"""
+        tabanlar = self.tabanlar()
+        return tabanlar[0][0] if tabanlar else None
+    
+    # ---- Yazma (yazıcı iş parçacığında, dosya kilidi altında) ----
+    
+    def kaydet(self, islem, veri, adet):
+        """Değişikliği son bölümün sonuna ekle"""
+        bolumler = self.bolumler()
+        if not bolumler:
+            return
+        baslik = {"zaman": datetime.now().isoformat(timespec="microseconds"), "islem": islem, "adet": int(adet)}
+        satir = json.dumps(baslik, ensure_ascii=False) + "\t" + json.dumps(veri, ensure_ascii=False, default=str) + "\n"
+        with open(bolumler[-1][1], "a", encoding="utf-8") as f:
+            f.write(satir)
+    
+    def taban_gerekli(self):
+        """Hiç taban yoksa ya da son bölüm değişiklik içerip yeterince eskidi/büyüdüyse True"""
+        bolumler = self.bolumler()
+        if not bolumler or not self.tabanlar():
+            return self._taban_yazimi is None or not self._taban_yazimi.is_alive()
+        baslangic, yol = bolumler[-1]
+        boyut = os.path.getsize(yol)
+        return boyut > 0 and (
+            boyut > BOLUM_BOYUT_SINIRI or (datetime.now() - baslangic).total_seconds() > TABAN_ARALIGI
+        )
+    
+    def taban_baslat(self, df):
+        """Yeni bölümü hemen başlat, tabloyu arka planda taban olarak yaz
+        
+        Taban yazılamadan süreç kapanırsa bir önceki taban ve her iki bölüm
+        kullanılır; geri yükleme yine doğru sonuç verir.
+        """
+        zaman = datetime.now().strftime(DOSYA_ZAMANI)
+        open(os.path.join(self.klasor, f"degisiklik_{zaman}.jsonl"), "a").close()
+        
+        def yaz():
+            tablo_yaz(df, os.path.join(self.klasor, f"taban_{zaman}.csv.gz"))
+            self.eskileri_sil()
+        
+        self._taban_yazimi = threading.Thread(target=yaz, name="gecmis-taban")
+        self._taban_yazimi.start()
+    
+    def bekle(self):
+        """Süren taban yazımının bitmesini bekle"""
+        if self._taban_yazimi is not None:
+            self._taban_yazimi.join()
+    
+    def eskileri_sil(self):
+        """Saklama süresinin başını kapsayan tabandan eski dosyaları sil"""
+        sinir = datetime.now() - timedelta(days=self.saklama_gunu)
+        eskiler = [zaman for zaman, _ in self.tabanlar() if zaman <= sinir]
+        if not eskiler:
+            return
+        for ad in os.listdir(self.klasor):
+            parca = ad.split("_", 1)[-1].split(".", 1)[0]
+            try:
+                zaman = datetime.strptime(parca, DOSYA_ZAMANI)
+            except ValueError:
+                continue
+            if zaman < eskiler[-1]:
+                try:
+                    os.remove(os.path.join(self.klasor, ad))
+                except OSError:
+                    pass
+    
+    # ---- Okuma ----
+    
+    def _satirlar(self, yol, veri_dahil=True):
+        """Bölümdeki (başlık, veri) çiftleri; veri_dahil=False ise veri ayrıştırılmaz"""
+        with open(yol, encoding="utf-8") as f:
+            for satir in f:
+                baslik, _, veri = satir.rstrip("\n").partition("\t")
+                if not veri:
+                    # Yarım yazılmış son satır
+                    continue
+                yield json.loads(baslik), (json.loads(veri) if veri_dahil else None)
+    
+    def son_islemler(self, adet=20):
+        """Son değişikliklerin tablosu (en yenisi üstte): Zaman, İşlem, Kayıt"""
+        satirlar = []
+        for _, yol in reversed(self.bolumler()):
+            satirlar = [baslik for baslik, _ in self._satirlar(yol, veri_dahil=False)] + satirlar
+            if len(satirlar) >= adet:
+                break
+        tablo = pd.DataFrame(satirlar[-adet:][::-1], columns=["zaman", "islem", "adet"])
+        tablo["zaman"] = pd.to_datetime(tablo["zaman"])
+        return tablo.rename(columns={"zaman": "Zaman", "islem": "İşlem", "adet": "Kayıt"})
+    
+    def tablo(self, zaman):
+        """Kayıtların verilen andaki hali
+        
+        Andan önceki en yakın taban okunur, ardından yalnızca tabandan sonraki
+        bölümlerin o ana kadarki değişiklikleri uygulanır.
+        """
+        tabanlar = [(taban_zamani, yol) for taban_zamani, yol in self.tabanlar() if taban_zamani <= zaman]
+        if not tabanlar:
+            en_eski = self.en_eski()
+            raise ValueError(
+                f"{zaman:%d.%m.%Y %H:%M} için anlık görüntü yok"
+                + (f" (en eski: {en_eski:%d.%m.%Y %H:%M})" if en_eski else "")
+            )
+        taban_zamani, yol = tabanlar[-1]
+        df = veri_hazirla(pd.read_csv(yol, encoding='utf-8'))
+        
+        # Ardışık değişiklikler birikip tek seferde uygulanır
+        eklenenler, duzenlenenler, silinenler = [], {}, set()
+        
+        def uygula(df):
+            if eklenenler:
+                yeni = veri_hazirla(pd.DataFrame([kayit for parca in eklenenler for kayit in parca], columns=[KIMLIK] + KOLONLAR))
+                df = tablo_birlestir([df, yeni])
+            if duzenlenenler or silinenler:
+                df, _ = degisiklikleri_uygula(df, duzenlenenler, pd.DataFrame(columns=KOLONLAR), list(silinenler), 0)
+            eklenenler.clear()
+            duzenlenenler.clear()
+            silinenler.clear()
+            return df
+        
+        for bolum_zamani, bolum_yolu in self.bolumler():
+            if bolum_zamani < taban_zamani:
+                continue
+            for baslik, veri in self._satirlar(bolum_yolu):
+                if datetime.fromisoformat(baslik["zaman"]) > zaman:
+                    return uygula(df)
+                islem = baslik["islem"]
+                if islem == "temizle":
+                    df = uygula(df).iloc[0:0]
+                elif islem == "geri_yukle":
+                    # Bekleyen değişiklikler geri yüklenen tabloyla geçersizleşir
+                    uygula(df)
+                    df = self.tablo(datetime.fromisoformat(veri["hedef"]))
+                else:
+                    # Depolar düzenleme ve silmeleri eklemelerden önce uygular
+                    for kimlik, degerler in veri.get("duzenlenenler", {}).items():
+                        duzenlenenler.setdefault(int(kimlik), {}).update(degerler)
+                    silinenler.update(veri.get("silinenler", []))
+                    eklenenler.append(veri.get("kayitlar", []))
+        return uygula(df)
+
+def main():
+    ayristirici = argparse.ArgumentParser(description="Değişiklik geçmişini listele ya da verileri bir ana geri yükle")
+    ayristirici.add_argument("--liste", action="store_true", help="taban görüntülerini ve son değişiklikleri göster")
+    ayristirici.add_argument("--geri-yukle", type=datetime.fromisoformat, metavar="ZAMAN",
+                             help='verileri bu andaki haline getir (ör. "2026-10-18 14:30")')
+    ayristirici.add_argument("--depo", choices=["csv", "sqlite", "parquet"], default=VERI_DEPOSU)
+    argumanlar = ayristirici.parse_args()
+    
+    gecmis = DegisiklikGecmisi()
+    if argumanlar.geri_yukle is not None:
+        yazici = VeriYazici(depo_olustur(argumanlar.depo), YAZMA_KILIDI, gecmis=gecmis)
+        try:
+            adet = yazici.geri_yukle(argumanlar.geri_yukle)
+        except ValueError as hata:
+            ayristirici.error(str(hata))
+        gecmis.bekle()
+        print(f"Veriler {argumanlar.geri_yukle:%d.%m.%Y %H:%M} anındaki haline getirildi: {adet} kayıt")
+        return
+    
+    for zaman, yol in gecmis.tabanlar():
+        print(f"taban  {zaman:%d.%m.%Y %H:%M:%S}  {os.path.getsize(yol) / 1024:,.0f} KB")
+    print(gecmis.son_islemler().to_string(index=False))
+
+if __name__ == "__main__":
+    main()
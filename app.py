@@ -1,25 +1,9 @@
 import streamlit as st
+import importlib.util
 import os
-import pandas as pd
 from datetime import date, datetime, timedelta
-import io
 import time
-
-# FPDF için
-try:
-    from fpdf import FPDF
-except ImportError:
-    st.error("Lütfen 'gereksinimler.txt' dosyasındaki paketleri yükleyin: pip install -r gereksinimler.txt")
-    st.stop()
-
-# ==== 2. GÜVENLİ VERİTABANI YOLU ====
-# Veriler gizli klasörde saklanacak
-DATA_DIR = ".data"
-DOSYA_ADI = os.path.join(DATA_DIR, 'beykoz_haber_veritabani.csv')
-
-# Klasör yoksa oluştur
-if not os.path.exists(DATA_DIR):
-    os.makedirs(DATA_DIR)
+import uuid
 
 # ==== 3. ŞİFRE KONTROL SİSTEMİ ====
 def giris_kontrol():
@@ -74,6 +58,7 @@ def giris_kontrol():
                     st.session_state.kullanici_adi = kullanici
                     st.session_state.kullanici_rol = kullanici_bilgisi["role"]
                     st.session_state.kullanici_isim = kullanici_bilgisi["name"]
+                    st.session_state.kurum = kullanici_bilgisi.get("kurum", "")
                     st.session_state.giris_zamani = datetime.now()
                     
                     st.success(f"✅ Hoş geldiniz, {kullanici_bilgisi['name']}!")
@@ -101,6 +86,25 @@ def giris_kontrol():
 if not giris_kontrol():
     st.stop()
 
+# Giriş ekranı yalnızca Streamlit ile çizilir; veri, grafik, rapor ve API modülleri
+# girişten sonra yüklenir (süreçte bir kez, sonraki çalıştırmalar hazır modülü kullanır).
+# fpdf ve xlsxwriter ancak ilgili rapor hazırlanırken yüklenir.
+import pandas as pd
+import altair as alt
+
+from haber_veri import (
+    OLCUM_GUNLUGU, VERI_DEPOSU, ARSIV_UFKU_GUN, KIMLIK, KURUMLAR_KLASORU, GORUNUM_KOLONLARI, OZET_KOLONLARI,
+    ZAMAN_DILIMLERI, Filtre, Kurum, KurumHavuzu, VeriYazici, arsiv_siniri, buyuk_harf, depo_olustur,
+    donem_etiketleri, donem_karsilastirmasi, isi_haritasi, karsilastirma_araligi,
+    ozet_metrikleri, tablo_degisiklikleri, veri_kaydet, yakin_tekrarlar, zaman_dilimi_sec, zaman_serisi,
+)
+from haber_yazici import dosya_kilidi
+from haber_olcum import OLCUM_PENCERESI, OlcumDeposu, asama, satir_say
+from toplu_aktarim import toplu_aktar
+from anlik_goruntu import DegisiklikGecmisi
+from haber_api import API_PORTU, HaberApi, arka_planda_baslat
+from haber_rapor import RaporIsleri
+
 # ==== 5. SAYFA AYARLARI ====
 st.set_page_config(
     page_title="Beykoz Haber Rapor Sistemi",
@@ -123,6 +127,8 @@ def cikis_butonu_ekle():
                 st.markdown(f"**{st.session_state.kullanici_isim}**")
                 st.caption(f"@{st.session_state.kullanici_adi}")
                 st.caption(f"Rol: {st.session_state.kullanici_rol}")
+                if kurum_al().ad:
+                    st.caption(f"🏛️ {kurum_al().baslik}")
             
             # Oturum süresi
             if "giris_zamani" in st.session_state:
@@ -138,113 +144,409 @@ def cikis_butonu_ekle():
                 st.success("Başarıyla çıkış yaptınız!")
                 time.sleep(1)
                 st.rerun()
-
 # ==================== SİSTEM AYARLARI ====================
 
-# MÜDÜRLÜK LİSTESİ
-MUDURLUKLER = [
-    # ÖNCELİKLİ MÜDÜRLÜKLER
-    "Fen İşleri Müdürlüğü",
-    "Temizlik İşleri Müdürlüğü", 
-    "Zabıta Müdürlüğü",
-    "İşletme ve İştirakler Müdürlüğü",
-    "Özel Kalem Müdürlüğü",
-    "Kültür ve Sosyal İşler Müdürlüğü",
-    
-    # DİĞER MÜDÜRLÜKLER
-    "Afet İşleri ve Risk Yönetimi Müdürlüğü",
-    "Basın Yayın ve Halkla İlişkiler Müdürlüğü",
-    "Bilgi İşlem Müdürlüğü",
-    "Destek Hizmetleri Müdürlüğü",
-    "Emlak ve İstimlak Müdürlüğü",
-    "Gençlik ve Spor Hizmetleri Müdürlüğü",
-    "Hukuk İşleri Müdürlüğü",
-    "İklim Değişikliği ve Sıfır Atık Müdürlüğü",
-    "İmar ve Şehircilik Müdürlüğü",
-    "İnsan Kaynakları ve Eğitim Müdürlüğü",
-    "Kentsel Dönüşüm Müdürlüğü",
-    "Mali Hizmetler Müdürlüğü",
-    "Muhtarlık İşleri Müdürlüğü",
-    "Park ve Bahçeler Müdürlüğü",
-    "Plan ve Proje Müdürlüğü",
-    "Rehberlik ve Teftiş Kurulu Müdürlüğü",
-    "Ruhsat ve Denetim Müdürlüğü",
-    "Sağlık İşleri Müdürlüğü",
-    "Sosyal Yardım İşleri Müdürlüğü",
-    "Tarımsal Hizmetler Müdürlüğü",
-    "Ulaşım Hizmetleri Müdürlüğü",
-    "Veteriner İşleri Müdürlüğü",
-    "Yapı Kontrol Müdürlüğü",
-    "Yazı İşleri Müdürlüğü",
-    
-    # SON SEÇENEK
-    "Diğer"
-]
-
-HABER_KAYNAKLARI = [
-    "Beykoz Anlık", 
-    "Beykoz Burada", 
-    "Beykoz Duysun", 
-    "Beykoz Güncel", 
-    "Diğer"
-]
-
-# ==================== YARDIMCI FONKSİYONLAR ====================
-
-def tarih_formatla(tarih_obj):
-    """Tarihi güzel formatla"""
-    if isinstance(tarih_obj, str):
-        try:
-            tarih_obj = datetime.strptime(tarih_obj, '%Y-%m-%d').date()
-        except:
-            try:
-                tarih_obj = datetime.strptime(tarih_obj, '%d.%m.%Y').date()
-            except:
-                return str(tarih_obj)
-    
-    if hasattr(tarih_obj, 'strftime'):
-        gunler = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar"]
-        gun_adi = gunler[tarih_obj.weekday()]
-        return f"{tarih_obj.strftime('%d.%m.%Y')} {gun_adi}"
+# Kayıt tablosu sayfalama seçenekleri
+SAYFA_BOYUTLARI = [25, 50, 100, 250, 500]
+SIRALAMA_KOLONLARI = {
+    "Tarih": "Tarih",
+    KIMLIK: "Kayıt sırası",
+    "Müdürlük": "Müdürlük",
+    "Haber_Kaynagi": "Kaynak",
+    "Sayı": "Sayı",
+}
+
+# Arka planda hazırlanan rapor beklenirken sayfanın yenilenme aralığı (sn)
+RAPOR_YOKLAMA_ARALIGI = 1
+
+# Tekrar raporunda ekranda gösterilen en fazla satır (indirilen dosya tamamını içerir)
+TEKRAR_GOSTERIM_SINIRI = 500
+
+# ==================== KURUMLAR ====================
+
+def kurum_ayarlari(ad):
+    """Kurumun secrets.toml'daki ayarları ([kurumlar.<ad>]: baslik, dizin, mudurlukler, haber_kaynaklari)
     
-    return str(tarih_obj)
+    Kullanıcının kurumu [users.<kullanıcı>] altındaki kurum anahtarıyla belirlenir;
+    kurumu olmayan kullanıcılar varsayılan kurumun (DATA_DIR) verisiyle çalışır.
+    """
+    if not ad:
+        return {}
+    try:
+        return dict(st.secrets.get("kurumlar", {}).get(ad, {}))
+    except FileNotFoundError:
+        return {}
+
+@st.cache_resource
+def kurum_olustur(ad):
+    """Süreç genelinde kurum nesnesi (kurum başına bir tane)"""
+    return Kurum(ad, **kurum_ayarlari(ad))
+
+def kurum_al():
+    """Oturumdaki kullanıcının kurumu"""
+    return kurum_olustur(st.session_state.get("kurum", ""))
+
+@st.cache_resource
+def kurum_havuzu():
+    """Kurumların depolarını bellek sınırı içinde tutan havuz"""
+    return KurumHavuzu()
+
+# ==================== VERİ ERİŞİMİ ====================
+
+@st.cache_resource
+def paylasilan_depo(veri_deposu, kurum_adi):
+    """Süreçteki tüm oturumların ve yazıcının paylaştığı depo (depo türü ve kurum başına bir tane)"""
+    kurum = kurum_olustur(kurum_adi)
+    depo = depo_olustur(veri_deposu, kurum)
+    if veri_deposu in ("sqlite", "parquet") and os.path.exists(kurum.dosya_adi):
+        with dosya_kilidi(kurum.yazma_kilidi):
+            depo.csv_den_aktar(kurum.dosya_adi)
+    return depo
+
+def depo_al():
+    """Kullanıcının kurumunun veri deposu (VERI_DEPOSU ayarına göre CSV, SQLite veya Parquet)
+    
+    Depo ve bellekteki verisi süreç genelinde kurum başına tektir; oturumlar her
+    çalıştırmada yayımlanmış son kopyayı okur, yazmalar yazıcı üzerinden yeni
+    kopya yayımlar. Kurum havuzu uzun süredir kullanılmayan kurumların bellekteki
+    verisini sınır aşılınca boşaltır.
+    """
+    if VERI_DEPOSU == "parquet" and importlib.util.find_spec("pyarrow") is None:
+        st.error("Parquet deposu için pyarrow gerekli: pip install pyarrow")
+        st.stop()
+    kurum = kurum_al()
+    return kurum_havuzu().kullan((VERI_DEPOSU, kurum.ad), paylasilan_depo(VERI_DEPOSU, kurum.ad))
+
+@st.cache_resource
+def veri_yazici(veri_deposu, kurum_adi):
+    """Kurumun tüm oturumlarının paylaştığı yazıcı (depo türü ve kurum başına bir tane)"""
+    kurum = kurum_olustur(kurum_adi)
+    return VeriYazici(paylasilan_depo(veri_deposu, kurum_adi), kurum.yazma_kilidi, gecmis=degisiklik_gecmisi(kurum_adi))
+
+@st.cache_resource
+def degisiklik_gecmisi(kurum_adi):
+    """Kurumun yazmalarının kaydedildiği, geri yüklemede kullanılan değişiklik geçmişi"""
+    return DegisiklikGecmisi(kurum_olustur(kurum_adi).yol("gecmis"))
+
+def yazici_al():
+    """Yazma işlemleri için kurumun süreç genelindeki yazıcısı"""
+    depo_al()  # bağımlılık kontrolü ve ilk taşıma yazıcıdan önce yapılır
+    return veri_yazici(VERI_DEPOSU, kurum_al().ad)
+
+@st.cache_resource
+def gunluk_arsivleme(gun, kurum_adi):
+    """Günün ilk çalıştırmasında ufku geçen kayıtları arka planda arşive taşı (süreç ve kurum başına günde bir kez)"""
+    return yazici_al().arsivle(arsiv_siniri(gun), bekle=False)
+
+def arsivleme_baslat():
+    """CSV deposunda eski kayıtların arşive taşınmasını başlat; sayfa taşımayı beklemez"""
+    if VERI_DEPOSU == "csv" and ARSIV_UFKU_GUN > 0:
+        gunluk_arsivleme(date.today(), kurum_al().ad)
+
+def api_deposu(kurum_adi):
+    """JSON API isteğindeki kurumun paylaşılan deposu; tanımsız kurumda None"""
+    if kurum_adi and not kurum_ayarlari(kurum_adi) and not os.path.isdir(os.path.join(KURUMLAR_KLASORU, kurum_adi)):
+        return None
+    return kurum_havuzu().kullan((VERI_DEPOSU, kurum_adi), paylasilan_depo(VERI_DEPOSU, kurum_adi))
+
+@st.cache_resource
+def api_sunucusu(port):
+    """JSON API'yi bu süreçte başlat (süreç başına bir kez); depolar oturumlarla paylaşılır
+    
+    Port kullanımdaysa (ör. API ayrı süreçte çalışıyorsa) None döner.
+    """
+    try:
+        return arka_planda_baslat(HaberApi(api_deposu), port=port)
+    except OSError:
+        return None
+
+def api_baslat():
+    """HABER_API_PORTU ayarlıysa pano ekranları için JSON API'yi başlat"""
+    if API_PORTU:
+        api_sunucusu(int(API_PORTU))
 
 def veri_yukle():
     """Veritabanını yükle, yoksa oluştur"""
-    if not os.path.exists(DOSYA_ADI):
-        # Yeni veritabanı oluştur
-        kolonlar = ["Tarih", "Müdürlük", "Haber_Kaynagi", "Sayı", "Ayrıntı", "Kayit_Zamani"]
-        df = pd.DataFrame(columns=kolonlar)
-        df.to_csv(DOSYA_ADI, index=False, encoding='utf-8-sig')
-        return df
-    
-    # Mevcut veritabanını oku
-    try:
-        df = pd.read_csv(DOSYA_ADI, encoding='utf-8-sig')
-    except:
-        df = pd.read_csv(DOSYA_ADI)
-    
-    return df.fillna("")
+    return depo_al().yukle()
+
+# ==================== RAPORLAR ====================
+
+@st.cache_resource
+def rapor_isleri():
+    """Süreç genelinde paylaşılan dışa aktarma iş kuyruğu"""
+    return RaporIsleri()
+
+def rapor_alani(tur, filtre, hazirla_etiketi, indir_etiketi, uzanti, mime):
+    """Raporun hazırlama butonu, ilerlemesi ya da indirme butonu
+    
+    Rapor arka planda hazırlanır; aynı filtre ve veri için başka bir oturumun
+    başlattığı iş ya da hazır dosya kullanılır. İş sürerken sayfa, sonunda kısa
+    aralıklarla yenilenir (bekleyen_rapor).
+    """
+    depo = depo_al()
+    anahtar = (tur, VERI_DEPOSU, kurum_al().ad, filtre, depo.surum())
+    is_ = rapor_isleri().al(anahtar, tur)
+    
+    if is_ is None or is_.durum == "hata":
+        if is_ is not None:
+            st.error(f"❌ Rapor hazırlanamadı: {is_.hata}")
+        if not st.button(hazirla_etiketi, use_container_width=True):
+            return
+        is_ = rapor_isleri().gonder(anahtar, tur, depo, filtre, kurum_al())
+    
+    if not is_.bitti:
+        st.progress(is_.ilerleme, text=f"Hazırlanıyor... %{is_.ilerleme * 100:.0f}")
+        st.session_state.bekleyen_rapor = True
+    elif is_.durum == "hazir":
+        st.download_button(
+            label=indir_etiketi,
+            data=is_.oku(),
+            file_name=f"beykoz_rapor_{date.today().strftime('%Y%m%d')}{uzanti}",
+            mime=mime,
+            use_container_width=True
+        )
 
-def veri_kaydet(tarih, mudurlukler, kaynak, sayi, ayrinti):
-    """Yeni kayıt ekle"""
-    kayitlar = []
-    for mudurluk in mudurlukler:
-        kayitlar.append({
-            "Tarih": tarih,
-            "Müdürlük": mudurluk,
-            "Haber_Kaynagi": kaynak,
-            "Sayı": sayi,
-            "Ayrıntı": ayrinti,
-            "Kayit_Zamani": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        })
-    
-    yeni_df = pd.DataFrame(kayitlar)
-    
-    # CSV'ye ekle
-    yeni_df.to_csv(DOSYA_ADI, mode='a', header=not os.path.exists(DOSYA_ADI), index=False, encoding='utf-8-sig')
+# ==================== GRAFİKLER ====================
+
+def dilim_adi(dilim):
+    return "Otomatik" if dilim == "otomatik" else ZAMAN_DILIMLERI[dilim][0]
+
+def isi_haritasi_grafigi(ozet_df, dilim, baslangic, bitis):
+    """Müdürlük × dönem ısı haritası; müdürlükler toplam habere göre, dönemler aralığın tamamı"""
+    tablo = isi_haritasi(ozet_df, dilim)
+    donemler = pd.period_range(baslangic, bitis, freq=ZAMAN_DILIMLERI[dilim][1]).start_time
+    etiketler = donem_etiketleri(donemler, dilim)
+    tablo['Dönem'] = tablo['Dönem'].map(dict(zip(donemler, etiketler)))
+    tablo['Müdürlük'] = tablo['Müdürlük'].astype(str)
+    sira = tablo.groupby('Müdürlük')['Sayı'].sum().sort_values(ascending=False).index.tolist()
+    return alt.Chart(tablo).mark_rect().encode(
+        x=alt.X('Dönem:O', sort=etiketler, scale=alt.Scale(domain=etiketler), title=None),
+        y=alt.Y('Müdürlük:N', sort=sira, title=None),
+        color=alt.Color('Sayı:Q', scale=alt.Scale(scheme='orangered'), title="Haber"),
+        tooltip=['Müdürlük', alt.Tooltip('Dönem:O', title=ZAMAN_DILIMLERI[dilim][0]), alt.Tooltip('Sayı:Q', title="Haber")],
+    ).properties(height=max(160, 20 * len(sira)))
+
+def donem_karsilastirma_alani(filtre):
+    """Müdürlük başına filtrenin son dönemi ile önceki dönemin karşılaştırması (ör. bu hafta / geçen hafta)
+    
+    Müdürlük, kaynak ve arama filtresi korunur; aralık bitiş tarihinin dönemiyle önceki
+    dönemden oluşur, başlangıç tarihine bakılmaz.
+    """
+    dilim = st.selectbox(
+        "Karşılaştırılan dönem", list(ZAMAN_DILIMLERI), index=1, format_func=dilim_adi, key="karsilastirma_dilimi"
+    )
+    onceki_baslangic, onceki_bitis, son_baslangic = karsilastirma_araligi(filtre.bitis, dilim)
+    with asama("karsilastirma"):
+        tablo = donem_karsilastirmasi(
+            depo_al().ozet(filtre._replace(baslangic=onceki_baslangic)), dilim, filtre.bitis
+        )
     
-    return len(kayitlar)
+    st.caption(
+        f"↕️ {son_baslangic:%d.%m.%Y}–{filtre.bitis:%d.%m.%Y} ile "
+        f"{onceki_baslangic:%d.%m.%Y}–{onceki_bitis:%d.%m.%Y} (önceki dönemin aynı uzunluktaki kısmı)"
+    )
+    if tablo.empty:
+        st.caption("Bu iki dönemde kayıt yok.")
+        return
+    bu_donem, onceki = int(tablo["Bu dönem"].sum()), int(tablo["Önceki dönem"].sum())
+    st.metric(f"Bu {dilim_adi(dilim).lower()} toplam haber", bu_donem, bu_donem - onceki)
+    st.dataframe(
+        tablo, hide_index=True, use_container_width=True,
+        column_config={"Değişim %": st.column_config.NumberColumn(format="%.1f")}
+    )
+
+# ==================== ÖLÇÜM ====================
+
+@st.cache_resource
+def olcum_deposu():
+    """Süreç genelindeki ölçüm penceresi ve günlüğü"""
+    return OlcumDeposu(OLCUM_GUNLUGU)
+
+def olcum_baslat():
+    """Bu çalıştırmanın ölçümünü başlat
+    
+    Önceki çalıştırma st.rerun ile yarıda kaldıysa (sonuna ulaşmadıysa) o
+    haliyle kesildi olarak kaydedilir.
+    """
+    onceki = st.session_state.get("calisma_olcumu")
+    if onceki is not None:
+        olcum_deposu().bitir(onceki, kesildi=True)
+    if "oturum_kimligi" not in st.session_state:
+        st.session_state.oturum_kimligi = uuid.uuid4().hex[:8]
+    olcum = olcum_deposu().baslat(st.session_state.oturum_kimligi, st.session_state.kullanici_adi)
+    st.session_state.calisma_olcumu = olcum
+    return olcum
+
+def performans_paneli():
+    """Yöneticiler için kenar çubuğunda aşama başına p50/p95 süreler"""
+    if st.session_state.kullanici_rol != "admin":
+        return
+    with st.sidebar.expander("⏱️ Performans"):
+        # CSV deposunda arşive taşınmış kayıtlar
+        arsiv = getattr(depo_al(), "arsiv", None)
+        if arsiv is not None and arsiv.bilgi()["bolumler"]:
+            bolumler = arsiv.bilgi()["bolumler"]
+            st.caption(f"🗄️ Arşiv: {len(bolumler)} ay, {sum(bolum['kayit'] for bolum in bolumler.values()):,} kayıt")
+        # Kurumların bellekte tuttuğu veri (sınır aşılınca en uzun süredir kullanılmayanlar boşaltılır)
+        havuz = kurum_havuzu()
+        bellek = havuz.bellek()
+        st.caption(
+            f"🏛️ Bellek: {len(bellek)} kurum, {sum(bellek.values()) / 2**20:,.0f} / {havuz.sinir / 2**20:,.0f} MB"
+            + (f" • {havuz.bosaltilan} boşaltma" if havuz.bosaltilan else "")
+        )
+        tablo = olcum_deposu().yuzdelikler()
+        if tablo.empty:
+            st.caption("Henüz ölçüm yok.")
+            return
+        st.dataframe(tablo, hide_index=True, use_container_width=True)
+        son = olcum_deposu().son_kayitlar(1)[0]
+        st.caption(
+            f"Aşama başına son {OLCUM_PENCERESI} ölçüm • Son çalıştırma: {son['toplam_ms']:.0f} ms, "
+            f"{son['satirlar'].get('filtrelenen', 0)} kayıt"
+        )
+
+# ==================== GERİ YÜKLEME ====================
+
+def geri_yukleme_paneli():
+    """Yöneticiler için kenar çubuğunda verileri geçmişteki bir ana döndürme"""
+    if st.session_state.kullanici_rol != "admin":
+        return
+    # Onay kutusu çizilmeden önce sıfırlanır (geri yükleme sonrası)
+    if st.session_state.pop("geri_yukleme_sifirla", False):
+        st.session_state.geri_yukleme_onayi = False
+    
+    with st.sidebar.expander("🕓 Geri Yükleme"):
+        gecmis = degisiklik_gecmisi(kurum_al().ad)
+        en_eski = gecmis.en_eski()
+        if en_eski is None:
+            st.caption("Henüz anlık görüntü yok; ilk kayıtla birlikte alınır.")
+            return
+        st.caption(f"{en_eski.strftime('%d.%m.%Y %H:%M')} sonrasındaki herhangi bir ana dönülebilir.")
+        if st.checkbox("Son değişiklikleri göster", key="gecmis_goster"):
+            st.dataframe(gecmis.son_islemler(), hide_index=True, use_container_width=True)
+        
+        gun = st.date_input(
+            "📅 Tarih", value=date.today(), min_value=en_eski.date(), max_value=date.today(),
+            format="DD/MM/YYYY", key="geri_yukleme_tarihi"
+        )
+        saat = st.time_input("🕓 Saat", value=datetime.now().time().replace(second=0, microsecond=0), key="geri_yukleme_saati", step=60)
+        onay = st.checkbox("Mevcut veriler bu anki halleriyle değiştirilsin", key="geri_yukleme_onayi")
+        if st.button("🕓 Geri Yükle", use_container_width=True, disabled=not onay):
+            hedef = datetime.combine(gun, saat)
+            try:
+                with st.spinner("Veriler geri yükleniyor..."), asama("geri_yukleme"):
+                    adet = yazici_al().geri_yukle(hedef)
+            except ValueError as hata:
+                st.error(f"❌ {hata}")
+                return
+            st.session_state.geri_yukleme_sonucu = (hedef, adet)
+            st.session_state.geri_yukleme_sifirla = True
+            st.rerun()
+        
+        if "geri_yukleme_sonucu" in st.session_state:
+            hedef, adet = st.session_state.geri_yukleme_sonucu
+            st.success(f"✅ Veriler {hedef.strftime('%d.%m.%Y %H:%M')} anındaki haline getirildi ({adet:,} kayıt)")
+
+# ==================== TOPLU AKTARIM ====================
+
+def toplu_aktarim_paneli():
+    """Yöneticiler için kenar çubuğunda Excel/CSV arşivinden toplu içe aktarma"""
+    if st.session_state.kullanici_rol != "admin":
+        return
+    with st.sidebar.expander("📥 Toplu İçe Aktarma"):
+        dosya = st.file_uploader(
+            "Excel veya CSV arşivi", type=["xlsx", "csv"], key="toplu_aktarim_dosyasi",
+            help="Tarih ve Müdürlük kolonları zorunludur; Haber Kaynağı, Sayı ve Ayrıntı isteğe bağlıdır."
+        )
+        kuru = st.checkbox("Yalnızca doğrula (kaydetme)", key="toplu_aktarim_kuru")
+        if dosya is not None and st.button("📥 İçe Aktar", use_container_width=True):
+            cubuk = st.progress(0.0, text="Okunuyor...")
+            
+            def ilerleme(sonuc, oran):
+                cubuk.progress(
+                    min(oran or 0.0, 1.0),
+                    text=f"{sonuc.okunan:,} satır okundu, {sonuc.hatali:,} hatalı"
+                )
+            
+            try:
+                with asama("toplu_aktarim"):
+                    sonuc = toplu_aktar(
+                        dosya, yazici_al(), dosya_adi=dosya.name, kuru=kuru, ilerleme=ilerleme, kurum=kurum_al()
+                    )
+            except ValueError as hata:
+                cubuk.empty()
+                st.error(f"❌ {hata}")
+                return
+            satir_say("aktarilan", sonuc.eklenen)
+            st.session_state.toplu_aktarim_sonucu = (sonuc, kuru)
+            st.rerun()
+        
+        if "toplu_aktarim_sonucu" in st.session_state:
+            sonuc, kuru_calisma = st.session_state.toplu_aktarim_sonucu
+            eylem = "geçerli (kaydedilmedi)" if kuru_calisma else "eklendi"
+            st.success(
+                f"✅ {sonuc.dosya_adi}: {sonuc.okunan:,} satır okundu, "
+                f"{sonuc.eklenen:,} kayıt {eylem} ({sonuc.sure:.1f} sn)"
+            )
+            if sonuc.tekrar:
+                st.info(f"ℹ️ {sonuc.tekrar:,} kayıt zaten kayıtlı olduğu için atlandı")
+            if sonuc.yazma_hatasi:
+                st.error(f"❌ {sonuc.yazilamayan:,} kayıt yazılamadı: {sonuc.yazma_hatasi}")
+            if sonuc.hatali:
+                st.warning(f"⚠️ {sonuc.hatali:,} satır hatalı, aktarılmadı")
+                st.dataframe(sonuc.hata_tablosu().head(20), hide_index=True, use_container_width=True)
+                st.download_button(
+                    "📄 Hata Raporunu İndir",
+                    data=sonuc.hata_csv(),
+                    file_name=f"aktarim_hatalari_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
+                    mime="text/csv",
+                    use_container_width=True,
+                )
+
+# ==================== TEKRAR RAPORU ====================
+
+def tekrar_raporu(filtre):
+    """Yöneticiler için filtredeki olası tekrar kayıtlar (aynı gün, müdürlük, kaynak ve Ayrıntı)"""
+    if st.session_state.kullanici_rol != "admin":
+        return
+    with st.expander("🔁 Olası Tekrar Kayıtlar"):
+        if not st.checkbox("Filtredeki kayıtlarda tekrarları ara", key="tekrar_ara"):
+            st.caption("Aynı gün, müdürlük ve kaynakta Ayrıntı'sı yalnızca yazımca farklı kayıtlar listelenir.")
+            return
+        
+        # Aynı filtre ve veri sürümü için rapor yeniden hesaplanmaz
+        depo = depo_al()
+        anahtar = (filtre, depo.surum())
+        onceki = st.session_state.get("tekrar_raporu")
+        if onceki is not None and onceki[0] == anahtar:
+            tablo = onceki[1]
+        else:
+            with asama("tekrar_raporu"):
+                tablo = yakin_tekrarlar(depo.sorgula(filtre, kolonlar=GORUNUM_KOLONLARI + ["Kayit_Zamani"]))
+            st.session_state.tekrar_raporu = (anahtar, tablo)
+        
+        if tablo.empty:
+            st.success("✅ Olası tekrar kayıt bulunamadı.")
+            return
+        grup_sayisi = int(tablo["Grup"].max())
+        st.warning(
+            f"⚠️ {grup_sayisi:,} grupta {len(tablo):,} kayıt; "
+            f"her gruptan biri dışında {len(tablo) - grup_sayisi:,} kayıt tekrar olabilir."
+        )
+        st.dataframe(
+            tablo.head(TEKRAR_GOSTERIM_SINIRI),
+            hide_index=True,
+            use_container_width=True,
+            column_config={"Tarih": st.column_config.DateColumn("Tarih", format="DD/MM/YYYY")}
+        )
+        st.download_button(
+            "📄 Tekrar Raporunu İndir",
+            data=tablo.to_csv(index=False).encode("utf-8-sig"),
+            file_name=f"olasi_tekrarlar_{date.today().strftime('%Y%m%d')}.csv",
+            mime="text/csv",
+        )
+
+# ==================== FORM ====================
 
 def kayit_formu_kaydet():
     """Formdaki verileri kaydet"""
@@ -262,34 +564,55 @@ def kayit_formu_kaydet():
             return False
         kaynak = diger_kaynak
     
-    # Kaydet
-    eklenen_sayi = veri_kaydet(
-        st.session_state.form_tarih,
-        st.session_state.form_mudurlukler,
-        kaynak,
-        st.session_state.form_sayi,
-        st.session_state.form_ayrinti
-    )
+    # Kaydet: eşzamanlı gönderimler yazıcıda tek yazmada birleştirilir; bu oturumdan
+    # aynı içerikle daha önce gönderilmiş kayıtlar (çift tıklama, yeniden çalıştırma) yazılmaz
+    with asama("kayit_formu"):
+        eklenen_kimlikler = veri_kaydet(
+            yazici_al(),
+            st.session_state.form_tarih,
+            st.session_state.form_mudurlukler,
+            kaynak,
+            st.session_state.form_sayi,
+            st.session_state.form_ayrinti,
+            oturum=st.session_state.oturum_kimligi,
+        )
     
     # Başarı mesajı
-    st.toast(f"✅ {eklenen_sayi} kayıt başarıyla eklendi!", icon="✅")
+    tekrar_sayisi = len(st.session_state.form_mudurlukler) - len(eklenen_kimlikler)
+    if eklenen_kimlikler:
+        st.toast(f"✅ {len(eklenen_kimlikler)} kayıt başarıyla eklendi!", icon="✅")
+    if tekrar_sayisi:
+        st.toast(f"ℹ️ {tekrar_sayisi} kayıt bu oturumda zaten kaydedilmişti, tekrar eklenmedi.", icon="ℹ️")
     
-    # Formu temizle
-    st.session_state.form_sayi = 1
-    st.session_state.form_ayrinti = ""
-    st.session_state.diger_kaynak = ""
+    # Formu temizle (form alanları çizildikten sonra değiştirilemez, sonraki çalıştırmada sıfırlanır)
+    st.session_state.form_sifirla = True
     
     return True
 
 # ==================== ANA UYGULAMA ====================
 
-st.title("📊 BEYKOZ HABER TAKİP SİSTEMİ")
+# Çalıştırma ölçümü; depo ve rapor kodu da bu ölçüme aşama ekler
+olcum = olcum_baslat()
+
+# Eski kayıtlar arşive taşınırken sorgular arşivi kendiliğinden kapsar
+arsivleme_baslat()
+
+# Pano ekranlarının yokladığı JSON API (ayarlıysa)
+api_baslat()
+
+st.title(f"📊 {buyuk_harf(kurum_al().baslik)} HABER TAKİP SİSTEMİ")
 st.markdown("---")
 
 # SİDEBAR - VERİ GİRİŞİ
 with st.sidebar:
     st.header("📝 Yeni Kayıt")
     
+    # Kaydet/Temizle sonrası alanlar çizilmeden önce sıfırlanır
+    if st.session_state.pop("form_sifirla", False):
+        st.session_state.form_sayi = 1
+        st.session_state.form_ayrinti = ""
+        st.session_state.diger_kaynak = ""
+    
     with st.form("yeni_kayit_formu", border=True):
         # Tarih
         st.date_input(
@@ -302,7 +625,7 @@ with st.sidebar:
         # Müdürlük seçimi
         st.multiselect(
             "🏢 Müdürlükler",
-            options=MUDURLUKLER,
+            options=kurum_al().mudurlukler,
             key="form_mudurlukler",
             placeholder="Seçiniz..."
         )
@@ -310,7 +633,7 @@ with st.sidebar:
         # Kaynak
         kaynak_sec = st.selectbox(
             "📱 Kaynak",
-            options=HABER_KAYNAKLARI,
+            options=kurum_al().haber_kaynaklari,
             key="form_kaynak"
         )
         
@@ -358,21 +681,10 @@ with st.sidebar:
                 st.rerun()
         
         if temizle_btn:
-            st.session_state.form_sayi = 1
-            st.session_state.form_ayrinti = ""
-            st.session_state.diger_kaynak = ""
+            st.session_state.form_sifirla = True
             st.rerun()
 
 # ANA SAYFA İÇERİĞİ
-# Verileri yükle
-df = veri_yukle()
-
-if not df.empty:
-    try:
-        df['Tarih'] = pd.to_datetime(df['Tarih']).dt.date
-    except:
-        pass
-
 # FİLTRELEME PANELİ
 st.subheader("🔍 Filtrele ve Rapor Al")
 
@@ -395,196 +707,198 @@ with filtre_kolon2:
 with filtre_kolon3:
     secilen_mudurlukler = st.multiselect(
         "Müdürlük",
-        MUDURLUKLER,
+        kurum_al().mudurlukler,
         placeholder="Tümü"
     )
 
 with filtre_kolon4:
     secilen_kaynaklar = st.multiselect(
         "Kaynak",
-        HABER_KAYNAKLARI,
+        kurum_al().haber_kaynaklari,
         placeholder="Tümü"
     )
 
+arama_metni = st.text_input(
+    "🔎 Ayrıntıda Ara",
+    placeholder="ör. çöp, yol çalışması",
+    help="Büyük/küçük harf ve Türkçe karakter farkı gözetilmez; kelime başları da eşleşir (ör. 'calis' → 'çalışması')."
+)
+
 # Verileri filtrele
-if not df.empty:
-    try:
-        # Tarih filtresi
-        mask = (df['Tarih'] >= baslangic_tarihi) & (df['Tarih'] <= bitis_tarihi)
-        
-        # Müdürlük filtresi
-        if secilen_mudurlukler:
-            mask &= df['Müdürlük'].isin(secilen_mudurlukler)
-        
-        # Kaynak filtresi
-        if secilen_kaynaklar:
-            mask &= df['Haber_Kaynagi'].isin(secilen_kaynaklar)
-        
-        filtrelenmis_df = df[mask].copy()
-        
-    except Exception as e:
-        st.error(f"Filtreleme hatası: {e}")
-        filtrelenmis_df = pd.DataFrame()
-else:
-    filtrelenmis_df = pd.DataFrame()
+filtre = Filtre(
+    baslangic=baslangic_tarihi,
+    bitis=bitis_tarihi,
+    mudurlukler=tuple(secilen_mudurlukler),
+    kaynaklar=tuple(secilen_kaynaklar),
+    arama=arama_metni.strip()
+)
+
+# Kartlar ve grafikler günlük özetten hesaplanır (kayıt sayısından bağımsız)
+try:
+    with asama("ozet"):
+        ozet_df = depo_al().ozet(filtre)
+except Exception as e:
+    st.error(f"Özet hatası: {e}")
+    ozet_df = pd.DataFrame(columns=OZET_KOLONLARI)
+
+# Filtreye uyan kayıt sayısı da özetten gelir; tablo yalnızca görüntülenen sayfayı okur
+kayit_sayisi = int(ozet_df['Kayit'].sum()) if not ozet_df.empty else 0
+satir_say("filtrelenen", kayit_sayisi)
 
 # İSTATİSTİK KARTLARI
-if not filtrelenmis_df.empty:
+if kayit_sayisi:
     st.markdown("---")
     
     istatistik1, istatistik2, istatistik3, istatistik4 = st.columns(4)
     
+    metrikler = ozet_metrikleri(ozet_df)
+    
     with istatistik1:
-        toplam_kayit = len(filtrelenmis_df)
-        toplam_sayi = filtrelenmis_df['Sayı'].sum()
-        st.metric("📈 Toplam Haber", toplam_sayi, f"{toplam_kayit} kayıt")
+        st.metric("📈 Toplam Haber", metrikler["toplam_sayi"], f"{metrikler['toplam_kayit']} kayıt")
     
     with istatistik2:
-        mudurluk_sayisi = filtrelenmis_df['Müdürlük'].nunique()
-        st.metric("🏢 Müdürlük Sayısı", mudurluk_sayisi)
+        st.metric("🏢 Müdürlük Sayısı", metrikler["mudurluk_sayisi"])
     
     with istatistik3:
-        kaynak_sayisi = filtrelenmis_df['Haber_Kaynagi'].nunique()
-        st.metric("📱 Kaynak Sayısı", kaynak_sayisi)
+        st.metric("📱 Kaynak Sayısı", metrikler["kaynak_sayisi"])
     
     with istatistik4:
-        gun_sayisi = filtrelenmis_df['Tarih'].nunique()
-        st.metric("📅 Gün Sayısı", gun_sayisi)
+        st.metric("📅 Gün Sayısı", metrikler["gun_sayisi"])
 
 # VERİ TABLOSU
 st.markdown("---")
 st.subheader("📋 Kayıtlar")
 
-if not filtrelenmis_df.empty:
-    # Düzenlenebilir tablo
-    duzenlenmis_df = st.data_editor(
-        filtrelenmis_df[['Tarih', 'Müdürlük', 'Haber_Kaynagi', 'Sayı', 'Ayrıntı']],
-        use_container_width=True,
-        hide_index=True,
-        num_rows="dynamic",
-        column_config={
-            "Tarih": st.column_config.DateColumn(
-                "Tarih",
-                format="DD/MM/YYYY",
-                required=True
-            ),
-            "Müdürlük": st.column_config.SelectboxColumn(
-                "Müdürlük",
-                options=MUDURLUKLER,
-                required=True
-            ),
-            "Haber_Kaynagi": st.column_config.TextColumn(
-                "Kaynak",
-                required=True
-            ),
-            "Sayı": st.column_config.NumberColumn(
-                "Sayı",
-                min_value=1,
-                required=True
-            ),
-            "Ayrıntı": st.column_config.TextColumn(
-                "Ayrıntı",
-                width="large"
+if kayit_sayisi:
+    # Sayfalama: tarayıcıya yalnızca görüntülenen sayfa gönderilir
+    sayfa_kolon1, sayfa_kolon2, sayfa_kolon3, sayfa_kolon4 = st.columns(4)
+    
+    with sayfa_kolon1:
+        sayfa_boyutu = st.selectbox("Sayfa boyutu", SAYFA_BOYUTLARI, index=1, key="tablo_sayfa_boyutu")
+    
+    with sayfa_kolon2:
+        siralama = st.selectbox(
+            "Sıralama",
+            list(SIRALAMA_KOLONLARI),
+            format_func=SIRALAMA_KOLONLARI.get,
+            key="tablo_siralama"
+        )
+    
+    with sayfa_kolon3:
+        yon = st.selectbox("Yön", ["Azalan", "Artan"], key="tablo_siralama_yonu")
+    
+    sayfa_sayisi = max(1, -(-kayit_sayisi // sayfa_boyutu))
+    # Filtre daralınca sayfa numarası son sayfaya çekilir (widget oluşmadan önce)
+    if st.session_state.get("tablo_sayfasi", 1) > sayfa_sayisi:
+        st.session_state.tablo_sayfasi = sayfa_sayisi
+    
+    with sayfa_kolon4:
+        sayfa_no = st.number_input("Sayfa", min_value=1, max_value=sayfa_sayisi, step=1, key="tablo_sayfasi")
+    
+    st.caption(f"Toplam {kayit_sayisi} kayıt • Sayfa {sayfa_no}/{sayfa_sayisi}")
+    
+    try:
+        with asama("sayfa"):
+            sayfa_df = depo_al().sayfa(
+                filtre, siralama, artan=yon == "Artan",
+                ofset=(sayfa_no - 1) * sayfa_boyutu, limit=sayfa_boyutu
             )
-        }
-    )
+    except Exception as e:
+        st.error(f"Filtreleme hatası: {e}")
+        sayfa_df = pd.DataFrame(columns=[KIMLIK] + GORUNUM_KOLONLARI)
+    satir_say("sayfa", len(sayfa_df))
+    
+    # Düzenlenebilir tablo
+    # İndeks kayıt kimliğidir; düzenlemeler bu kimlikle depoya eşlenir
+    # Kaynak serbest metin olarak düzenlenebilsin diye kategorik kolonlar metne çevrilir
+    gosterilen_df = sayfa_df.set_index(KIMLIK)[GORUNUM_KOLONLARI].astype({"Müdürlük": str, "Haber_Kaynagi": str})
+    # Sayfa, sıralama ya da filtre değişince düzenleyici sıfırlanır; bekleyen
+    # düzenlemeler başka sayfanın satırlarına uygulanmaz
+    tablo_gorunumu = hash((filtre, siralama, yon, sayfa_boyutu, sayfa_no))
+    tablo_anahtari = f"kayit_tablosu_{st.session_state.get('tablo_surumu', 0)}_{tablo_gorunumu}"
+    
+    with asama("tablo"):
+        duzenlenmis_df = st.data_editor(
+            gosterilen_df,
+            key=tablo_anahtari,
+            use_container_width=True,
+            hide_index=True,
+            num_rows="dynamic",
+            column_config={
+                "Tarih": st.column_config.DateColumn(
+                    "Tarih",
+                    format="DD/MM/YYYY",
+                    required=True
+                ),
+                "Müdürlük": st.column_config.SelectboxColumn(
+                    "Müdürlük",
+                    options=kurum_al().mudurlukler,
+                    required=True
+                ),
+                "Haber_Kaynagi": st.column_config.TextColumn(
+                    "Kaynak",
+                    required=True
+                ),
+                "Sayı": st.column_config.NumberColumn(
+                    "Sayı",
+                    min_value=1,
+                    required=True
+                ),
+                "Ayrıntı": st.column_config.TextColumn(
+                    "Ayrıntı",
+                    width="large"
+                )
+            }
+        )
     
     # Değişiklikleri kaydet butonu
     if st.button("💾 Tablo Değişikliklerini Kaydet", type="primary"):
         try:
-            # Orijinal indeksleri bul
-            orijinal_indeksler = filtrelenmis_df.index
-            
-            # Yeni verileri hazırla
-            for idx in orijinal_indeksler:
-                if idx < len(duzenlenmis_df):
-                    # Tarihi doğru formatta kaydet
-                    tarih = duzenlenmis_df.iloc[idx]['Tarih']
-                    if isinstance(tarih, pd.Timestamp):
-                        tarih = tarih.date()
-                    
-                    df.loc[idx, 'Tarih'] = tarih
-                    df.loc[idx, 'Müdürlük'] = duzenlenmis_df.iloc[idx]['Müdürlük']
-                    df.loc[idx, 'Haber_Kaynagi'] = duzenlenmis_df.iloc[idx]['Haber_Kaynagi']
-                    df.loc[idx, 'Sayı'] = duzenlenmis_df.iloc[idx]['Sayı']
-                    df.loc[idx, 'Ayrıntı'] = duzenlenmis_df.iloc[idx]['Ayrıntı']
+            # Sadece düzenleyicideki değişiklikleri (delta) uygula
+            duzenlenenler, eklenenler, silinenler = tablo_degisiklikleri(
+                gosterilen_df, st.session_state[tablo_anahtari]
+            )
+            with asama("tablo_kaydi"):
+                yazici_al().guncelle(duzenlenenler, eklenenler, silinenler)
             
-            # CSV'ye kaydet
-            df.to_csv(DOSYA_ADI, index=False, encoding='utf-8-sig')
+            # Düzenleyiciyi sıfırla
+            st.session_state.tablo_surumu = st.session_state.get('tablo_surumu', 0) + 1
             st.success("✅ Değişiklikler kaydedildi!")
             st.rerun()
-            
+        
         except Exception as e:
             st.error(f"Kaydetme hatası: {e}")
     
+    # OLASI TEKRARLAR (yönetici)
+    tekrar_raporu(filtre)
+    
     # EXCEL İNDİR BUTONU
     st.markdown("---")
     st.subheader("📊 Raporlar")
     
-    rapor_kolon1, rapor_kolon2, rapor_kolon3 = st.columns(3)
+    rapor_kolon1, rapor_kolon2, rapor_kolon3, rapor_kolon4 = st.columns(4)
     
+    # Dosyalar sadece istendiğinde, arka planda hazırlanır; aynı filtre ve veri için tekrar kullanılır
     with rapor_kolon1:
         # Excel indir
-        if not filtrelenmis_df.empty:
-            excel_buffer = io.BytesIO()
-            with pd.ExcelWriter(excel_buffer, engine='xlsxwriter') as writer:
-                filtrelenmis_df.to_excel(writer, index=False, sheet_name='Rapor')
-                
-                # Formatlama
-                workbook = writer.book
-                worksheet = writer.sheets['Rapor']
-                
-                # Başlık formatı
-                header_format = workbook.add_format({
-                    'bold': True,
-                    'bg_color': '#2c3e50',
-                    'font_color': 'white',
-                    'border': 1
-                })
-                
-                # Sütun genişlikleri
-                worksheet.set_column('A:A', 12)  # Tarih
-                worksheet.set_column('B:B', 25)  # Müdürlük
-                worksheet.set_column('C:C', 20)  # Kaynak
-                worksheet.set_column('D:D', 10)  # Sayı
-                worksheet.set_column('E:E', 50)  # Ayrıntı
-                
-                # Başlıkları formatla
-                for col_num, value in enumerate(filtrelenmis_df.columns.values):
-                    worksheet.write(0, col_num, value, header_format)
-            
-            excel_data = excel_buffer.getvalue()
-            
-            st.download_button(
-                label="📥 Excel İndir",
-                data=excel_data,
-                file_name=f"beykoz_rapor_{date.today().strftime('%Y%m%d')}.xlsx",
-                mime="application/vnd.ms-excel",
-                use_container_width=True
-            )
+        excel_turu = "xlsx_mudurluk" if st.checkbox("Her müdürlük için ayrı sayfa") else "xlsx"
+        rapor_alani(excel_turu, filtre, "📊 Excel Hazırla", "📥 Excel İndir", ".xlsx", "application/vnd.ms-excel")
     
     with rapor_kolon2:
         # CSV indir
-        if not filtrelenmis_df.empty:
-            csv_data = filtrelenmis_df.to_csv(index=False, encoding='utf-8-sig')
-            
-            st.download_button(
-                label="📄 CSV İndir",
-                data=csv_data,
-                file_name=f"beykoz_rapor_{date.today().strftime('%Y%m%d')}.csv",
-                mime="text/csv",
-                use_container_width=True
-            )
+        rapor_alani("csv", filtre, "📄 CSV Hazırla", "📄 CSV İndir", ".csv", "text/csv")
     
     with rapor_kolon3:
+        # PDF indir
+        rapor_alani("pdf", filtre, "📑 PDF Hazırla", "📑 PDF İndir", ".pdf", "application/pdf")
+    
+    with rapor_kolon4:
         # Verileri sıfırla butonu (sadece admin)
         if st.session_state.kullanici_rol == "admin":
             if st.button("⚠️ Verileri Temizle", use_container_width=True, type="secondary"):
                 if st.checkbox("Emin misiniz? Bu işlem geri alınamaz!"):
                     # Boş veritabanı oluştur
-                    kolonlar = ["Tarih", "Müdürlük", "Haber_Kaynagi", "Sayı", "Ayrıntı", "Kayit_Zamani"]
-                    bos_df = pd.DataFrame(columns=kolonlar)
-                    bos_df.to_csv(DOSYA_ADI, index=False, encoding='utf-8-sig')
+                    yazici_al().temizle()
                     st.success("✅ Veritabanı temizlendi!")
                     time.sleep(2)
                     st.rerun()
@@ -593,27 +907,39 @@ if not filtrelenmis_df.empty:
     st.markdown("---")
     st.subheader("📈 Görselleştirme")
     
-    graf_kolon1, graf_kolon2 = st.columns(2)
-    
-    with graf_kolon1:
-        st.caption("🏢 Müdürlüklere Göre Dağılım")
-        if not filtrelenmis_df.empty:
-            mudurluk_dagilim = filtrelenmis_df.groupby('Müdürlük')['Sayı'].sum().sort_values()
-            if not mudurluk_dagilim.empty:
-                st.bar_chart(mudurluk_dagilim)
+    with asama("grafik"):
+        # Dilim kayıtların başladığı tarihten bitişe kadarki aralığa göre seçilir;
+        # el ile seçilen dilim çok fazla nokta üretecekse bir üst dilime geçilir
+        dilim_secimi = st.selectbox(
+            "Zaman dilimi", ["otomatik", *ZAMAN_DILIMLERI], format_func=dilim_adi, key="grafik_dilimi"
+        )
+        grafik_baslangici = max(filtre.baslangic, pd.Timestamp(ozet_df['Tarih'].min()).date())
+        dilim = zaman_dilimi_sec(grafik_baslangici, filtre.bitis, None if dilim_secimi == "otomatik" else dilim_secimi)
+        if dilim_secimi not in ("otomatik", dilim):
+            st.caption(f"ℹ️ Bu aralıkta {dilim_adi(dilim_secimi).lower()} dilimi çok fazla nokta üretir; {dilim_adi(dilim).lower()} kullanılıyor.")
+        
+        graf_kolon1, graf_kolon2 = st.columns(2)
+        
+        with graf_kolon1:
+            st.caption("🏢 Müdürlüklere Göre Dağılım")
+            if not ozet_df.empty:
+                mudurluk_dagilim = ozet_df.groupby('Müdürlük', observed=True)['Sayı'].sum().sort_values()
+                if not mudurluk_dagilim.empty:
+                    st.bar_chart(mudurluk_dagilim)
+        
+        with graf_kolon2:
+            st.caption(f"📅 Tarihlere Göre Dağılım ({dilim_adi(dilim)})")
+            if not ozet_df.empty:
+                tarih_dagilim = zaman_serisi(ozet_df, dilim, grafik_baslangici, filtre.bitis)['Sayı']
+                st.line_chart(tarih_dagilim)
+        
+        st.caption(f"🗓️ Müdürlük × {dilim_adi(dilim)} Yoğunluğu")
+        st.altair_chart(isi_haritasi_grafigi(ozet_df, dilim, grafik_baslangici, filtre.bitis), use_container_width=True)
     
-    with graf_kolon2:
-        st.caption("📅 Tarihlere Göre Dağılım")
-        if not filtrelenmis_df.empty:
-            # Tarih formatını düzelt
-            try:
-                tarih_dagilim = filtrelenmis_df.copy()
-                tarih_dagilim['Tarih'] = pd.to_datetime(tarih_dagilim['Tarih'])
-                tarih_dagilim = tarih_dagilim.groupby(tarih_dagilim['Tarih'].dt.date)['Sayı'].sum()
-                if not tarih_dagilim.empty:
-                    st.line_chart(tarih_dagilim)
-            except:
-                pass
+    # DÖNEM KARŞILAŞTIRMASI
+    st.markdown("---")
+    st.subheader("↕️ Dönem Karşılaştırması")
+    donem_karsilastirma_alani(filtre)
 
 else:
     # VERİ YOKSA
@@ -640,15 +966,32 @@ else:
             }
         ]
         
-        ornek_df = pd.DataFrame(ornek_veriler)
-        ornek_df.to_csv(DOSYA_ADI, mode='a', header=not os.path.exists(DOSYA_ADI), index=False, encoding='utf-8-sig')
+        yazici_al().ekle(pd.DataFrame(ornek_veriler))
         
         st.success("✅ Örnek veriler eklendi!")
         st.rerun()
 
+# ==== TOPLU AKTARIM PANELİ (yönetici) ====
+toplu_aktarim_paneli()
+
+# ==== GERİ YÜKLEME PANELİ (yönetici) ====
+geri_yukleme_paneli()
+
+# ==== PERFORMANS PANELİ (yönetici) ====
+performans_paneli()
+
 # ==== ÇIKIŞ BUTONUNU ÇAĞIR ====
 cikis_butonu_ekle()
 
 # ==== ALT BİLGİ ====
 st.markdown("---")
 st.caption(f"© 2026 MAB tarafından geliştirildi. • Kullanıcı: {st.session_state.kullanici_isim} • Son güncelleme: {datetime.now().strftime('%d.%m.%Y %H:%M')}")
+
+# ==== ÖLÇÜMÜ KAYDET ====
+olcum_deposu().bitir(olcum)
+
+# ==== HAZIRLANAN RAPORLARI BEKLE ====
+# Arka plandaki rapor bitene kadar ilerleme çubuğu bu aralıkla güncellenir
+if st.session_state.pop("bekleyen_rapor", False):
+    time.sleep(RAPOR_YOKLAMA_ARALIGI)
+    st.rerun()
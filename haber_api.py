@@ -0,0 +1,297 @@
+"""Beykoz haber kayıtları: salt okunur yerel JSON API
+
+Pano ekranları sayfadaki özetleri ve kayıt sayfalarını uygulamayı çalıştırmadan
+buradan okur. Sorgular uygulamayla aynı depo ve Filtre üzerinden yapılır. ETag
+kurumdan, verinin sürümünden (depo.surum) ve istekten üretilir; veri
+değişmediyse If-None-Match ile gelen yoklama hiçbir hesaplama yapılmadan 304
+alır. Hazırlanan yanıtlar ETag ile önbellekte tutulur, istemci kabul ediyorsa
+gzip ile sıkıştırılarak gönderilir.
+
+Uç noktalar (GET):
+    /ozet       metrikler, müdürlük ve gün başına toplamlar
+    /kayitlar   kayıt sayfası: sayfa, boyut (en fazla 500), siralama
+                (kimlik, tarih, mudurluk, kaynak, sayi), yon (artan/azalan)
+
+Filtre parametreleri: baslangic, bitis (YYYY-AA-GG; varsayılan son 7 gün),
+mudurluk, kaynak (tekrarlanabilir), arama, kurum (varsayılan kurum için boş).
+
+Kullanım:
+    python haber_api.py --port 8502
+    curl "http://127.0.0.1:8502/ozet?baslangic=2026-10-01&mudurluk=Zabıta Müdürlüğü"
+
+Uygulama HABER_API_PORTU ayarlıysa aynı API'yi kendi sürecinde de başlatır.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+from haber_veri import (
+    KIMLIK, KURUMLAR_KLASORU, VERI_DEPOSU,
+    Filtre, Kurum, KurumHavuzu, depo_olustur, ozet_metrikleri,
+)
+from haber_kayit import KURUM_ADI, SorguOnbellegi
+
+# Uygulamanın kendi sürecinde başlattığı API'nin portu (boşsa başlatılmaz)
+API_PORTU = os.getenv("HABER_API_PORTU", "")
+
+# Tarih verilmediğinde uygulamadaki gibi son bu kadar gün
+VARSAYILAN_GUN = 7
+
+# Kayıt sayfası boyutu: varsayılan ve en fazla
+SAYFA_BOYUTU = 50
+EN_FAZLA_BOYUT = 500
+
+# API adı → sıralama kolonu
+SIRALAMALAR = {
+    "kimlik": KIMLIK,
+    "tarih": "Tarih",
+    "mudurluk": "Müdürlük",
+    "kaynak": "Haber_Kaynagi",
+    "sayi": "Sayı",
+}
+
+# ETag başına tutulan hazır yanıt sayısı ve bu boyuttan küçük yanıtlar sıkıştırılmaz (bayt)
+YANIT_ONBELLEGI = 64
+GZIP_ESIGI = 1024
+
+class IstekHatasi(Exception):
+    """Geçersiz istek: HTTP durum kodu ve mesajı"""
+    
+    def __init__(self, durum, mesaj):
+        super().__init__(mesaj)
+        self.durum = durum
+
+def _tek(parametreler, ad, varsayilan=""):
+    degerler = parametreler.get(ad)
+    return degerler[-1].strip() if degerler else varsayilan
+
+def _tarih(parametreler, ad, varsayilan):
+    metin = _tek(parametreler, ad)
+    if not metin:
+        return varsayilan
+    try:
+        return date.fromisoformat(metin)
+    except ValueError:
+        raise IstekHatasi(400, f"{ad} YYYY-AA-GG biçiminde olmalı: {metin}")
+
+def _tam_sayi(parametreler, ad, varsayilan, en_az, en_fazla):
+    metin = _tek(parametreler, ad)
+    if not metin:
+        return varsayilan
+    try:
+        deger = int(metin)
+    except ValueError:
+        raise IstekHatasi(400, f"{ad} tam sayı olmalı: {metin}")
+    if not en_az <= deger <= en_fazla:
+        raise IstekHatasi(400, f"{ad} {en_az} ile {en_fazla} arasında olmalı")
+    return deger
+
+def filtre_coz(parametreler):
+    """Sorgu parametrelerinden Filtre (uygulamanın filtre paneliyle aynı varsayılanlar)"""
+    bitis = _tarih(parametreler, "bitis", date.today())
+    baslangic = _tarih(parametreler, "baslangic", bitis - timedelta(days=VARSAYILAN_GUN))
+    if baslangic > bitis:
+        raise IstekHatasi(400, "baslangic bitis'ten sonra olamaz")
+    return Filtre(
+        baslangic=baslangic,
+        bitis=bitis,
+        mudurlukler=tuple(sorted({m.strip() for m in parametreler.get("mudurluk", []) if m.strip()})),
+        kaynaklar=tuple(sorted({k.strip() for k in parametreler.get("kaynak", []) if k.strip()})),
+        arama=_tek(parametreler, "arama"),
+    )
+
+def ozet_yaniti(depo, filtre, parametreler):
+    """Filtrenin metrikleri, müdürlük ve gün başına kayıt/haber toplamları"""
+    ozet_df = depo.ozet(filtre)
+    mudurlukler = ozet_df.groupby('Müdürlük', observed=True)[['Kayit', 'Sayı']].sum().sort_values('Sayı', ascending=False)
+    gunler = ozet_df.groupby('Tarih')[['Kayit', 'Sayı']].sum().sort_index()
+    return {
+        "metrikler": {ad: int(deger) for ad, deger in ozet_metrikleri(ozet_df).items()},
+        "mudurlukler": [
+            {"mudurluk": mudurluk, "kayit": int(kayit), "sayi": int(sayi)}
+            for mudurluk, kayit, sayi in mudurlukler.itertuples(name=None)
+        ],
+        "gunler": [
+            {"tarih": f"{tarih:%Y-%m-%d}", "kayit": int(kayit), "sayi": int(sayi)}
+            for tarih, kayit, sayi in gunler.itertuples(name=None)
+        ],
+    }
+
+def kayitlar_yaniti(depo, filtre, parametreler):
+    """Filtreye uyan kayıtlardan sıralanmış tek sayfa ve toplam kayıt sayısı"""
+    boyut = _tam_sayi(parametreler, "boyut", SAYFA_BOYUTU, 1, EN_FAZLA_BOYUT)
+    sayfa = _tam_sayi(parametreler, "sayfa", 1, 1, 10**9)
+    siralama = _tek(parametreler, "siralama", "tarih")
+    if siralama not in SIRALAMALAR:
+        raise IstekHatasi(400, f"siralama şunlardan biri olmalı: {', '.join(SIRALAMALAR)}")
+    yon = _tek(parametreler, "yon", "azalan")
+    if yon not in ("artan", "azalan"):
+        raise IstekHatasi(400, "yon artan ya da azalan olmalı")
+    
+    # Toplam, uygulamadaki gibi günlük özetten gelir; yalnızca istenen sayfa okunur
+    ozet_df = depo.ozet(filtre)
+    toplam = int(ozet_df['Kayit'].sum()) if not ozet_df.empty else 0
+    sayfa_df = depo.sayfa(filtre, SIRALAMALAR[siralama], artan=yon == "artan", ofset=(sayfa - 1) * boyut, limit=boyut) if toplam else None
+    kayitlar = [] if sayfa_df is None else [
+        {
+            "kimlik": int(kimlik), "tarih": None if pd.isna(tarih) else f"{tarih:%Y-%m-%d}",
+            "mudurluk": mudurluk, "kaynak": kaynak, "sayi": int(sayi), "ayrinti": ayrinti,
+        }
+        for kimlik, tarih, mudurluk, kaynak, sayi, ayrinti in sayfa_df[
+            [KIMLIK, 'Tarih', 'Müdürlük', 'Haber_Kaynagi', 'Sayı', 'Ayrıntı']
+        ].itertuples(index=False, name=None)
+    ]
+    return {
+        "toplam": toplam,
+        "sayfa": sayfa,
+        "boyut": boyut,
+        "sayfa_sayisi": max(1, -(-toplam // boyut)),
+        "kayitlar": kayitlar,
+    }
+
+# Yol → (yanıtı hazırlayan fonksiyon, ETag'e giren sayfa parametreleri)
+UC_NOKTALAR = {
+    "/ozet": (ozet_yaniti, ()),
+    "/kayitlar": (kayitlar_yaniti, ("boyut", "sayfa", "siralama", "yon")),
+}
+
+class HaberApi:
+    """İsteği (yol, parametreler, If-None-Match) yanıta çeviren, HTTP'den bağımsız çekirdek
+    
+    depo_bul(kurum_adi) kurumun deposunu ya da tanımsız kurumda None döndürür.
+    Verilmezse depolar bu süreçte kurum başına bir kez açılır ve kurum havuzunun
+    bellek sınırına tabi olur; yalnızca klasörü olan kurumlar sunulur.
+    """
+    
+    def __init__(self, depo_bul=None, veri_deposu=None):
+        self.veri_deposu = veri_deposu or VERI_DEPOSU
+        self.depo_bul = depo_bul or self._kurum_deposu
+        self._havuz = KurumHavuzu()
+        self._depolar = {}
+        self._kilit = threading.Lock()
+        self._yanitlar = SorguOnbellegi(YANIT_ONBELLEGI)
+    
+    def _kurum_deposu(self, kurum_adi):
+        if kurum_adi and not os.path.isdir(os.path.join(KURUMLAR_KLASORU, kurum_adi)):
+            return None
+        with self._kilit:
+            depo = self._depolar.get(kurum_adi)
+            if depo is None:
+                depo = self._depolar[kurum_adi] = depo_olustur(self.veri_deposu, Kurum(kurum_adi))
+        return self._havuz.kullan(kurum_adi, depo)
+    
+    def yanitla(self, yol, parametreler, etag_istegi=None):
+        """(durum, yanıt, ETag); yanıt UTF-8 JSON gövdesi ve sıkıştırılmış hali ({"govde", "gzip"}), 304'te None"""
+        if yol not in UC_NOKTALAR:
+            raise IstekHatasi(404, f"Bilinmeyen adres: {yol} (kullanılabilir: {', '.join(UC_NOKTALAR)})")
+        hazirla, sayfa_parametreleri = UC_NOKTALAR[yol]
+        kurum_adi = _tek(parametreler, "kurum")
+        depo = self.depo_bul(kurum_adi) if not kurum_adi or KURUM_ADI.fullmatch(kurum_adi) else None
+        if depo is None:
+            raise IstekHatasi(404, f"Bilinmeyen kurum: {kurum_adi}")
+        filtre = filtre_coz(parametreler)
+        
+        # Aynı veri ve aynı istek aynı ETag'i üretir; sürüm okumak dışında iş yapılmaz
+        anahtar = (kurum_adi, depo.surum(), yol, filtre, tuple(_tek(parametreler, ad) for ad in sayfa_parametreleri))
+        etag = '"' + hashlib.blake2b(repr(anahtar).encode("utf-8"), digest_size=12).hexdigest() + '"'
+        if etag_istegi and etag in [parca.strip() for parca in etag_istegi.split(",")]:
+            return 304, None, etag
+        
+        yanit = self._yanitlar.al(etag)
+        if yanit is None:
+            icerik = {"kurum": kurum_adi, "filtre": {
+                "baslangic": f"{filtre.baslangic:%Y-%m-%d}", "bitis": f"{filtre.bitis:%Y-%m-%d}",
+                "mudurlukler": list(filtre.mudurlukler), "kaynaklar": list(filtre.kaynaklar), "arama": filtre.arama,
+            }}
+            icerik.update(hazirla(depo, filtre, parametreler))
+            yanit = {"govde": json.dumps(icerik, ensure_ascii=False).encode("utf-8"), "gzip": None}
+            self._yanitlar.koy(etag, yanit)
+        return 200, yanit, etag
+
+class ApiIstegi(BaseHTTPRequestHandler):
+    """HTTP isteğini sunucunun HaberApi'sine iletir"""
+    
+    server_version = "HaberApi/1.0"
+    
+    def _gonder(self, durum, govde=b"", basliklar=()):
+        self.send_response(durum)
+        for ad, deger in basliklar:
+            self.send_header(ad, deger)
+        if durum != 304:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(govde)))
+        self.end_headers()
+        if govde and self.command != "HEAD":
+            self.wfile.write(govde)
+    
+    def do_GET(self):
+        adres = urlsplit(self.path)
+        try:
+            durum, yanit, etag = self.server.api.yanitla(
+                adres.path.rstrip("/") or "/", parse_qs(adres.query), self.headers.get("If-None-Match")
+            )
+        except IstekHatasi as hata:
+            self._gonder(hata.durum, json.dumps({"hata": str(hata)}, ensure_ascii=False).encode("utf-8"))
+            return
+        except Exception as hata:
+            self._gonder(500, json.dumps({"hata": str(hata) or type(hata).__name__}, ensure_ascii=False).encode("utf-8"))
+            return
+        
+        basliklar = [("ETag", etag), ("Cache-Control", "no-cache"), ("Vary", "Accept-Encoding")]
+        if durum == 304:
+            self._gonder(304, basliklar=basliklar)
+            return
+        govde = yanit["govde"]
+        if len(govde) >= GZIP_ESIGI and "gzip" in self.headers.get("Accept-Encoding", ""):
+            # Sıkıştırılmış hali de önbellekteki yanıtta saklanır
+            if yanit["gzip"] is None:
+                yanit["gzip"] = gzip.compress(govde, compresslevel=6)
+            govde = yanit["gzip"]
+            basliklar.append(("Content-Encoding", "gzip"))
+        self._gonder(200, govde, basliklar)
+    
+    do_HEAD = do_GET
+    
+    def log_message(self, format, *args):
+        # Pano yoklamaları günlüğü doldurmasın
+        pass
+
+def sunucu_olustur(api, adres="127.0.0.1", port=8502):
+    """API'yi sunan, istek başına bir iş parçacığı açan HTTP sunucusu (serve_forever ile çalıştırılır)"""
+    sunucu = ThreadingHTTPServer((adres, port), ApiIstegi)
+    sunucu.daemon_threads = True
+    sunucu.api = api
+    return sunucu
+
+def arka_planda_baslat(api, adres="127.0.0.1", port=8502):
+    """Sunucuyu bir iş parçacığında başlat, sunucuyu döndür"""
+    sunucu = sunucu_olustur(api, adres, port)
+    threading.Thread(target=sunucu.serve_forever, name="haber-api", daemon=True).start()
+    return sunucu
+
+def main():
+    ayristirici = argparse.ArgumentParser(description="Kayıt özetleri ve sayfaları için salt okunur JSON API")
+    ayristirici.add_argument("--adres", default="127.0.0.1", help="dinlenecek adres (varsayılan yalnızca yerel)")
+    ayristirici.add_argument("--port", type=int, default=int(API_PORTU or 8502))
+    ayristirici.add_argument("--depo", choices=["csv", "sqlite", "parquet"], default=VERI_DEPOSU)
+    argumanlar = ayristirici.parse_args()
+    
+    sunucu = sunucu_olustur(HaberApi(veri_deposu=argumanlar.depo), argumanlar.adres, argumanlar.port)
+    print(f"http://{argumanlar.adres}:{argumanlar.port}/ozet adresinde dinleniyor (Ctrl+C ile durdurun)")
+    try:
+        sunucu.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sunucu.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,449 @@
+"""Beykoz haber kayıtları: metin araması ve tekrar kontrolü
+
+AramaDizini ayrıntı metninde kelime araması, KayitOzetleri aynı içerikli
+kayıtların tekrar yazılmasını önleyen özet dizinidir. İkisi de deponun bir
+sürümünü yansıtır ve yazıcı tarafından değişikliklerle güncel tutulur.
+"""
+
+import os
+import pandas as pd
+import numpy as np
+import re
+import sys
+import bisect
+import hashlib
+import io
+import threading
+import unicodedata
+
+from haber_olcum import asama
+from haber_kayit import GORUNUM_KOLONLARI, KIMLIK, TUM_KAYITLAR
+
+# ==================== ARAMA ====================
+
+# Türkçe büyük/küçük harf (İ→i, I→ı) ve aksan sadeleştirme (ç→c, ğ→g, ı→i, ...)
+TURKCE_KUCUK_HARF = [("İ", "i"), ("I", "ı")]
+AKSANSIZ_HARFLER = list(zip("çğıöşüâîû", "cgiosuaiu"))
+
+BIRLESEN_ISARETLER = re.compile(r"[\u0300-\u036f]")
+KELIME = re.compile(r"\w+")
+
+def metin_katla(metinler):
+    """Metin serisini aramada karşılaştırılacak biçime getir (Türkçe küçük harf, aksansız)
+    
+    Dönüşümler satır satır değil, ayraçla birleştirilmiş tek bir metin üzerinde yapılır.
+    """
+    metinler = metinler.fillna("").astype(str)
+    birlesik = "\x00".join(metinler.str.replace("\x00", "", regex=False).tolist())
+    # Tek karakterlik str.replace zinciri büyük metinde str.translate'ten çok daha hızlıdır
+    for eski, yeni in TURKCE_KUCUK_HARF:
+        birlesik = birlesik.replace(eski, yeni)
+    birlesik = birlesik.lower()
+    for eski, yeni in AKSANSIZ_HARFLER:
+        birlesik = birlesik.replace(eski, yeni)
+    birlesik = BIRLESEN_ISARETLER.sub("", unicodedata.normalize("NFKD", birlesik))
+    return pd.Series(birlesik.split("\x00") if len(metinler) else [], index=metinler.index, dtype=object)
+
+def metin_terimleri(metinler):
+    """Her metni katlanmış kelimelerine ayır"""
+    return pd.Series([KELIME.findall(metin) for metin in metin_katla(metinler)], index=metinler.index, dtype=object)
+
+class AramaDizini:
+    """Ayrıntı metni üzerinde ters dizin (terim → kayıt kimlikleri)
+    
+    Sorgudaki her kelime önek olarak aranır ("cal" → "çalışması"), tüm kelimeleri
+    içeren kayıtlar döner. Dizin deponun bir sürümünü yansıtır: yazıcı eklenen ve
+    düzenlenen kayıtları dizine işler; depo başka yoldan değiştiyse dizin ilk
+    aramada baştan kurulur.
+    """
+    
+    def __init__(self, depo):
+        self.depo = depo
+        self.surum = None
+        self._kimlikler = {}
+        self._terimler = []
+        self._son_kimlik = 0
+        self._duzeltmeler = {}
+        self._kilit = threading.Lock()
+    
+    def _kur(self):
+        surum = self.depo.surum()
+        parcalar = [parca[[KIMLIK, 'Ayrıntı']] for parca in self.depo.parcalar(TUM_KAYITLAR)]
+        df = pd.concat(parcalar, ignore_index=True) if parcalar else pd.DataFrame(columns=[KIMLIK, 'Ayrıntı'])
+        
+        # Terim başına kimlikler: (terim kodu, kimlik) çiftleri sıralanıp terim sınırlarından bölünür
+        terim_listeleri = metin_terimleri(df['Ayrıntı']).tolist()
+        uzunluklar = np.fromiter(map(len, terim_listeleri), dtype='int64', count=len(terim_listeleri))
+        kimlikler = np.repeat(df[KIMLIK].to_numpy(dtype='int64'), uzunluklar)
+        kodlar, terimler = pd.factorize(pd.Series([terim for liste in terim_listeleri for terim in liste], dtype=object), sort=True)
+        sira = np.lexsort((kimlikler, kodlar))
+        kodlar, kimlikler = kodlar[sira], kimlikler[sira]
+        # Aynı metinde tekrarlanan terimler bir kez sayılır
+        tekil = np.ones(len(kodlar), dtype=bool)
+        tekil[1:] = (kodlar[1:] != kodlar[:-1]) | (kimlikler[1:] != kimlikler[:-1])
+        kodlar, kimlikler = kodlar[tekil], kimlikler[tekil]
+        sinirlar = np.searchsorted(kodlar, np.arange(len(terimler) + 1))
+        
+        terimler = terimler.tolist()
+        self._kimlikler = {terim: kimlikler[sinirlar[kod]:sinirlar[kod + 1]] for kod, terim in enumerate(terimler)}
+        self._terimler = terimler
+        self._son_kimlik = int(df[KIMLIK].max()) if len(df) else 0
+        self._duzeltmeler = {}
+        self.surum = surum
+    
+    def degisti(self, onceki_surum, yeni_surum, kimlikler, metinler):
+        """Yazılan kayıtları dizine işle (dizin yazmadan önceki sürümü yansıtıyorsa)
+        
+        Yeni kimlikler dizine eklenir; daha önce dizinlenmiş kimlikler düzenlenmiş
+        sayılır ve aramada yeni metinleriyle ayrıca doğrulanır.
+        """
+        with self._kilit:
+            if self.surum is None or self.surum != onceki_surum:
+                return
+            kimlikler = np.asarray(kimlikler, dtype='int64')
+            terim_listeleri = metin_terimleri(pd.Series(list(metinler), dtype=object)).tolist()
+            
+            yeni_terimler = {}
+            for kimlik, terimler in zip(kimlikler.tolist(), terim_listeleri):
+                if kimlik <= self._son_kimlik:
+                    self._duzeltmeler[kimlik] = set(terimler)
+                    continue
+                for terim in set(terimler):
+                    yeni_terimler.setdefault(terim, []).append(kimlik)
+            
+            for terim, eklenenler in yeni_terimler.items():
+                if terim not in self._kimlikler:
+                    bisect.insort(self._terimler, terim)
+                    self._kimlikler[terim] = np.array(eklenenler, dtype='int64')
+                else:
+                    self._kimlikler[terim] = np.concatenate([self._kimlikler[terim], eklenenler])
+            
+            if len(kimlikler):
+                self._son_kimlik = max(self._son_kimlik, int(kimlikler.max()))
+            self.surum = yeni_surum
+    
+    def bellek(self):
+        """Dizinin yaklaşık bellek kullanımı (bayt)"""
+        with self._kilit:
+            return sum(dizi.nbytes + sys.getsizeof(terim) for terim, dizi in self._kimlikler.items())
+    
+    def bosalt(self):
+        """Dizini bellekten at; ilk aramada baştan kurulur"""
+        with self._kilit:
+            self.surum = None
+            self._kimlikler = {}
+            self._terimler = []
+            self._duzeltmeler = {}
+    
+    def _onek_kimlikleri(self, onek):
+        bas = bisect.bisect_left(self._terimler, onek)
+        son = bisect.bisect_left(self._terimler, onek + "\uffff")
+        if son - bas == 1:
+            return self._kimlikler[self._terimler[bas]]
+        if son == bas:
+            return np.array([], dtype='int64')
+        return np.unique(np.concatenate([self._kimlikler[terim] for terim in self._terimler[bas:son]]))
+    
+    def ara(self, sorgu):
+        """Sorgudaki tüm kelimeleri (önek olarak) içeren kayıtların kimlikleri; boş sorguda None"""
+        oneker = metin_terimleri(pd.Series([sorgu])).iloc[0]
+        if not oneker:
+            return None
+        
+        with self._kilit, asama("arama"):
+            if self.surum is None or self.surum != self.depo.surum():
+                with asama("arama_dizini"):
+                    self._kur()
+            
+            sonuc = self._onek_kimlikleri(oneker[0])
+            for onek in oneker[1:]:
+                sonuc = np.intersect1d(sonuc, self._onek_kimlikleri(onek), assume_unique=True)
+            
+            # Düzenlenen kayıtlar eski terimleriyle değil yeni metinleriyle eşleşir
+            if self._duzeltmeler:
+                sonuc = np.setdiff1d(sonuc, list(self._duzeltmeler), assume_unique=True)
+                uyanlar = [
+                    kimlik for kimlik, terimler in self._duzeltmeler.items()
+                    if all(any(terim.startswith(onek) for terim in terimler) for onek in oneker)
+                ]
+                if uyanlar:
+                    sonuc = np.union1d(sonuc, uyanlar)
+        return sonuc
+
+# ==================== TEKRAR KONTROLÜ ====================
+
+# Tekrar dizininde sözlükte bekleyen eklemeler bu sayıyı aşınca ana tabloya katılır
+OZET_BIRLESTIRME_SINIRI = 50_000
+
+# Günlükteki satır sayısı canlı özetlerin bu katını aşınca günlük sıkıştırılır
+OZET_SIKISTIRMA_KATI = 2
+
+def kayit_ozetleri(df, oturum=""):
+    """Kayıtların içerik özetleri (uint64): Tarih, Müdürlük, Kaynak, Sayı, Ayrıntı ve gönderen oturum
+    
+    Aynı içerik aynı oturumdan gelirse özet aynıdır. Oturumsuz özet (oturum="")
+    toplu aktarımda ve oturumu bilinmeyen mevcut kayıtlarda kullanılır.
+    """
+    if not len(df):
+        return np.array([], dtype=np.uint64)
+    kolonlar = [
+        pd.to_datetime(df['Tarih'], errors='coerce').dt.strftime('%Y-%m-%d').fillna(""),
+        df['Müdürlük'].astype(object).fillna("").astype(str).str.strip(),
+        df['Haber_Kaynagi'].astype(object).fillna("").astype(str).str.strip(),
+        pd.to_numeric(df['Sayı'], errors='coerce').fillna(0).astype('int64').astype(str),
+        df['Ayrıntı'].astype(object).fillna("").astype(str).str.strip(),
+    ]
+    return np.fromiter(
+        (
+            int.from_bytes(hashlib.blake2b("\x1f".join(alanlar).encode("utf-8"), digest_size=8).digest(), "little")
+            for alanlar in zip(*kolonlar, [oturum] * len(df))
+        ),
+        dtype=np.uint64, count=len(df)
+    )
+
+class KayitOzetleri:
+    """Kayıt içerik özeti → kimlik dizini (tekrar gönderim kontrolü)
+    
+    Dizin depo dosyasının yanındaki, yalnızca sona eklenen bir günlükte tutulur
+    ("özet kimlik" ve "- kimlik" satırları). Aynı veri klasörünü kullanan süreçler
+    yazmadan önce günlüğün yeni satırlarını okur. Dizini yalnızca yazıcı, yazma
+    kilidi altında değiştirir. Günlük yoksa depodaki kayıtların oturumsuz
+    özetleriyle bir kez kurulur.
+    
+    Özet başına arama O(1)'dir: eski özetler pandas karma tablosunda (pd.Index),
+    son eklenenler bir sözlükte tutulur. Düzenlenen ve silinen kayıtlar dizinden çıkar.
+    """
+    
+    def __init__(self, depo, yol=None):
+        self.depo = depo
+        self.yol = yol
+        self._sifirla()
+        self._hazir = False
+    
+    def _sifirla(self):
+        self._taban = pd.Index(np.array([], dtype=np.uint64))
+        self._taban_kimlikleri = np.array([], dtype=np.int64)
+        self._yeni = {}
+        self._dosya = None  # (inode, okunan bayt)
+        self._satir_sayisi = 0
+    
+    def __len__(self):
+        return int((self._taban_kimlikleri > 0).sum()) + len(self._yeni)
+    
+    def _taban_kur(self, ozetler, kimlikler):
+        self._taban = pd.Index(np.asarray(ozetler, dtype=np.uint64))
+        self._taban_kimlikleri = np.asarray(kimlikler, dtype=np.int64)
+        self._yeni = {}
+    
+    def _birlestir(self):
+        """Sözlükteki eklemeleri ana tabloya kat (sözlükteki kayıt aynı özetin eskisini geçersiz kılar)"""
+        canli = self._taban_kimlikleri > 0
+        ozetler = self._taban.to_numpy()[canli]
+        kimlikler = self._taban_kimlikleri[canli]
+        if self._yeni:
+            yeni_ozetler = np.fromiter(self._yeni.keys(), dtype=np.uint64, count=len(self._yeni))
+            eski = ~np.isin(ozetler, yeni_ozetler)
+            ozetler = np.concatenate([ozetler[eski], yeni_ozetler])
+            kimlikler = np.concatenate([
+                kimlikler[eski], np.fromiter(self._yeni.values(), dtype=np.int64, count=len(self._yeni))
+            ])
+        self._taban_kur(ozetler, kimlikler)
+    
+    def kimlikler(self, ozetler):
+        """Her özet için kayıtlı kimlik (yoksa 0)"""
+        ozetler = np.asarray(ozetler, dtype=np.uint64)
+        if len(self._taban):
+            konumlar = self._taban.get_indexer(ozetler)
+            sonuc = np.where(konumlar >= 0, self._taban_kimlikleri[konumlar], 0)
+        else:
+            sonuc = np.zeros(len(ozetler), dtype=np.int64)
+        if self._yeni:
+            for sira, ozet in enumerate(ozetler.tolist()):
+                kimlik = self._yeni.get(ozet)
+                if kimlik is not None:
+                    sonuc[sira] = kimlik
+        return sonuc
+    
+    def _isle_ekle(self, ozetler, kimlikler):
+        self._yeni.update(zip(np.asarray(ozetler, dtype=np.uint64).tolist(), map(int, kimlikler)))
+        if len(self._yeni) > OZET_BIRLESTIRME_SINIRI:
+            self._birlestir()
+    
+    def _isle_sil(self, kimlikler):
+        kimlikler = set(map(int, kimlikler))
+        self._taban_kimlikleri = np.where(np.isin(self._taban_kimlikleri, list(kimlikler)), 0, self._taban_kimlikleri)
+        if self._yeni:
+            self._yeni = {ozet: kimlik for ozet, kimlik in self._yeni.items() if kimlik not in kimlikler}
+    
+    # ---- günlük dosyası ----
+    
+    def _satirlar_oku(self, metin):
+        """Günlük metnini (özetler, kimlikler, silme mi) dizilerine çevir"""
+        if not metin.strip():
+            return np.array([], dtype=np.uint64), np.array([], dtype=np.int64), np.array([], dtype=bool)
+        tablo = pd.read_csv(
+            io.StringIO(metin), sep=" ", header=None, names=["ozet", "kimlik"],
+            dtype={"ozet": str, "kimlik": "int64"}
+        )
+        silme = (tablo["ozet"] == "-").to_numpy()
+        ozetler = tablo["ozet"].where(~silme, "0").astype("uint64").to_numpy()
+        return ozetler, tablo["kimlik"].to_numpy(), silme
+    
+    def _tum_gunlugu_oku(self, durum):
+        with open(self.yol, "r", encoding="utf-8") as f:
+            metin = f.read()
+        ozetler, kimlikler, silme = self._satirlar_oku(metin)
+        
+        # Her kimliğin son silinmesinden önceki eklemeler geçersizdir; aynı özetin son eklemesi geçerlidir
+        siralar = np.arange(len(silme))
+        son_silme = pd.Series(siralar[silme]).groupby(kimlikler[silme]).max()
+        eklemeler = pd.DataFrame({"ozet": ozetler[~silme], "kimlik": kimlikler[~silme], "sira": siralar[~silme]})
+        gecerli = eklemeler["sira"].to_numpy() > son_silme.reindex(eklemeler["kimlik"]).fillna(-1).to_numpy()
+        eklemeler = eklemeler[gecerli].drop_duplicates("ozet", keep="last")
+        
+        self._taban_kur(eklemeler["ozet"].to_numpy(), eklemeler["kimlik"].to_numpy())
+        self._dosya = (durum.st_ino, len(metin.encode("utf-8")))
+        self._satir_sayisi = len(silme)
+    
+    def _gunluk_yaz(self, satirlar, bastan=False):
+        if self.yol is None:
+            return
+        metin = "".join(satirlar)
+        if bastan:
+            gecici = self.yol + ".tmp"
+            with open(gecici, "w", encoding="utf-8") as f:
+                f.write(metin)
+            os.replace(gecici, self.yol)
+            self._dosya = (os.stat(self.yol).st_ino, len(metin.encode("utf-8")))
+            self._satir_sayisi = len(satirlar)
+            return
+        with open(self.yol, "a", encoding="utf-8") as f:
+            f.write(metin)
+        self._dosya = (self._dosya[0], self._dosya[1] + len(metin.encode("utf-8")))
+        self._satir_sayisi += len(satirlar)
+    
+    def _sikistir(self):
+        """Günlüğü yalnızca canlı özetlerle yeniden yaz"""
+        self._birlestir()
+        canli = self._taban_kimlikleri > 0
+        self._gunluk_yaz([
+            f"{ozet} {kimlik}\n"
+            for ozet, kimlik in zip(self._taban.to_numpy()[canli].tolist(), self._taban_kimlikleri[canli].tolist())
+        ], bastan=True)
+    
+    def _depodan_kur(self):
+        """Depodaki kayıtların oturumsuz özetleriyle dizini ve günlüğü kur"""
+        ozetler, kimlikler = [], []
+        for parca in self.depo.parcalar(TUM_KAYITLAR):
+            ozetler.append(kayit_ozetleri(parca))
+            kimlikler.append(parca[KIMLIK].to_numpy(dtype=np.int64))
+        self._sifirla()
+        if ozetler:
+            self._isle_ekle(np.concatenate(ozetler), np.concatenate(kimlikler))
+        self._sikistir()
+    
+    def yenile(self):
+        """Dizini günlükle eşitle (yazma kilidi altında, her yazmadan önce çağrılır)"""
+        if self.yol is None:
+            if not self._hazir:
+                self._depodan_kur()
+                self._hazir = True
+            return
+        try:
+            durum = os.stat(self.yol)
+        except FileNotFoundError:
+            with asama("tekrar_dizini"):
+                self._depodan_kur()
+            return
+        
+        if self._dosya is None or self._dosya[0] != durum.st_ino or durum.st_size < self._dosya[1]:
+            # İlk okuma ya da günlük başka süreçte sıkıştırıldı/temizlendi
+            with asama("tekrar_dizini"):
+                self._tum_gunlugu_oku(durum)
+        elif durum.st_size > self._dosya[1]:
+            # Başka bir süreç kayıt ekledi: yalnızca yeni satırlar okunur
+            with open(self.yol, "rb") as f:
+                f.seek(self._dosya[1])
+                ham = f.read()
+            ozetler, kimlikler, silme = self._satirlar_oku(ham.decode("utf-8"))
+            bas = 0
+            # Ekleme ve silmeler sırası korunarak ardışık bloklar halinde işlenir
+            sinirlar = [*np.flatnonzero(np.diff(silme.astype(np.int8))) + 1, len(silme)] if len(silme) else []
+            for son in sinirlar:
+                if silme[bas]:
+                    self._isle_sil(kimlikler[bas:son])
+                else:
+                    self._isle_ekle(ozetler[bas:son], kimlikler[bas:son])
+                bas = son
+            self._dosya = (durum.st_ino, durum.st_size)
+            self._satir_sayisi += len(silme)
+    
+    def tekrarlar(self, ozetler, onceki=()):
+        """Dizinde, verilen önceki özetlerde ya da listenin kendisinde daha önce geçen özetler için True"""
+        ozetler = np.asarray(ozetler, dtype=np.uint64)
+        tekrar = (self.kimlikler(ozetler) > 0) | pd.Series(ozetler).duplicated().to_numpy()
+        if len(onceki):
+            tekrar |= np.isin(ozetler, onceki)
+        return tekrar
+    
+    def ekle(self, ozetler, kimlikler):
+        """Yazılan kayıtların özetlerini dizine ve günlüğe ekle"""
+        if not len(kimlikler):
+            return
+        self._isle_ekle(ozetler, kimlikler)
+        self._gunluk_yaz([
+            f"{ozet} {kimlik}\n" for ozet, kimlik in zip(np.asarray(ozetler, dtype=np.uint64).tolist(), map(int, kimlikler))
+        ])
+    
+    def sil(self, kimlikler):
+        """Düzenlenen ya da silinen kayıtları dizinden çıkar"""
+        if not len(kimlikler):
+            return
+        self._isle_sil(kimlikler)
+        self._gunluk_yaz([f"- {int(kimlik)}\n" for kimlik in kimlikler])
+        if self._satir_sayisi > OZET_SIKISTIRMA_KATI * len(self) + OZET_BIRLESTIRME_SINIRI:
+            self._sikistir()
+    
+    def temizle(self):
+        """Boş dizin (veritabanı temizlendiğinde)"""
+        self._sifirla()
+        self._gunluk_yaz([], bastan=True)
+    
+    def yeniden_kur(self):
+        """Dizini ve günlüğü depodaki kayıtlardan baştan kur (dizin depoyla uyuşmadığında)"""
+        with asama("tekrar_dizini"):
+            self._depodan_kur()
+        self._hazir = True
+
+def yakin_tekrarlar(df):
+    """Olası tekrar kayıtlar: aynı gün, müdürlük ve kaynakta Ayrıntı'sı aynı olanlar
+    
+    Ayrıntı karşılaştırmasında büyük/küçük harf, Türkçe karakter, noktalama ve boşluk
+    farkları yok sayılır; Sayı ve kayıt zamanı dikkate alınmaz. Her satırda grup
+    numarası ve gruptaki kayıt sayısı bulunur, gruplar ilk kaydın kimliğine göre sıralanır.
+    """
+    kolonlar = ["Grup", "Adet", KIMLIK] + GORUNUM_KOLONLARI + ["Kayit_Zamani"]
+    if df.empty:
+        return pd.DataFrame(columns=kolonlar)
+    
+    def katlanmis_kodlar(seri):
+        # Metinler tekil değerleri üzerinden katlanır; aynı yazıma inen değerler aynı kodu alır
+        kodlar, degerler = pd.factorize(seri.astype(object).fillna(""))
+        katlanmis = metin_terimleri(pd.Series(degerler, dtype=object)).str.join(" ")
+        return pd.factorize(katlanmis)[0][kodlar] if len(kodlar) else kodlar
+    
+    anahtar = pd.DataFrame({
+        "Tarih": pd.factorize(df['Tarih'])[0],
+        "Müdürlük": pd.factorize(df['Müdürlük'].astype(object))[0],
+        "Haber_Kaynagi": katlanmis_kodlar(df['Haber_Kaynagi']),
+        "Ayrıntı": katlanmis_kodlar(df['Ayrıntı']),
+    })
+    tekrar = anahtar.duplicated(keep=False).to_numpy()
+    if not tekrar.any():
+        return pd.DataFrame(columns=kolonlar)
+    
+    sira = np.argsort(df[KIMLIK].to_numpy()[tekrar], kind="stable")
+    secili = df[tekrar].iloc[sira]
+    gruplar = anahtar[tekrar].iloc[sira].groupby(list(anahtar.columns), sort=False).ngroup().to_numpy() + 1
+    adetler = np.bincount(gruplar)[gruplar]
+    return secili.assign(Grup=gruplar, Adet=adetler).sort_values(["Grup", KIMLIK], kind="stable")[kolonlar].reset_index(drop=True)
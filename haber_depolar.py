@@ -0,0 +1,1261 @@
+"""Beykoz haber kayıtları: depolar
+
+Aynı arayüzü (sorgula, ozet, sayfa, ekle, guncelle, yaz, ...) sunan depolar:
+bellekteki tablo (BellekDepo), CSV ve arşivi (CsvDepo, CsvArsivi), SQLite
+(SqliteDepo) ve aylık Parquet bölümleri (ParquetDepo). Depo türü VERI_DEPOSU
+ayarıyla seçilir; kurumların depoları KurumHavuzu'nda paylaşılır.
+"""
+
+import os
+import pandas as pd
+from datetime import date, datetime, timedelta
+from contextlib import contextmanager
+from collections import OrderedDict
+import json
+import re
+import sqlite3
+import threading
+import time
+
+from haber_olcum import asama, satir_say
+from haber_kayit import (
+    ARSIV_UFKU_GUN, GORUNUM_KOLONLARI, KIMLIK, KOLONLAR, KURUM_BELLEK_SINIRI,
+    OZET_ANAHTARI, OZET_KOLONLARI, PARCA_BOYUTU, TUM_KAYITLAR, VARSAYILAN_KURUM,
+    VERI_DEPOSU, SorguOnbellegi, degisiklikleri_uygula, kayit_metinleri,
+    ozet_birlestir, ozet_farki, ozet_hazirla, ozet_hesapla, sayfa_etiketleri,
+    tablo_bellegi, tablo_birlestir, veri_hazirla,
+)
+from haber_arama import AramaDizini, KayitOzetleri
+
+# ==================== DEPOLAR ====================
+
+class KimlikSayaci:
+    """Verilen son kayıt kimliğini tutan, yalnızca artan sayaç dosyası
+    
+    Silinen ya da temizlenen kayıtların kimlikleri yeniden verilmez; eski bir
+    tablo görünümüyle düzenleme yapan oturum, değişiklik geçmişi ve API aynı
+    kimlikte iki farklı kayıt görmez. Kimlikler kayıtlar yazılmadan önce ayrılır;
+    yazma yarıda kalırsa kimlikler boşta kalır ama tekrar verilmez.
+    """
+    
+    def __init__(self, yol):
+        self.yol = yol
+    
+    def oku(self, en_az=0):
+        """Verilen son kimlik; sayaç yoksa ya da geride kaldıysa en_az"""
+        try:
+            with open(self.yol) as f:
+                return max(int(f.read().strip() or 0), en_az)
+        except FileNotFoundError:
+            return en_az
+    
+    def ilerlet(self, son):
+        """Sayacı son'a ilerlet; sayaç zaten ilerideyse değişmez"""
+        if son <= self.oku():
+            return
+        with open(self.yol + ".tmp", "w") as f:
+            f.write(str(int(son)))
+        os.replace(self.yol + ".tmp", self.yol)
+
+class BellekDepo:
+    """Bellekteki bir tablo üzerinde salt okunur depo
+    
+    Sorgular CSV deposuyla aynıdır (CsvDepo bu sınıfı genişletir). Komut satırı
+    araçları veriyi bir kez okuyup raporları bu depo üzerinden üretir.
+    """
+    
+    def __init__(self, df):
+        self._df = veri_hazirla(df.reindex(columns=[KIMLIK] + KOLONLAR))
+        self._ozet_df = None
+        self.dizin = AramaDizini(self)
+        self.ozetler = KayitOzetleri(self)
+    
+    def surum(self):
+        return ("bellek", len(self._df))
+    
+    def bellek(self):
+        """Bellekte tutulan tabloların ve arama dizininin yaklaşık boyutu (bayt)"""
+        return tablo_bellegi(self._df, self._ozet_df) + self.dizin.bellek()
+    
+    def bosalt(self):
+        """Yeniden hesaplanabilen özeti ve dizini bellekten at (tablonun kendisi kalır)"""
+        self._ozet_df = None
+        self.dizin.bosalt()
+    
+    def yukle(self):
+        """Tüm kayıtlar (paylaşılır, değiştirmeden önce kopyalayın)"""
+        return self._df
+    
+    def _tablo(self, filtre):
+        """Filtreye uyan kayıtları içeren tablo (paylaşılır; burada tüm kayıtlar)"""
+        return self.yukle()
+    
+    def _ozet(self, filtre=TUM_KAYITLAR):
+        """Filtreye uyan özet satırlarını içeren günlük özet (burada tüm kayıtların özeti)"""
+        if self._ozet_df is None:
+            self._ozet_df = ozet_hesapla(self._df)
+        return self._ozet_df
+    
+    def _maske(self, filtre, df):
+        return filtre.maske(df, self.dizin.ara(filtre.arama))
+    
+    def ozet(self, filtre):
+        """Filtreye uyan günlük özet satırları"""
+        if filtre.arama:
+            # Özet tablosunda metin yok; arama varsa özet eşleşen kayıtlardan çıkarılır
+            df = self._tablo(filtre)
+            return ozet_hesapla(df[self._maske(filtre, df)]) if not df.empty else ozet_hesapla(df)
+        ozet = self._ozet(filtre)
+        if ozet.empty:
+            return ozet
+        return ozet[filtre.maske(ozet)]
+    
+    def sorgula(self, filtre, kolonlar=None):
+        """Filtreye uyan kayıtlar"""
+        df = self._tablo(filtre)
+        if df.empty:
+            return pd.DataFrame()
+        sonuc = df[self._maske(filtre, df)]
+        if kolonlar is not None:
+            sonuc = sonuc[list(dict.fromkeys([KIMLIK, *kolonlar]))]
+        return sonuc.copy()
+    
+    def parcalar(self, filtre, parca_boyutu=PARCA_BOYUTU):
+        """Filtreye uyan kayıtları parça parça döndür"""
+        df = self._tablo(filtre)
+        if df.empty:
+            return
+        secili = df.index[self._maske(filtre, df)]
+        for bas in range(0, len(secili), parca_boyutu):
+            yield df.loc[secili[bas:bas + parca_boyutu]]
+    
+    def sayfa(self, filtre, siralama=KIMLIK, artan=True, ofset=0, limit=50):
+        """Filtreye uyan kayıtlardan sıralanmış tek bir sayfa"""
+        df = self._tablo(filtre)
+        if df.empty:
+            return pd.DataFrame(columns=[KIMLIK] + GORUNUM_KOLONLARI)
+        # Sıralama yalnızca anahtar kolonlar üzerinde yapılır, sayfa dışındaki satırlar kopyalanmaz
+        secili = df.loc[self._maske(filtre, df), list(dict.fromkeys([KIMLIK, siralama]))]
+        etiketler = sayfa_etiketleri(secili, siralama, artan, ofset, limit)
+        return df.loc[etiketler, [KIMLIK] + GORUNUM_KOLONLARI].reset_index(drop=True)
+
+# ==================== ARŞİV ====================
+
+# Arşivden okunup bellekte tutulan en fazla bölüm (ay) sayısı
+ARSIV_BELLEK_BOLUMU = 12
+
+def arsiv_siniri(bugun=None, ufuk_gun=ARSIV_UFKU_GUN):
+    """Arşive taşınacak kayıtların sınırı: ufkun düştüğü ayın ilk günü
+    
+    Bu tarihten önceki kayıtlar taşınır; sınır ayda bir ilerlediğinden her ay
+    arşive bir kez, bütün olarak yazılır.
+    """
+    return ((bugun or date.today()) - timedelta(days=ufuk_gun)).replace(day=1)
+
+class CsvArsivi:
+    """CSV deposunun eski kayıtlarını aylık, sıkıştırılmış bölümlerde tutan arşiv
+    
+    Bölümler (YYYY-MM.<sürüm>.csv.gz) yazıldıktan sonra değişmez; her yazma yeni
+    sürümlü dosyalar yazar ve geçerli dosyaları tek atamayla değişen arsiv.json
+    belirler. Tanımda her bölümün tarih aralığı bulunur, böylece sorgular yalnızca
+    kesişen bölümleri açar; günlük özet ayrı dosyada tutulur. Okunan bölümler
+    bellekte sınırlı sayıda saklanır.
+    """
+    
+    def __init__(self, klasor):
+        self.klasor = klasor
+        self._bolumler = SorguOnbellegi(ARSIV_BELLEK_BOLUMU)
+        self._durum = (None, None)
+        self._ozet_durumu = (None, None)
+    
+    def _tanim_yolu(self):
+        return os.path.join(self.klasor, "arsiv.json")
+    
+    def surum(self):
+        """Arşiv tanımının imzası: (değişiklik zamanı, boyut); arşiv yoksa None"""
+        try:
+            durum = os.stat(self._tanim_yolu())
+        except FileNotFoundError:
+            return None
+        return (durum.st_mtime_ns, durum.st_size)
+    
+    def bilgi(self):
+        """Geçerli arşiv tanımı: bölümler, özet dosyası, son kimlik ve taşınmakta olan aylar"""
+        imza = self.surum()
+        onceki_imza, bilgi = self._durum
+        if bilgi is None or onceki_imza != imza:
+            if imza is None:
+                bilgi = {"surum": 0, "bolumler": {}, "ozet": None, "son_kimlik": 0, "tasinan": []}
+            else:
+                with open(self._tanim_yolu(), encoding="utf-8") as f:
+                    bilgi = json.load(f)
+            self._durum = (imza, bilgi)
+        return bilgi
+    
+    def son_kimlik(self):
+        return self.bilgi()["son_kimlik"]
+    
+    def bellek(self):
+        """Bellekteki bölümlerin ve özetin yaklaşık boyutu (bayt)"""
+        return tablo_bellegi(*self._bolumler.degerler(), self._ozet_durumu[1])
+    
+    def bosalt(self):
+        """Okunmuş bölümleri ve özeti bellekten at"""
+        self._bolumler.temizle()
+        self._ozet_durumu = (None, None)
+    
+    def aylar(self, filtre=TUM_KAYITLAR):
+        """Filtrenin tarih aralığıyla kesişen bölümler (YYYY-MM), sıralı"""
+        bas, son = f"{filtre.baslangic:%Y-%m-%d}", f"{filtre.bitis:%Y-%m-%d}"
+        return sorted(
+            ay for ay, bolum in self.bilgi()["bolumler"].items()
+            if bolum["ilk"] <= son and bolum["son"] >= bas
+        )
+    
+    def bolum(self, ay):
+        """Bölümün tiplenmiş kayıtları (paylaşılır, değiştirmeden önce kopyalayın)"""
+        dosya = self.bilgi()["bolumler"][ay]["dosya"]
+        df = self._bolumler.al(dosya)
+        if df is None:
+            with asama("arsiv_okuma"):
+                df = veri_hazirla(pd.read_csv(os.path.join(self.klasor, dosya), encoding='utf-8'))
+            satir_say("arsivden_okunan", len(df))
+            self._bolumler.koy(dosya, df)
+        return df
+    
+    def ozet(self):
+        """Arşivdeki kayıtların günlük özeti"""
+        bilgi = self.bilgi()
+        dosya, ozet = self._ozet_durumu
+        if ozet is None or dosya != bilgi["ozet"]:
+            if bilgi["ozet"] is None:
+                ozet = pd.DataFrame(columns=OZET_KOLONLARI)
+            else:
+                ozet = ozet_hazirla(pd.read_csv(os.path.join(self.klasor, bilgi["ozet"]), encoding='utf-8'))
+            self._ozet_durumu = (bilgi["ozet"], ozet)
+        return ozet
+    
+    def _yaz(self, bolumler, ozet, tasinan=(), son_kimlik=None):
+        """Değişen bölümleri (ay → tablo; boş tablo bölümü kaldırır) ve özeti yeni sürümle yaz
+        
+        Dosyalar yeni adlarla yazılır, ardından tanım tek atamayla değiştirilir;
+        yazma yarıda kalırsa önceki tanım ve dosyaları geçerli kalır.
+        """
+        onceki = self.bilgi()
+        bilgi = {**onceki, "bolumler": dict(onceki["bolumler"])}
+        surum = onceki["surum"] + 1
+        os.makedirs(self.klasor, exist_ok=True)
+        
+        for ay, df in bolumler.items():
+            if df.empty:
+                bilgi["bolumler"].pop(ay, None)
+                continue
+            dosya = f"{ay}.{surum}.csv.gz"
+            metinler = kayit_metinleri(df)
+            metinler.insert(0, KIMLIK, df[KIMLIK].astype('int64').values)
+            metinler.sort_values(KIMLIK).to_csv(os.path.join(self.klasor, dosya), index=False, encoding='utf-8')
+            bilgi["bolumler"][ay] = {
+                "dosya": dosya,
+                "ilk": f"{df['Tarih'].min():%Y-%m-%d}",
+                "son": f"{df['Tarih'].max():%Y-%m-%d}",
+                "kayit": len(df),
+            }
+            if son_kimlik is None:
+                bilgi["son_kimlik"] = max(bilgi["son_kimlik"], int(df[KIMLIK].max()))
+        if son_kimlik is not None:
+            bilgi["son_kimlik"] = son_kimlik
+        
+        bilgi["ozet"] = None
+        if not ozet.empty:
+            bilgi["ozet"] = f"gunluk_ozet.{surum}.csv.gz"
+            ozet.reindex(columns=OZET_KOLONLARI).assign(
+                Tarih=pd.to_datetime(ozet['Tarih']).dt.strftime('%Y-%m-%d')
+            ).to_csv(os.path.join(self.klasor, bilgi["ozet"]), index=False, encoding='utf-8')
+        
+        bilgi["surum"] = surum
+        bilgi["tasinan"] = sorted(tasinan)
+        gecici = self._tanim_yolu() + ".tmp"
+        with open(gecici, "w", encoding="utf-8") as f:
+            json.dump(bilgi, f, ensure_ascii=False, indent=1)
+        os.replace(gecici, self._tanim_yolu())
+        self._eskileri_sil(onceki, bilgi)
+    
+    def _eskileri_sil(self, onceki, bilgi):
+        """Tanımlarda geçmeyen dosyaları sil
+        
+        Önceki tanımın dosyaları bir sürüm daha tutulur; önceki tanımı okumuş
+        başka bir süreç bölümlerini açabilir.
+        """
+        kalanlar = {"arsiv.json"}
+        for tanim in (onceki, bilgi):
+            kalanlar.update(bolum["dosya"] for bolum in tanim["bolumler"].values())
+            kalanlar.add(tanim["ozet"])
+        for ad in os.listdir(self.klasor):
+            if ad not in kalanlar:
+                try:
+                    os.remove(os.path.join(self.klasor, ad))
+                except OSError:
+                    pass
+    
+    def ekle(self, df):
+        """Kayıtları aylarının bölümlerine ekle; aylar taşıma bitene kadar işaretli kalır"""
+        bilgi = self.bilgi()
+        bolumler = {}
+        for ay, grup in df.groupby(df['Tarih'].dt.strftime('%Y-%m')):
+            mevcut = [self.bolum(ay)] if ay in bilgi["bolumler"] else []
+            bolumler[ay] = tablo_birlestir(mevcut + [grup])
+        self._yaz(bolumler, ozet_birlestir(self.ozet(), ozet_hesapla(df)), tasinan=bolumler)
+    
+    def tasima_bitti(self):
+        """Taşınan ayların işaretini kaldır"""
+        if self.bilgi()["tasinan"]:
+            self._yaz({}, self.ozet())
+    
+    def tasinan_kimlikler(self):
+        """Taşınmakta olan aylardaki kayıtların kimlikleri (yarıda kalmış taşımada sıcak dosyada da bulunur)"""
+        kimlikler = [self.bolum(ay)[KIMLIK] for ay in self.bilgi()["tasinan"] if ay in self.bilgi()["bolumler"]]
+        return pd.concat(kimlikler) if kimlikler else pd.Series([], dtype='int64')
+    
+    def guncelle(self, duzenlenenler, silinenler):
+        """Arşivdeki kayıtları düzenle ya da sil; yalnızca etkilenen bölümler yeniden yazılır
+        
+        Tarihi değişen kayıt yeni tarihinin ayındaki bölüme geçer.
+        """
+        hedefler = set(duzenlenenler) | set(silinenler)
+        aylar = {ay for ay in self.aylar() if self.bolum(ay)[KIMLIK].isin(hedefler).any()}
+        if not aylar:
+            return
+        mevcut = tablo_birlestir([self.bolum(ay) for ay in sorted(aylar)])
+        df, _ = degisiklikleri_uygula(mevcut, duzenlenenler, pd.DataFrame(columns=KOLONLAR), silinenler, 0)
+        
+        # Tarihi değişen kayıtlar başka bir aya düşebilir
+        yeni_aylar = df['Tarih'].dt.strftime('%Y-%m')
+        ek_aylar = set(yeni_aylar.dropna()) - aylar
+        df = tablo_birlestir([df] + [self.bolum(ay) for ay in sorted(ek_aylar & set(self.bilgi()["bolumler"]))])
+        yeni_aylar = df['Tarih'].dt.strftime('%Y-%m')
+        
+        eski = mevcut[mevcut[KIMLIK].isin(hedefler)]
+        yeni = df[df[KIMLIK].isin(set(duzenlenenler))]
+        self._yaz(
+            {ay: df[yeni_aylar == ay] for ay in aylar | ek_aylar},
+            ozet_farki(self.ozet(), eski, yeni),
+            self.bilgi()["tasinan"],
+        )
+    
+    def temizle(self):
+        """Arşivi boşalt"""
+        if self.surum() is not None:
+            bos = pd.DataFrame(columns=[KIMLIK] + KOLONLAR)
+            self._yaz({ay: bos for ay in self.bilgi()["bolumler"]}, pd.DataFrame(columns=OZET_KOLONLARI), son_kimlik=0)
+            # Boşaltılan veriler bir sürüm daha bekletilmez
+            self._eskileri_sil(self.bilgi(), self.bilgi())
+
+class CsvDepo(BellekDepo):
+    """Kayıtları bir CSV dosyasında (sıcak kayıtlar) ve aylık arşiv bölümlerinde tutan depo
+    
+    Bellekteki kopya tüm oturumlarca paylaşılır ve salt okunurdur. Her yazma yeni bir
+    kopya (imza, tablo, özet) hazırlayıp tek atamayla yayımlar; okuyanlar o anki
+    kopyayı alır ve yarım güncellenmiş veri görmez.
+    
+    arsivle ile eski kayıtlar CsvArsivi'ne taşınır; tarih aralığı arşive uzanan
+    sorgular kesişen arşiv bölümlerini sıcak kayıtlarla birlikte okur.
+    """
+    
+    def __init__(self, dosya_adi):
+        self.dosya_adi = dosya_adi
+        self._onbellek = None
+        self._kilit = threading.RLock()
+        self._sorgu_onbellegi = SorguOnbellegi(2)
+        self.arsiv = CsvArsivi(dosya_adi + ".arsiv")
+        self.kimlik_sayaci = KimlikSayaci(dosya_adi + ".son_kimlik")
+        self.dizin = AramaDizini(self)
+        self.ozetler = KayitOzetleri(self, dosya_adi + ".ozetler")
+    
+    def surum(self):
+        """Veri dosyasının ve arşivin sürüm imzası: (değişiklik zamanı, boyut, arşiv imzası)"""
+        try:
+            durum = os.stat(self.dosya_adi)
+        except FileNotFoundError:
+            return None
+        return (durum.st_mtime_ns, durum.st_size, self.arsiv.surum())
+    
+    def _oku(self):
+        """Veritabanını diskten oku, yoksa oluştur"""
+        if not os.path.exists(self.dosya_adi):
+            # Yeni veritabanı oluştur
+            df = pd.DataFrame(columns=[KIMLIK] + KOLONLAR)
+            df.to_csv(self.dosya_adi, index=False, encoding='utf-8-sig')
+            return df
+        
+        # Mevcut veritabanını oku
+        with asama("okuma"):
+            try:
+                df = pd.read_csv(self.dosya_adi, encoding='utf-8-sig')
+            except:
+                df = pd.read_csv(self.dosya_adi)
+        satir_say("okunan", len(df))
+        
+        # Kimliksiz eski dosya: kayıtlara bir kereye mahsus kimlik ver
+        if KIMLIK not in df.columns:
+            df.insert(0, KIMLIK, range(1, len(df) + 1))
+            df.to_csv(self.dosya_adi, index=False, encoding='utf-8-sig')
+        
+        # Yarıda kalmış taşıma: arşive yazılmış kayıtlar dosyadan çıkarılmamış olabilir
+        if self.arsiv.bilgi()["tasinan"]:
+            df = df[~df[KIMLIK].isin(self.arsiv.tasinan_kimlikler())].reset_index(drop=True)
+        
+        with asama("tip_donusumu"):
+            return veri_hazirla(df)
+    
+    def _anlik(self):
+        """Yayımlanmış güncel kopya; dosya değiştiyse (ör. başka süreç yazdıysa) bir kez okunur"""
+        onbellek = self._onbellek
+        imza = self.surum()
+        if onbellek is not None and imza is not None and onbellek["imza"] == imza:
+            return onbellek
+        
+        # Aynı anda gelen oturumlar dosyayı tek kez okur
+        with self._kilit:
+            onbellek = self._onbellek
+            imza = self.surum()
+            if onbellek is not None and imza is not None and onbellek["imza"] == imza:
+                return onbellek
+            # İmza okumadan önce alınır; okuma sırasında dosya değişirse sonraki çağrı yeniden okur
+            onbellek = {"imza": imza, "df": self._oku(), "ozet": None}
+            self._onbellek = onbellek
+            return onbellek
+    
+    def _yayinla(self, df, ozet=None):
+        """Yeni kopyayı tek atamayla yayımla"""
+        self._onbellek = {"imza": self.surum(), "df": df, "ozet": ozet}
+    
+    def bellek(self):
+        """Paylaşılan kopyanın, sorgu önbelleğinin, arşiv bölümlerinin ve dizinin yaklaşık boyutu (bayt)"""
+        onbellek = self._onbellek or {}
+        tablolar = [onbellek.get("df"), onbellek.get("ozet"), onbellek.get("tum_ozet")]
+        return tablo_bellegi(*tablolar, *self._sorgu_onbellegi.degerler()) + self.arsiv.bellek() + self.dizin.bellek()
+    
+    def bosalt(self):
+        """Bellekteki kopyaları at; sonraki okuma dosyadan yapılır
+        
+        Tabloyu o an kullanan oturumlar ellerindeki kopyayla devam eder.
+        """
+        with self._kilit:
+            self._onbellek = None
+        self._sorgu_onbellegi.temizle()
+        self.arsiv.bosalt()
+        self.dizin.bosalt()
+    
+    def yukle(self):
+        """Tüm kayıtları (arşiv dahil) yükle; dosya değişmediyse paylaşılan kopyayı döndür
+        
+        Dönen tablo oturumlar arasında paylaşılır, üzerinde değişiklik yapmadan önce kopyalayın.
+        """
+        return self._tablo(TUM_KAYITLAR)
+    
+    def _tablo(self, filtre):
+        """Sıcak kayıtlar; filtrenin tarih aralığı arşive uzanıyorsa kesişen bölümlerle birlikte"""
+        onbellek = self._anlik()
+        aylar = tuple(self.arsiv.aylar(filtre))
+        if not aylar:
+            return onbellek["df"]
+        anahtar = (onbellek["imza"], aylar)
+        df = self._sorgu_onbellegi.al(anahtar)
+        if df is None:
+            df = tablo_birlestir([self.arsiv.bolum(ay) for ay in aylar] + [onbellek["df"]])
+            self._sorgu_onbellegi.koy(anahtar, df)
+        return df
+    
+    def _sicak_ozet(self):
+        """Paylaşılan kopyanın günlük özeti; kopya başına bir kez hesaplanır"""
+        onbellek = self._anlik()
+        if onbellek["ozet"] is None:
+            onbellek["ozet"] = ozet_hesapla(onbellek["df"])
+        return onbellek["ozet"]
+    
+    def _ozet(self, filtre=TUM_KAYITLAR):
+        """Günlük özet; filtrenin tarih aralığı arşive uzanıyorsa arşivin özetiyle birlikte"""
+        onbellek = self._anlik()
+        if not self.arsiv.aylar(filtre):
+            return self._sicak_ozet()
+        if onbellek.get("tum_ozet") is None:
+            onbellek["tum_ozet"] = ozet_birlestir(self._sicak_ozet(), self.arsiv.ozet())
+        return onbellek["tum_ozet"]
+    
+    def _son_kimlik(self, df):
+        """Verilen son kimlik (silinen ve arşive taşınmış kayıtlar dahil)
+        
+        Sayaçtan önceki sürümlerin dosyalarında sayaç yoktur; o zaman dosyadaki ve
+        arşivdeki en büyük kimlik kullanılır.
+        """
+        return self.kimlik_sayaci.oku(max(int(df[KIMLIK].max()) if not df.empty else 0, self.arsiv.son_kimlik()))
+    
+    def ekle(self, yeni_df):
+        """Kayıtları dosyanın sonuna ekle, önbelleği yeniden okumadan genişlet
+        
+        Yeni kayıtlara verilen kimlikleri döndürür.
+        """
+        with self._kilit:
+            onceki = self._anlik()
+            son_kimlik = self._son_kimlik(onceki["df"])
+            yeni_df = yeni_df.reindex(columns=KOLONLAR)
+            yeni_df.insert(0, KIMLIK, range(son_kimlik + 1, son_kimlik + 1 + len(yeni_df)))
+            self.kimlik_sayaci.ilerlet(son_kimlik + len(yeni_df))
+            
+            onceki_imza = self.surum()
+            
+            # CSV'ye ekle
+            yeni_df.to_csv(self.dosya_adi, mode='a', header=onceki_imza is None, index=False, encoding='utf-8-sig')
+            
+            # Kopya eklemeden hemen önceki dosyayı yansıtıyorsa sadece yeni satırları ekleyip yayımla
+            if onceki_imza is not None and onceki["imza"] == onceki_imza:
+                eklenen = veri_hazirla(yeni_df.copy())
+                ozet = onceki["ozet"]
+                self._yayinla(
+                    tablo_birlestir([onceki["df"], eklenen]),
+                    None if ozet is None else ozet_birlestir(ozet, ozet_hesapla(eklenen))
+                )
+            else:
+                self._onbellek = None
+        
+        return yeni_df[KIMLIK].tolist()
+    
+    def guncelle(self, duzenlenenler, eklenenler, silinenler):
+        """Tablo düzenlemelerini tek seferde uygula
+        
+        duzenlenenler: {kimlik: {kolon: yeni değer}}, eklenenler: yeni kayıtlar tablosu,
+        silinenler: kimlik listesi. CSV biçimi yerinde güncellemeye izin vermediğinden
+        düzenleme/silme varsa dosya yeniden yazılır; yalnızca ekleme varsa sona eklenir.
+        Arşivdeki kayıtların düzenlemeleri arşiv bölümlerine yazılır.
+        """
+        with self._kilit:
+            mevcut = self._anlik()["df"]
+            hedefler = set(duzenlenenler) | set(silinenler)
+            arsivdekiler = hedefler - set(mevcut.loc[mevcut[KIMLIK].isin(hedefler), KIMLIK].tolist())
+            if arsivdekiler:
+                self.arsiv.guncelle(
+                    {kimlik: degerler for kimlik, degerler in duzenlenenler.items() if kimlik in arsivdekiler},
+                    [kimlik for kimlik in silinenler if kimlik in arsivdekiler],
+                )
+                duzenlenenler = {kimlik: degerler for kimlik, degerler in duzenlenenler.items() if kimlik not in arsivdekiler}
+                silinenler = [kimlik for kimlik in silinenler if kimlik not in arsivdekiler]
+        
+        if not duzenlenenler and not silinenler:
+            if len(eklenenler):
+                return self.ekle(eklenenler)
+            if arsivdekiler:
+                # Sıcak dosya değişmedi; arşiv sürümü değiştiğinden kopya yeniden yayımlanır
+                with self._kilit:
+                    self._yayinla(mevcut, self._sicak_ozet())
+            return []
+        
+        with self._kilit:
+            mevcut = self._anlik()["df"]
+            ozet = self._sicak_ozet()
+            # Paylaşılan tablo yerinde değiştirilmez, değişiklikler kopyaya uygulanır
+            df, eklenen_kimlikler = degisiklikleri_uygula(
+                mevcut, duzenlenenler, eklenenler, silinenler, self._son_kimlik(mevcut)
+            )
+            if eklenen_kimlikler:
+                self.kimlik_sayaci.ilerlet(eklenen_kimlikler[-1])
+            
+            # Özeti sadece değişen kayıtlar üzerinden güncelle
+            eski = mevcut[mevcut[KIMLIK].isin(set(duzenlenenler) | set(silinenler))]
+            yeni = df[df[KIMLIK].isin(set(duzenlenenler) | set(eklenen_kimlikler))]
+            
+            self.yaz(df, ozet_farki(ozet, eski, yeni))
+        return eklenen_kimlikler
+    
+    def yaz(self, df, ozet=None):
+        """Sıcak kayıtları verilen tabloyla değiştir (arşiv değişmez)"""
+        df = veri_hazirla(df.reindex(columns=[KIMLIK] + KOLONLAR))
+        with self._kilit:
+            if not df.empty:
+                self.kimlik_sayaci.ilerlet(int(df[KIMLIK].max()))
+            # Geçici dosyaya yazıp yerine taşı; okuyanlar yarım yazılmış dosya görmez
+            gecici = self.dosya_adi + ".tmp"
+            df.to_csv(gecici, index=False, encoding='utf-8-sig')
+            os.replace(gecici, self.dosya_adi)
+            self._yayinla(df, ozet)
+    
+    def arsivle(self, sinir):
+        """Tarihi sinir'den önceki sıcak kayıtları arşive taşı, taşınan kayıt sayısını döndür
+        
+        Önce arşiv yazılır ve taşınan aylar işaretlenir, sonra kayıtlar CSV dosyasından
+        çıkarılıp işaret kaldırılır. Arada kesilirse kayıtlar iki yerde birden kalır;
+        dosya okunurken işaretli aylardaki kimlikler atlanır, sonraki arşivleme
+        dosyayı düzeltir.
+        """
+        with self._kilit:
+            df = self._anlik()["df"]
+            tasinacak = df['Tarih'] < pd.Timestamp(sinir)
+            if not tasinacak.any() and not self.arsiv.bilgi()["tasinan"]:
+                return 0
+            
+            tasinanlar = df[tasinacak]
+            if len(tasinanlar):
+                with asama("arsivleme"):
+                    self.arsiv.ekle(tasinanlar)
+            self.yaz(df[~tasinacak], ozet_birlestir(self._sicak_ozet(), ozet_hesapla(tasinanlar), -1))
+            self.arsiv.tasima_bitti()
+            # Arşiv sürümü değişti; yayımlanan kopya aynı kalır
+            self._yayinla(self._onbellek["df"], self._onbellek["ozet"])
+        return len(tasinanlar)
+    
+    def geri_yukle(self, df):
+        """Tüm veritabanını (arşiv dahil) verilen tabloyla değiştir; eski kayıtlar sonraki arşivlemede yeniden taşınır"""
+        with self._kilit:
+            self.arsiv.temizle()
+            self.yaz(df)
+    
+    def temizle(self):
+        """Boş veritabanı oluştur (arşiv de boşaltılır)"""
+        self.geri_yukle(pd.DataFrame(columns=[KIMLIK] + KOLONLAR))
+
+class SqliteDepo:
+    """Kayıtları WAL kipinde, indeksli bir SQLite veritabanında tutan depo
+    
+    Filtreler parametreli sorguya çevrilir; pandas'a yalnızca eşleşen satırlar gelir.
+    Kayıt kimliği tablonun birincil anahtarıdır; yeni kimlikler meta tablosundaki
+    yalnızca artan son_kimlik sayacından verilir.
+    """
+    
+    SEMA = """
+        CREATE TABLE IF NOT EXISTS kayitlar (
+            id INTEGER PRIMARY KEY,
+            "Tarih" TEXT NOT NULL,
+            "Müdürlük" TEXT NOT NULL,
+            "Haber_Kaynagi" TEXT NOT NULL,
+            "Sayı" INTEGER NOT NULL DEFAULT 1,
+            "Ayrıntı" TEXT NOT NULL DEFAULT '',
+            "Kayit_Zamani" TEXT NOT NULL DEFAULT ''
+        );
+        CREATE INDEX IF NOT EXISTS ix_kayitlar_tarih ON kayitlar ("Tarih");
+        CREATE INDEX IF NOT EXISTS ix_kayitlar_mudurluk ON kayitlar ("Müdürlük", "Tarih");
+        CREATE INDEX IF NOT EXISTS ix_kayitlar_kaynak ON kayitlar ("Haber_Kaynagi", "Tarih");
+        CREATE TABLE IF NOT EXISTS meta (
+            anahtar TEXT PRIMARY KEY,
+            deger TEXT
+        );
+        INSERT OR IGNORE INTO meta (anahtar, deger) VALUES ('surum', '0');
+        -- Verilen son kimlik; silinen ve temizlenen kayıtların kimlikleri yeniden verilmez
+        INSERT OR IGNORE INTO meta (anahtar, deger) SELECT 'son_kimlik', COALESCE(MAX(id), 0) FROM kayitlar;
+        
+        -- Günlük özet; tetikleyicilerle her yazmada artımlı güncellenir
+        CREATE TABLE IF NOT EXISTS gunluk_ozet (
+            "Tarih" TEXT NOT NULL,
+            "Müdürlük" TEXT NOT NULL,
+            "Haber_Kaynagi" TEXT NOT NULL,
+            "Sayı" INTEGER NOT NULL DEFAULT 0,
+            "Kayit" INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY ("Tarih", "Müdürlük", "Haber_Kaynagi")
+        ) WITHOUT ROWID;
+        CREATE TRIGGER IF NOT EXISTS tr_ozet_ekle AFTER INSERT ON kayitlar BEGIN
+            INSERT INTO gunluk_ozet VALUES (NEW."Tarih", NEW."Müdürlük", NEW."Haber_Kaynagi", NEW."Sayı", 1)
+            ON CONFLICT ("Tarih", "Müdürlük", "Haber_Kaynagi")
+            DO UPDATE SET "Sayı" = "Sayı" + excluded."Sayı", "Kayit" = "Kayit" + 1;
+        END;
+        CREATE TRIGGER IF NOT EXISTS tr_ozet_sil AFTER DELETE ON kayitlar BEGIN
+            UPDATE gunluk_ozet SET "Sayı" = "Sayı" - OLD."Sayı", "Kayit" = "Kayit" - 1
+            WHERE "Tarih" = OLD."Tarih" AND "Müdürlük" = OLD."Müdürlük" AND "Haber_Kaynagi" = OLD."Haber_Kaynagi";
+            DELETE FROM gunluk_ozet
+            WHERE "Tarih" = OLD."Tarih" AND "Müdürlük" = OLD."Müdürlük" AND "Haber_Kaynagi" = OLD."Haber_Kaynagi"
+              AND "Kayit" <= 0;
+        END;
+        CREATE TRIGGER IF NOT EXISTS tr_ozet_guncelle
+        AFTER UPDATE OF "Tarih", "Müdürlük", "Haber_Kaynagi", "Sayı" ON kayitlar BEGIN
+            UPDATE gunluk_ozet SET "Sayı" = "Sayı" - OLD."Sayı", "Kayit" = "Kayit" - 1
+            WHERE "Tarih" = OLD."Tarih" AND "Müdürlük" = OLD."Müdürlük" AND "Haber_Kaynagi" = OLD."Haber_Kaynagi";
+            DELETE FROM gunluk_ozet
+            WHERE "Tarih" = OLD."Tarih" AND "Müdürlük" = OLD."Müdürlük" AND "Haber_Kaynagi" = OLD."Haber_Kaynagi"
+              AND "Kayit" <= 0;
+            INSERT INTO gunluk_ozet VALUES (NEW."Tarih", NEW."Müdürlük", NEW."Haber_Kaynagi", NEW."Sayı", 1)
+            ON CONFLICT ("Tarih", "Müdürlük", "Haber_Kaynagi")
+            DO UPDATE SET "Sayı" = "Sayı" + excluded."Sayı", "Kayit" = "Kayit" + 1;
+        END;
+    """
+    
+    KOLON_LISTESI = ", ".join(f'"{kolon}"' for kolon in KOLONLAR)
+    
+    def __init__(self, veritabani):
+        self.veritabani = veritabani
+        self._sorgu_onbellegi = SorguOnbellegi()
+        self.dizin = AramaDizini(self)
+        self.ozetler = KayitOzetleri(self, veritabani + ".ozetler")
+        with self._baglan() as bag:
+            bag.execute("PRAGMA journal_mode=WAL")
+            bag.executescript(self.SEMA)
+        
+        # Özet tablosundan önce oluşturulmuş veritabanları için bir kereye mahsus doldur
+        with self._baglan() as bag:
+            bag.execute("BEGIN IMMEDIATE")
+            if not bag.execute("SELECT 1 FROM meta WHERE anahtar = 'ozet_kuruldu'").fetchone():
+                bag.execute("DELETE FROM gunluk_ozet")
+                bag.execute("""
+                    INSERT INTO gunluk_ozet
+                    SELECT "Tarih", "Müdürlük", "Haber_Kaynagi", SUM("Sayı"), COUNT(*)
+                    FROM kayitlar GROUP BY "Tarih", "Müdürlük", "Haber_Kaynagi"
+                """)
+                bag.execute("INSERT INTO meta (anahtar, deger) VALUES ('ozet_kuruldu', '1')")
+    
+    def bellek(self):
+        """Sorgu önbelleğinin ve arama dizininin yaklaşık boyutu (bayt)"""
+        return tablo_bellegi(*self._sorgu_onbellegi.degerler()) + self.dizin.bellek()
+    
+    def bosalt(self):
+        """Önbelleğe alınmış sorgu sonuçlarını ve dizini bellekten at"""
+        self._sorgu_onbellegi.temizle()
+        self.dizin.bosalt()
+    
+    @contextmanager
+    def _baglan(self):
+        """İşlem (transaction) içinde bağlantı aç, sonunda onayla ve kapat"""
+        bag = sqlite3.connect(self.veritabani, timeout=30)
+        try:
+            with bag:
+                yield bag
+        finally:
+            bag.close()
+    
+    def _surum_artir(self, bag):
+        bag.execute("UPDATE meta SET deger = CAST(deger AS INTEGER) + 1 WHERE anahtar = 'surum'")
+    
+    def _satirlar(self, df, kimlikler):
+        """Tabloyu kimlikleriyle birlikte INSERT parametrelerine çevir"""
+        df = kayit_metinleri(df)
+        return [(kimlik, *satir) for kimlik, satir in zip(kimlikler, df.itertuples(index=False, name=None))]
+    
+    def _ekle(self, bag, df, kimlikler=None):
+        """Kayıtları açık işlem içinde ekle, verilen kimlikleri döndür"""
+        if kimlikler is None:
+            son_kimlik = int(bag.execute("SELECT deger FROM meta WHERE anahtar = 'son_kimlik'").fetchone()[0])
+            kimlikler = list(range(son_kimlik + 1, son_kimlik + 1 + len(df)))
+        bag.executemany(
+            f"INSERT INTO kayitlar (id, {self.KOLON_LISTESI}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            self._satirlar(df, kimlikler)
+        )
+        if kimlikler:
+            bag.execute(
+                "UPDATE meta SET deger = MAX(CAST(deger AS INTEGER), ?) WHERE anahtar = 'son_kimlik'",
+                (int(max(kimlikler)),)
+            )
+        return kimlikler
+    
+    def surum(self):
+        """Her yazma işleminde artan sürüm sayacı"""
+        with self._baglan() as bag:
+            return int(bag.execute("SELECT deger FROM meta WHERE anahtar = 'surum'").fetchone()[0])
+    
+    def _oku(self, bag, kosul="1", parametreler=(), kolonlar=None):
+        kolon_listesi = self.KOLON_LISTESI
+        if kolonlar is not None:
+            kolon_listesi = ", ".join(f'"{kolon}"' for kolon in KOLONLAR if kolon in kolonlar)
+        with asama("okuma"):
+            df = pd.read_sql_query(
+                f'SELECT id AS "{KIMLIK}", {kolon_listesi} FROM kayitlar WHERE {kosul} ORDER BY id',
+                bag, params=parametreler
+            )
+        with asama("tip_donusumu"):
+            return veri_hazirla(df)
+    
+    def yukle(self):
+        """Tüm kayıtları yükle"""
+        with self._baglan() as bag:
+            return self._oku(bag)
+    
+    def _kosullar(self, filtre):
+        """Filtreyi parametreli WHERE ifadesine çevir"""
+        kosullar = ['"Tarih" BETWEEN ? AND ?']
+        parametreler = [filtre.baslangic.isoformat(), filtre.bitis.isoformat()]
+        if filtre.mudurlukler:
+            kosullar.append(f'"Müdürlük" IN ({", ".join("?" * len(filtre.mudurlukler))})')
+            parametreler.extend(filtre.mudurlukler)
+        if filtre.kaynaklar:
+            kosullar.append(f'"Haber_Kaynagi" IN ({", ".join("?" * len(filtre.kaynaklar))})')
+            parametreler.extend(filtre.kaynaklar)
+        kimlikler = self.dizin.ara(filtre.arama)
+        if kimlikler is not None:
+            # Aramaya uyan kimlikler tek bir JSON dizisi parametresiyle geçirilir
+            kosullar.append("id IN (SELECT value FROM json_each(?))")
+            parametreler.append(json.dumps(kimlikler.tolist()))
+        return " AND ".join(kosullar), parametreler
+    
+    def ozet(self, filtre):
+        """Filtreye uyan günlük özet satırları (gunluk_ozet tablosundan)"""
+        kosul, parametreler = self._kosullar(filtre)
+        anahtar_kolonlari = ", ".join(f'"{kolon}"' for kolon in OZET_ANAHTARI)
+        with self._baglan() as bag:
+            if filtre.arama:
+                # Özet tablosunda metin yok; arama varsa özet eşleşen kayıtlardan toplanır
+                sorgu = (
+                    f'SELECT {anahtar_kolonlari}, SUM("Sayı") AS "Sayı", COUNT(*) AS "Kayit" '
+                    f'FROM kayitlar WHERE {kosul} GROUP BY {anahtar_kolonlari}'
+                )
+            else:
+                sorgu = f'SELECT {anahtar_kolonlari}, "Sayı", "Kayit" FROM gunluk_ozet WHERE {kosul}'
+            ozet = pd.read_sql_query(sorgu, bag, params=parametreler)
+        return ozet_hazirla(ozet)
+    
+    def sorgula(self, filtre, kolonlar=None):
+        """Filtreye uyan kayıtlar; aynı sürüm ve filtre için son sonuç tekrar kullanılır"""
+        anahtar = (self.surum(), filtre, tuple(kolonlar or ()))
+        df = self._sorgu_onbellegi.al(anahtar)
+        if df is not None:
+            return df.copy()
+        
+        kosul, parametreler = self._kosullar(filtre)
+        with self._baglan() as bag:
+            df = self._oku(bag, kosul, parametreler, kolonlar)
+        if df.empty:
+            df = pd.DataFrame()
+        
+        self._sorgu_onbellegi.koy(anahtar, df)
+        return df.copy()
+    
+    def parcalar(self, filtre, parca_boyutu=PARCA_BOYUTU):
+        """Filtreye uyan kayıtları imleçten parça parça döndür"""
+        kosul, parametreler = self._kosullar(filtre)
+        with self._baglan() as bag:
+            imlec = bag.execute(
+                f'SELECT id AS "{KIMLIK}", {self.KOLON_LISTESI} FROM kayitlar WHERE {kosul} ORDER BY id',
+                parametreler
+            )
+            kolonlar = [tanim[0] for tanim in imlec.description]
+            while True:
+                satirlar = imlec.fetchmany(parca_boyutu)
+                if not satirlar:
+                    break
+                yield veri_hazirla(pd.DataFrame(satirlar, columns=kolonlar))
+    
+    def sayfa(self, filtre, siralama=KIMLIK, artan=True, ofset=0, limit=50):
+        """Filtreye uyan kayıtlardan sıralanmış tek bir sayfa (LIMIT/OFFSET ile)"""
+        if siralama != KIMLIK and siralama not in KOLONLAR:
+            raise ValueError(f"Geçersiz sıralama kolonu: {siralama}")
+        sira_kolonu = "id" if siralama == KIMLIK else f'"{siralama}"'
+        yon = "ASC" if artan else "DESC"
+        kolon_listesi = ", ".join(f'"{kolon}"' for kolon in GORUNUM_KOLONLARI)
+        kosul, parametreler = self._kosullar(filtre)
+        with self._baglan() as bag:
+            df = pd.read_sql_query(
+                f'SELECT id AS "{KIMLIK}", {kolon_listesi} FROM kayitlar WHERE {kosul} '
+                f'ORDER BY {sira_kolonu} {yon}, id {yon} LIMIT ? OFFSET ?',
+                bag, params=[*parametreler, int(limit), int(ofset)]
+            )
+        return veri_hazirla(df)
+    
+    def ekle(self, yeni_df):
+        """Kayıtları tek işlemde ekle, verilen kimlikleri döndür"""
+        with self._baglan() as bag:
+            bag.execute("BEGIN IMMEDIATE")
+            kimlikler = self._ekle(bag, yeni_df)
+            self._surum_artir(bag)
+        return kimlikler
+    
+    def guncelle(self, duzenlenenler, eklenenler, silinenler):
+        """Tablo düzenlemelerini tek işlemde uygula; maliyet değişen satır sayısıyla orantılı"""
+        with self._baglan() as bag:
+            bag.execute("BEGIN IMMEDIATE")
+            
+            # Her kolon için değişen satırlar tek executemany ile güncellenir
+            for kolon in KOLONLAR:
+                parametreler = [
+                    (self._sql_degeri(kolon, degerler[kolon]), kimlik)
+                    for kimlik, degerler in duzenlenenler.items() if kolon in degerler
+                ]
+                if parametreler:
+                    bag.executemany(f'UPDATE kayitlar SET "{kolon}" = ? WHERE id = ?', parametreler)
+            
+            if silinenler:
+                bag.executemany("DELETE FROM kayitlar WHERE id = ?", [(kimlik,) for kimlik in silinenler])
+            
+            eklenen_kimlikler = self._ekle(bag, eklenenler) if len(eklenenler) else []
+            self._surum_artir(bag)
+        return eklenen_kimlikler
+    
+    def _sql_degeri(self, kolon, deger):
+        if kolon == "Tarih":
+            return pd.to_datetime(deger).strftime('%Y-%m-%d')
+        return deger
+    
+    def yaz(self, df):
+        """Tüm veritabanını verilen tabloyla değiştir"""
+        with self._baglan() as bag:
+            bag.execute("DELETE FROM kayitlar")
+            kimlikler = df[KIMLIK].tolist() if KIMLIK in df.columns else None
+            self._ekle(bag, df, kimlikler)
+            self._surum_artir(bag)
+    
+    def geri_yukle(self, df):
+        """Tüm veritabanını verilen tabloyla (kimlikler korunarak) değiştir"""
+        self.yaz(df)
+    
+    def temizle(self):
+        """Boş veritabanı oluştur"""
+        self.yaz(pd.DataFrame(columns=KOLONLAR))
+    
+    def csv_den_aktar(self, csv_dosyasi):
+        """Mevcut CSV veritabanını bir kereye mahsus aktar (CSV dosyası yedek olarak kalır)"""
+        with self._baglan() as bag:
+            if bag.execute("SELECT 1 FROM meta WHERE anahtar = 'csv_aktarildi'").fetchone():
+                return 0
+        
+        kaynak = CsvDepo(csv_dosyasi)
+        df = kaynak.yukle()
+        with self._baglan() as bag:
+            # İki oturum aynı anda aktarmaya çalışırsa yalnızca biri yazar
+            if bag.execute("SELECT 1 FROM meta WHERE anahtar = 'csv_aktarildi'").fetchone():
+                return 0
+            self._ekle(bag, df, df[KIMLIK].tolist())
+            # CSV'de silinmiş son kayıtların kimlikleri de yeniden verilmez
+            bag.execute(
+                "UPDATE meta SET deger = MAX(CAST(deger AS INTEGER), ?) WHERE anahtar = 'son_kimlik'",
+                (kaynak._son_kimlik(df),)
+            )
+            bag.execute(
+                "INSERT INTO meta (anahtar, deger) VALUES ('csv_aktarildi', ?)",
+                (datetime.now().strftime("%Y-%m-%d %H:%M:%S"),)
+            )
+            self._surum_artir(bag)
+        return len(df)
+
+class ParquetDepo:
+    """Kayıtları aylık Parquet bölümlerinde (YYYY-MM.parquet) tutan kolon tabanlı depo
+    
+    Tarih aralığı sorguları yalnızca aralıkla kesişen ayların dosyalarını açar ve
+    sadece istenen kolonları okur; geçmiş büyüdükçe yükleme süresi sabit kalır.
+    """
+    
+    def __init__(self, klasor):
+        self.klasor = klasor
+        self._sorgu_onbellegi = SorguOnbellegi()
+        self.dizin = AramaDizini(self)
+        self.ozetler = KayitOzetleri(self, os.path.join(klasor, "kayit_ozetleri.txt"))
+        self.kimlik_sayaci = KimlikSayaci(os.path.join(klasor, "son_kimlik"))
+        os.makedirs(self.klasor, exist_ok=True)
+    
+    def bellek(self):
+        """Sorgu önbelleğinin ve arama dizininin yaklaşık boyutu (bayt)"""
+        return tablo_bellegi(*self._sorgu_onbellegi.degerler()) + self.dizin.bellek()
+    
+    def bosalt(self):
+        """Önbelleğe alınmış sorgu sonuçlarını ve dizini bellekten at"""
+        self._sorgu_onbellegi.temizle()
+        self.dizin.bosalt()
+    
+    def _yol(self, ay):
+        return os.path.join(self.klasor, f"{ay}.parquet")
+    
+    def _aylar(self):
+        """Diskteki bölümler (YYYY-MM), sıralı"""
+        return sorted(ad[:7] for ad in os.listdir(self.klasor) if re.fullmatch(r"\d{4}-\d{2}\.parquet", ad))
+    
+    @staticmethod
+    def _ay(tarihler):
+        return pd.to_datetime(tarihler).dt.strftime('%Y-%m')
+    
+    def _ozet_yolu(self):
+        return os.path.join(self.klasor, "gunluk_ozet.parquet")
+    
+    def _ozet_oku(self, kosullar=None):
+        """Kalıcı günlük özet; yoksa bölümlerin yalnızca özet kolonlarından bir kez oluşturulur"""
+        if not os.path.exists(self._ozet_yolu()):
+            kolonlar = OZET_ANAHTARI + ["Sayı"]
+            self._ozet_yaz(ozet_hesapla(self._birlestir([self._bolum_oku(ay, kolonlar) for ay in self._aylar()], kolonlar)))
+        return ozet_hazirla(pd.read_parquet(self._ozet_yolu(), filters=kosullar))
+    
+    def _ozet_yaz(self, ozet):
+        ozet = ozet.reindex(columns=OZET_KOLONLARI)
+        ozet['Tarih'] = pd.to_datetime(ozet['Tarih']).dt.date
+        for kolon in ["Müdürlük", "Haber_Kaynagi"]:
+            ozet[kolon] = ozet[kolon].astype(str)
+        ozet = ozet.astype({'Sayı': 'int64', 'Kayit': 'int64'})
+        gecici = self._ozet_yolu() + ".tmp"
+        ozet.sort_values("Tarih").to_parquet(gecici, index=False)
+        os.replace(gecici, self._ozet_yolu())
+    
+    def ozet(self, filtre):
+        """Filtreye uyan günlük özet satırları (gunluk_ozet.parquet dosyasından)"""
+        if filtre.arama:
+            # Özet dosyasında metin yok; arama varsa özet eşleşen kayıtlardan çıkarılır
+            return ozet_hesapla(self.sorgula(filtre, OZET_ANAHTARI + ["Sayı"]))
+        return self._ozet_oku(self._kosullar(filtre))
+    
+    def surum(self):
+        """Bölüm dosyalarının imzası: (ad, değişiklik zamanı, boyut)"""
+        imza = []
+        for ay in self._aylar():
+            durum = os.stat(self._yol(ay))
+            imza.append((ay, durum.st_mtime_ns, durum.st_size))
+        return tuple(imza)
+    
+    def _bolum_oku(self, ay, kolonlar=None, kosullar=None):
+        with asama("okuma"):
+            return pd.read_parquet(self._yol(ay), columns=kolonlar, filters=kosullar)
+    
+    def _bolum_yaz(self, ay, df):
+        """Bölümü geçici dosyaya yazıp yerine taşı (yarım yazılmış dosya kalmaz)"""
+        yol = self._yol(ay)
+        if df.empty:
+            if os.path.exists(yol):
+                os.remove(yol)
+            return
+        
+        kimlikler = df[KIMLIK].astype('int64')
+        df = kayit_metinleri(df)
+        df.insert(0, KIMLIK, kimlikler)
+        df['Tarih'] = pd.to_datetime(df['Tarih']).dt.date
+        df['Sayı'] = df['Sayı'].astype('int64')
+        for kolon in ["Müdürlük", "Haber_Kaynagi", "Ayrıntı", "Kayit_Zamani"]:
+            df[kolon] = df[kolon].astype(str)
+        
+        gecici = yol + ".tmp"
+        df.sort_values(KIMLIK).to_parquet(gecici, index=False)
+        os.replace(gecici, yol)
+    
+    def _son_kimlik(self):
+        """Verilen son kimlik; sayaç dosyası yoksa bölümlerin kimlik kolonundan bulunur"""
+        if os.path.exists(self.kimlik_sayaci.yol):
+            return self.kimlik_sayaci.oku()
+        son = 0
+        for ay in self._aylar():
+            kimlikler = self._bolum_oku(ay, [KIMLIK])[KIMLIK]
+            if not kimlikler.empty:
+                son = max(son, int(kimlikler.max()))
+        return son
+    
+    def _birlestir(self, parcalar, kolonlar=None):
+        parcalar = [parca for parca in parcalar if not parca.empty]
+        if not parcalar:
+            return pd.DataFrame(columns=kolonlar or [KIMLIK] + KOLONLAR)
+        return pd.concat(parcalar, ignore_index=True)
+    
+    def yukle(self):
+        """Tüm kayıtları yükle"""
+        df = self._birlestir([self._bolum_oku(ay) for ay in self._aylar()])
+        return veri_hazirla(df.sort_values(KIMLIK, ignore_index=True))
+    
+    def _kesisen_aylar(self, filtre):
+        """Tarih aralığıyla kesişen bölümler"""
+        ilk_ay = filtre.baslangic.strftime('%Y-%m')
+        son_ay = filtre.bitis.strftime('%Y-%m')
+        return [ay for ay in self._aylar() if ilk_ay <= ay <= son_ay]
+    
+    def _kosullar(self, filtre):
+        """Filtreyi pyarrow satır koşullarına çevir"""
+        kosullar = [("Tarih", ">=", filtre.baslangic), ("Tarih", "<=", filtre.bitis)]
+        if filtre.mudurlukler:
+            kosullar.append(("Müdürlük", "in", list(filtre.mudurlukler)))
+        if filtre.kaynaklar:
+            kosullar.append(("Haber_Kaynagi", "in", list(filtre.kaynaklar)))
+        kimlikler = self.dizin.ara(filtre.arama)
+        if kimlikler is not None:
+            kosullar.append((KIMLIK, "in", kimlikler.tolist()))
+        return kosullar
+    
+    def sorgula(self, filtre, kolonlar=None):
+        """Filtreye uyan kayıtlar; yalnızca tarih aralığıyla kesişen aylar okunur"""
+        surum = self.surum()
+        anahtar = (surum, filtre, tuple(kolonlar or ()))
+        df = self._sorgu_onbellegi.al(anahtar)
+        if df is not None:
+            return df.copy()
+        
+        # Satır filtreleri pyarrow'a iletilir, eşleşmeyen satır gruplarına hiç dokunulmaz
+        kosullar = self._kosullar(filtre)
+        okunacak = None if kolonlar is None else list(dict.fromkeys([KIMLIK, *kolonlar]))
+        df = self._birlestir([self._bolum_oku(ay, okunacak, kosullar) for ay in self._kesisen_aylar(filtre)], okunacak)
+        if df.empty:
+            df = pd.DataFrame()
+        else:
+            df = veri_hazirla(df.sort_values(KIMLIK, ignore_index=True))
+        
+        self._sorgu_onbellegi.koy(anahtar, df)
+        return df.copy()
+    
+    def parcalar(self, filtre, parca_boyutu=PARCA_BOYUTU):
+        """Filtreye uyan kayıtları ay ay, parça parça döndür (aynı anda tek bölüm bellekte)"""
+        kosullar = self._kosullar(filtre)
+        for ay in self._kesisen_aylar(filtre):
+            df = self._bolum_oku(ay, None, kosullar)
+            for bas in range(0, len(df), parca_boyutu):
+                yield veri_hazirla(df.iloc[bas:bas + parca_boyutu])
+    
+    def sayfa(self, filtre, siralama=KIMLIK, artan=True, ofset=0, limit=50):
+        """Filtreye uyan kayıtlardan sıralanmış tek bir sayfa
+        
+        Önce yalnızca kimlik ve sıralama kolonu okunup sayfa belirlenir,
+        ardından sadece o sayfanın kayıtları bütün kolonlarıyla okunur.
+        """
+        kosullar = self._kosullar(filtre)
+        aylar = self._kesisen_aylar(filtre)
+        anahtar_kolonlari = list(dict.fromkeys([KIMLIK, siralama]))
+        anahtarlar = self._birlestir([self._bolum_oku(ay, anahtar_kolonlari, kosullar) for ay in aylar], anahtar_kolonlari)
+        kimlikler = anahtarlar.loc[sayfa_etiketleri(anahtarlar, siralama, artan, ofset, limit), KIMLIK].tolist()
+        
+        okunacak = [KIMLIK] + GORUNUM_KOLONLARI
+        if not kimlikler:
+            return pd.DataFrame(columns=okunacak)
+        df = self._birlestir(
+            [self._bolum_oku(ay, okunacak, kosullar + [(KIMLIK, "in", kimlikler)]) for ay in aylar], okunacak
+        )
+        return veri_hazirla(df.set_index(KIMLIK).loc[kimlikler].reset_index())
+    
+    def ekle(self, yeni_df):
+        """Kayıtları tarihlerinin ayına ait bölüme ekle, verilen kimlikleri döndür"""
+        son_kimlik = self._son_kimlik()
+        yeni_df = yeni_df.reindex(columns=KOLONLAR)
+        kimlikler = list(range(son_kimlik + 1, son_kimlik + 1 + len(yeni_df)))
+        yeni_df.insert(0, KIMLIK, kimlikler)
+        self.kimlik_sayaci.ilerlet(son_kimlik + len(kimlikler))
+        
+        ozet = self._ozet_oku()
+        for ay, grup in yeni_df.groupby(self._ay(yeni_df['Tarih'])):
+            mevcut = self._bolum_oku(ay) if os.path.exists(self._yol(ay)) else pd.DataFrame()
+            self._bolum_yaz(ay, self._birlestir([mevcut, grup]))
+        
+        self._ozet_yaz(ozet_birlestir(ozet, ozet_hesapla(veri_hazirla(yeni_df))))
+        return kimlikler
+    
+    def guncelle(self, duzenlenenler, eklenenler, silinenler):
+        """Tablo düzenlemelerini uygula; yalnızca etkilenen aylar yeniden yazılır"""
+        hedef_kimlikler = set(duzenlenenler) | set(silinenler)
+        
+        # Düzenlenen/silinen kayıtların bulunduğu aylar (sadece kimlik kolonu okunur)
+        aylar = {
+            ay for ay in self._aylar()
+            if hedef_kimlikler and self._bolum_oku(ay, [KIMLIK])[KIMLIK].isin(hedef_kimlikler).any()
+        }
+        mevcut = self._birlestir([self._bolum_oku(ay) for ay in sorted(aylar)])
+        ozet = self._ozet_oku()
+        
+        son_kimlik = self._son_kimlik()
+        df, eklenen_kimlikler = degisiklikleri_uygula(mevcut, duzenlenenler, eklenenler, silinenler, son_kimlik)
+        if eklenen_kimlikler:
+            self.kimlik_sayaci.ilerlet(eklenen_kimlikler[-1])
+        eski = mevcut[mevcut[KIMLIK].isin(hedef_kimlikler)]
+        yeni = df[df[KIMLIK].isin(set(duzenlenenler) | set(eklenen_kimlikler))]
+        
+        # Tarihi değişen ya da yeni eklenen kayıtlar başka bir aya düşebilir
+        yeni_aylar = self._ay(df['Tarih'])
+        for ay in set(yeni_aylar) - aylar:
+            if os.path.exists(self._yol(ay)):
+                df = self._birlestir([df, self._bolum_oku(ay)])
+            aylar.add(ay)
+        yeni_aylar = self._ay(df['Tarih'])
+        
+        for ay in aylar:
+            self._bolum_yaz(ay, df[yeni_aylar == ay])
+        
+        self._ozet_yaz(ozet_farki(ozet, veri_hazirla(eski), veri_hazirla(yeni)))
+        return eklenen_kimlikler
+    
+    def yaz(self, df):
+        """Tüm veritabanını verilen tabloyla değiştir (kimlik sayacı geri alınmaz)"""
+        son_kimlik = self._son_kimlik()
+        if KIMLIK not in df.columns:
+            df = df.copy()
+            df.insert(0, KIMLIK, range(son_kimlik + 1, son_kimlik + 1 + len(df)))
+        self.kimlik_sayaci.ilerlet(max(son_kimlik, int(df[KIMLIK].max()) if not df.empty else 0))
+        for ay in self._aylar():
+            os.remove(self._yol(ay))
+        if not df.empty:
+            for ay, grup in df.groupby(self._ay(df['Tarih'])):
+                self._bolum_yaz(ay, grup)
+        self._ozet_yaz(ozet_hesapla(veri_hazirla(df)))
+    
+    def geri_yukle(self, df):
+        """Tüm veritabanını verilen tabloyla (kimlikler korunarak) değiştir"""
+        self.yaz(df)
+    
+    def temizle(self):
+        """Boş veritabanı oluştur"""
+        self.yaz(pd.DataFrame(columns=[KIMLIK] + KOLONLAR))
+    
+    def csv_den_aktar(self, csv_dosyasi):
+        """Mevcut CSV veritabanını bir kereye mahsus aylık bölümlere aktar (CSV dosyası yedek olarak kalır)"""
+        isaret = os.path.join(self.klasor, "csv_aktarildi")
+        if os.path.exists(isaret):
+            return 0
+        
+        kaynak = CsvDepo(csv_dosyasi)
+        df = kaynak.yukle()
+        # CSV'de silinmiş son kayıtların kimlikleri de yeniden verilmez
+        self.kimlik_sayaci.ilerlet(kaynak._son_kimlik(df))
+        self.yaz(df)
+        with open(isaret, "w") as f:
+            f.write(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        return len(df)
+
+# ==================== KURUM HAVUZU ====================
+
+def depo_olustur(veri_deposu=None, kurum=None):
+    """Depo türüne göre kurumun depo nesnesi (varsayılan VERI_DEPOSU ayarı ve varsayılan kurum)"""
+    veri_deposu = veri_deposu or VERI_DEPOSU
+    kurum = kurum or VARSAYILAN_KURUM
+    if veri_deposu == "sqlite":
+        return SqliteDepo(kurum.sqlite_dosyasi)
+    if veri_deposu == "parquet":
+        return ParquetDepo(kurum.parquet_klasoru)
+    return CsvDepo(kurum.dosya_adi)
+
+# Kurum havuzunda bellek kullanımı en fazla bu aralıkla (sn) ölçülür
+BELLEK_KONTROL_ARALIGI = 10
+
+class KurumHavuzu:
+    """Kurumların paylaşılan depolarını en son kullanılma sırasıyla tutar
+    
+    Depoların bellekteki toplam boyutu sınırı aşınca en uzun süredir kullanılmayan
+    kurumların depoları boşaltılır (depo.bosalt). Depo nesnesi yerinde kalır,
+    yazıcılar ve oturumlar onu kullanmaya devam eder; boşaltılan depo sonraki
+    sorguda veriyi diskten yeniden okur. En son kullanılan depo boşaltılmaz.
+    """
+    
+    def __init__(self, sinir=KURUM_BELLEK_SINIRI, kontrol_araligi=BELLEK_KONTROL_ARALIGI):
+        self.sinir = sinir
+        self.kontrol_araligi = kontrol_araligi
+        self.bosaltilan = 0
+        self._depolar = OrderedDict()
+        self._kilit = threading.Lock()
+        self._son_kontrol = 0.0
+    
+    def kullan(self, anahtar, depo):
+        """Depoyu anahtarıyla kaydet ve en son kullanılan yap, gerekirse diğerlerini boşalt"""
+        with self._kilit:
+            self._depolar[anahtar] = depo
+            self._depolar.move_to_end(anahtar)
+            zamani_geldi = time.monotonic() - self._son_kontrol >= self.kontrol_araligi
+        if zamani_geldi:
+            self.sinirla()
+        return depo
+    
+    def bellek(self):
+        """Depoların yaklaşık bellek kullanımı, en son kullanılan sonda: {anahtar: bayt}"""
+        with self._kilit:
+            depolar = list(self._depolar.items())
+        return {anahtar: depo.bellek() for anahtar, depo in depolar}
+    
+    def sinirla(self):
+        """Toplam sınırın altına inene kadar en eski kullanılan depoları boşalt; boşaltılanları döndür"""
+        with self._kilit:
+            self._son_kontrol = time.monotonic()
+        boyutlar = self.bellek()
+        toplam = sum(boyutlar.values())
+        bosaltilanlar = []
+        # Sözlük en eski kullanılandan başlar; en son kullanılan (sondaki) korunur
+        for anahtar, boyut in list(boyutlar.items())[:-1]:
+            if toplam <= self.sinir:
+                break
+            if boyut == 0:
+                continue
+            with self._kilit:
+                depo = self._depolar.get(anahtar)
+            if depo is not None:
+                depo.bosalt()
+                toplam -= boyut
+                bosaltilanlar.append(anahtar)
+        self.bosaltilan += len(bosaltilanlar)
+        return bosaltilanlar
+
+def veri_yukle(depo=None):
+    """Tüm kayıtları yükle (depo verilmezse VERI_DEPOSU ayarındaki depo)"""
+    return (depo if depo is not None else depo_olustur()).yukle()
@@ -0,0 +1,104 @@
+"""Beykoz haber kayıtları: zaman dilimleri
+
+Grafikler ve dönem karşılaştırmaları günlük özetleri (ozet_hesapla) gün, hafta,
+ay, çeyrek ya da yıl dönemlerinde toplar; dilim tarih aralığına göre seçilir.
+"""
+
+import pandas as pd
+
+# ==================== ZAMAN DİLİMLERİ ====================
+
+# Zaman dilimi → (etiket, pandas dönem kodu); inceden kabaya sıralı
+ZAMAN_DILIMLERI = {
+    "gun": ("Gün", "D"),
+    "hafta": ("Hafta", "W-SUN"),
+    "ay": ("Ay", "M"),
+    "ceyrek": ("Çeyrek", "Q"),
+    "yil": ("Yıl", "Y"),
+}
+
+# Bir grafikte gösterilen en fazla dönem; aralık ne kadar uzun olursa olsun tarayıcıya
+# giden nokta sayısı bununla sınırlıdır
+EN_FAZLA_DONEM = 120
+
+AY_ADLARI = ["Oca", "Şub", "Mar", "Nis", "May", "Haz", "Tem", "Ağu", "Eyl", "Eki", "Kas", "Ara"]
+
+def donem_sayisi(baslangic, bitis, dilim):
+    """Tarih aralığının kapsadığı dönem sayısı"""
+    kod = ZAMAN_DILIMLERI[dilim][1]
+    return (pd.Period(bitis, kod) - pd.Period(baslangic, kod)).n + 1
+
+def zaman_dilimi_sec(baslangic, bitis, istenen=None, en_fazla=EN_FAZLA_DONEM):
+    """Aralığın dilimi: istenen dilimden (verilmezse en inceden) başlayarak dönem sayısı sınırı aşmayan ilk dilim
+    
+    El ile seçilen dilim aralığa göre fazla inceyse bir üst dilime geçilir.
+    """
+    dilimler = list(ZAMAN_DILIMLERI)
+    for dilim in dilimler[dilimler.index(istenen) if istenen else 0:]:
+        if donem_sayisi(baslangic, bitis, dilim) <= en_fazla:
+            return dilim
+    return dilimler[-1]
+
+def donem_baslangici(tarihler, dilim):
+    """Her tarihin içinde bulunduğu dönemin ilk günü (vektörel)"""
+    return tarihler.dt.to_period(ZAMAN_DILIMLERI[dilim][1]).dt.start_time
+
+def donem_etiketleri(donemler, dilim):
+    """Dönem başlangıçlarının okunur etiketleri (ör. "18.10.2026", "Eki 2026", "2026 Ç4")"""
+    if dilim == "ay":
+        return [f"{AY_ADLARI[donem.month - 1]} {donem.year}" for donem in donemler]
+    if dilim == "ceyrek":
+        return [f"{donem.year} Ç{donem.quarter}" for donem in donemler]
+    if dilim == "yil":
+        return [str(donem.year) for donem in donemler]
+    return [f"{donem:%d.%m.%Y}" for donem in donemler]
+
+def zaman_serisi(ozet_df, dilim, baslangic, bitis):
+    """Dönem başına toplam haber (Sayı) ve kayıt; aralıktaki kaydı olmayan dönemler sıfır"""
+    donemler = pd.period_range(baslangic, bitis, freq=ZAMAN_DILIMLERI[dilim][1]).start_time
+    toplamlar = ozet_df.groupby(donem_baslangici(ozet_df['Tarih'], dilim))[['Sayı', 'Kayit']].sum()
+    return toplamlar.reindex(donemler, fill_value=0).rename_axis('Dönem')
+
+def isi_haritasi(ozet_df, dilim):
+    """Müdürlük × dönem toplam haber (uzun biçim: Müdürlük, Dönem, Sayı; yalnızca kaydı olan hücreler)"""
+    return (
+        ozet_df.assign(Dönem=donem_baslangici(ozet_df['Tarih'], dilim))
+        .groupby(['Müdürlük', 'Dönem'], observed=True)['Sayı'].sum()
+        .reset_index()
+    )
+
+def karsilastirma_araligi(bitis, dilim):
+    """bitis'in dönemi ile önceki dönemin eşit uzunluktaki kısmı: (önceki başlangıç, önceki bitiş, son başlangıç)
+    
+    Yarım kalan son dönem (ör. bu haftanın ilk üç günü) önceki dönemin aynı sayıda
+    ilk günüyle karşılaştırılır.
+    """
+    son = pd.Period(bitis, ZAMAN_DILIMLERI[dilim][1])
+    onceki = son - 1
+    gecen = pd.Timestamp(bitis) - son.start_time
+    onceki_bitis = min(onceki.start_time + gecen, onceki.end_time.normalize())
+    return onceki.start_time.date(), onceki_bitis.date(), son.start_time.date()
+
+def donem_karsilastirmasi(ozet_df, dilim, bitis):
+    """Müdürlük başına son dönem ile önceki dönemin toplam haberi ve farkı
+    
+    ozet_df iki dönemi de kapsamalıdır (bkz. karsilastirma_araligi). Kolonlar:
+    Müdürlük, Bu dönem, Önceki dönem, Fark, Değişim % (önceki dönem boşsa NaN);
+    en büyük mutlak fark üstte.
+    """
+    onceki_baslangic, onceki_bitis, son_baslangic = karsilastirma_araligi(bitis, dilim)
+    tarih = ozet_df['Tarih']
+    donem = pd.Series(pd.NA, index=ozet_df.index, dtype=object)
+    donem[(tarih >= pd.Timestamp(son_baslangic)) & (tarih <= pd.Timestamp(bitis))] = "Bu dönem"
+    donem[(tarih >= pd.Timestamp(onceki_baslangic)) & (tarih <= pd.Timestamp(onceki_bitis))] = "Önceki dönem"
+    tablo = (
+        ozet_df.assign(Dönem=donem).dropna(subset=['Dönem'])
+        .pivot_table(index='Müdürlük', columns='Dönem', values='Sayı', aggfunc='sum', fill_value=0, observed=True)
+        .reindex(columns=["Bu dönem", "Önceki dönem"], fill_value=0)
+        .astype('int64')
+    )
+    tablo.index = tablo.index.astype(str)
+    tablo["Fark"] = tablo["Bu dönem"] - tablo["Önceki dönem"]
+    tablo["Değişim %"] = (tablo["Fark"] / tablo["Önceki dönem"].where(tablo["Önceki dönem"] > 0) * 100).round(1)
+    sira = tablo["Fark"].abs().sort_values(ascending=False, kind="stable").index
+    return tablo.loc[sira].rename_axis(index='Müdürlük', columns=None).reset_index()
@@ -0,0 +1,501 @@
+"""Beykoz haber kayıtları: kayıt şeması, ayarlar, filtreler ve özetler
+
+Diğer veri modüllerinin (haber_arama, haber_depolar, haber_yazici) ortak
+temelidir: veri klasörü ve ayarlar, kurumlar, kolonlar ve tipleri, Filtre,
+günlük özetler ve tablo düzenlemelerinin kayıtlara uygulanması.
+"""
+
+import os
+import pandas as pd
+from datetime import date, datetime
+from typing import NamedTuple
+from collections import OrderedDict
+import re
+import sys
+import threading
+
+from haber_olcum import asama
+
+# ==================== VERİTABANI YOLU ====================
+# Veriler gizli klasörde saklanacak
+DATA_DIR = ".data"
+DOSYA_ADI = os.path.join(DATA_DIR, 'beykoz_haber_veritabani.csv')
+SQLITE_DOSYASI = os.path.join(DATA_DIR, 'beykoz_haber_veritabani.sqlite3')
+PARQUET_KLASORU = os.path.join(DATA_DIR, 'parquet')
+YAZMA_KILIDI = os.path.join(DATA_DIR, 'yazma.kilit')
+OLCUM_GUNLUGU = os.path.join(DATA_DIR, 'olcum.jsonl')
+
+# Depolama türü: "csv" (varsayılan), "sqlite" veya "parquet" (aylık bölümler)
+VERI_DEPOSU = os.getenv("VERI_DEPOSU", "csv").lower()
+
+# CSV deposunda bu kadar günden eski kayıtlar sıkıştırılmış arşiv bölümlerine taşınır (0: kapalı)
+ARSIV_UFKU_GUN = int(os.getenv("ARSIV_UFKU_GUN", "365"))
+
+# Klasör yoksa oluştur
+if not os.path.exists(DATA_DIR):
+    os.makedirs(DATA_DIR)
+
+# ==================== SİSTEM AYARLARI ====================
+
+# MÜDÜRLÜK LİSTESİ
+MUDURLUKLER = [
+    # ÖNCELİKLİ MÜDÜRLÜKLER
+    "Fen İşleri Müdürlüğü",
+    "Temizlik İşleri Müdürlüğü", 
+    "Zabıta Müdürlüğü",
+    "İşletme ve İştirakler Müdürlüğü",
+    "Özel Kalem Müdürlüğü",
+    "Kültür ve Sosyal İşler Müdürlüğü",
+    
+    # DİĞER MÜDÜRLÜKLER
+    "Afet İşleri ve Risk Yönetimi Müdürlüğü",
+    "Basın Yayın ve Halkla İlişkiler Müdürlüğü",
+    "Bilgi İşlem Müdürlüğü",
+    "Destek Hizmetleri Müdürlüğü",
+    "Emlak ve İstimlak Müdürlüğü",
+    "Gençlik ve Spor Hizmetleri Müdürlüğü",
+    "Hukuk İşleri Müdürlüğü",
+    "İklim Değişikliği ve Sıfır Atık Müdürlüğü",
+    "İmar ve Şehircilik Müdürlüğü",
+    "İnsan Kaynakları ve Eğitim Müdürlüğü",
+    "Kentsel Dönüşüm Müdürlüğü",
+    "Mali Hizmetler Müdürlüğü",
+    "Muhtarlık İşleri Müdürlüğü",
+    "Park ve Bahçeler Müdürlüğü",
+    "Plan ve Proje Müdürlüğü",
+    "Rehberlik ve Teftiş Kurulu Müdürlüğü",
+    "Ruhsat ve Denetim Müdürlüğü",
+    "Sağlık İşleri Müdürlüğü",
+    "Sosyal Yardım İşleri Müdürlüğü",
+    "Tarımsal Hizmetler Müdürlüğü",
+    "Ulaşım Hizmetleri Müdürlüğü",
+    "Veteriner İşleri Müdürlüğü",
+    "Yapı Kontrol Müdürlüğü",
+    "Yazı İşleri Müdürlüğü",
+    
+    # SON SEÇENEK
+    "Diğer"
+]
+
+HABER_KAYNAKLARI = [
+    "Beykoz Anlık", 
+    "Beykoz Burada", 
+    "Beykoz Duysun", 
+    "Beykoz Güncel", 
+    "Diğer"
+]
+
+# ==================== KURUMLAR ====================
+
+# Varsayılan kurum dışındaki kurumların veri klasörleri
+KURUMLAR_KLASORU = os.path.join(DATA_DIR, "kurumlar")
+
+# Kurumların bellekte tuttuğu tabloların toplam sınırı (bayt); aşılınca en uzun süredir
+# kullanılmayan kurumların tabloları boşaltılır
+KURUM_BELLEK_SINIRI = int(os.getenv("KURUM_BELLEK_SINIRI_MB", "1024")) * 1024 * 1024
+
+# Kurum adı klasör adı olarak kullanılır
+KURUM_ADI = re.compile(r"[\w-]+")
+
+class Kurum:
+    """Bir kurumun (belediye ya da birim) veri klasörü, adı ve listeleri
+    
+    Varsayılan kurum (ad "") DATA_DIR'i ve yukarıdaki listeleri kullanır, yani
+    mevcut kurulumlar olduğu gibi çalışır. Diğer kurumların her biri kendi
+    klasöründe ayrı veri, yazma kilidi, arşiv ve geçmiş tutar.
+    """
+    
+    def __init__(self, ad="", baslik="Beykoz", dizin=None, mudurlukler=None, haber_kaynaklari=None):
+        if ad and not KURUM_ADI.fullmatch(ad):
+            raise ValueError(f"Geçersiz kurum adı: {ad!r}")
+        self.ad = ad
+        self.baslik = baslik
+        self.dizin = dizin or (os.path.join(KURUMLAR_KLASORU, ad) if ad else DATA_DIR)
+        self.mudurlukler = list(mudurlukler or MUDURLUKLER)
+        self.haber_kaynaklari = list(haber_kaynaklari or HABER_KAYNAKLARI)
+        os.makedirs(self.dizin, exist_ok=True)
+    
+    def yol(self, ad):
+        """Kurum klasöründeki dosyanın yolu"""
+        return os.path.join(self.dizin, ad)
+    
+    @property
+    def dosya_adi(self):
+        return self.yol(os.path.basename(DOSYA_ADI))
+    
+    @property
+    def sqlite_dosyasi(self):
+        return self.yol(os.path.basename(SQLITE_DOSYASI))
+    
+    @property
+    def parquet_klasoru(self):
+        return self.yol(os.path.basename(PARQUET_KLASORU))
+    
+    @property
+    def yazma_kilidi(self):
+        return self.yol(os.path.basename(YAZMA_KILIDI))
+
+VARSAYILAN_KURUM = Kurum()
+
+# ==================== YARDIMCI FONKSİYONLAR ====================
+
+def buyuk_harf(metin):
+    """Türkçe büyük harf (i → İ)"""
+    return metin.replace("i", "İ").upper()
+
+def tarih_formatla(tarih_obj):
+    """Tarihi güzel formatla"""
+    if isinstance(tarih_obj, str):
+        try:
+            tarih_obj = datetime.strptime(tarih_obj, '%Y-%m-%d').date()
+        except:
+            try:
+                tarih_obj = datetime.strptime(tarih_obj, '%d.%m.%Y').date()
+            except:
+                return str(tarih_obj)
+    
+    if hasattr(tarih_obj, 'strftime'):
+        gunler = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar"]
+        gun_adi = gunler[tarih_obj.weekday()]
+        return f"{tarih_obj.strftime('%d.%m.%Y')} {gun_adi}"
+    
+    return str(tarih_obj)
+
+KOLONLAR = ["Tarih", "Müdürlük", "Haber_Kaynagi", "Sayı", "Ayrıntı", "Kayit_Zamani"]
+
+# Her kaydın değişmeyen kimliği (tablo düzenlemeleri bu kimlikle eşleştirilir)
+KIMLIK = "Kayit_ID"
+
+# Raporlar kayıtları bu büyüklükte parçalar halinde okur
+PARCA_BOYUTU = 5000
+
+# Sayfadaki tabloda gösterilen kolonlar (raporlar tüm kolonları ayrıca okur)
+GORUNUM_KOLONLARI = ["Tarih", "Müdürlük", "Haber_Kaynagi", "Sayı", "Ayrıntı"]
+
+# Kolon tipleri: kategorik kolonlar listedeki sırayla, listede olmayan değerler sonda
+KATEGORILER = {"Müdürlük": MUDURLUKLER, "Haber_Kaynagi": HABER_KAYNAKLARI}
+ZAMAN_BICIMI = "%Y-%m-%d %H:%M:%S"
+
+def kategori_tipi(seri, kategoriler):
+    """Metin kolonunu kategorik yap (kategoriler: önce liste, sonra diğer değerler alfabetik)"""
+    if not isinstance(seri.dtype, pd.CategoricalDtype):
+        seri = seri.fillna("").astype(str).astype("category")
+    elif seri.isna().any():
+        if "" not in seri.cat.categories:
+            seri = seri.cat.add_categories([""])
+        seri = seri.fillna("")
+    digerleri = sorted(set(seri.cat.categories) - set(kategoriler))
+    return seri.cat.set_categories(list(kategoriler) + digerleri)
+
+def veri_hazirla(df):
+    """Okunan ham veriyi uygulamanın tip şemasına getir
+    
+    Müdürlük ve Haber_Kaynagi kategorik, Tarih datetime64, Sayı int32, Kayit_Zamani
+    sabit biçimle ayrıştırılmış zaman damgası olur; geçersiz tarihler NaT olur.
+    Zaten tiplenmiş tabloda dönüşümler ucuzdur.
+    """
+    df = df.copy()
+    for kolon, kategoriler in KATEGORILER.items():
+        if kolon in df.columns:
+            df[kolon] = kategori_tipi(df[kolon], kategoriler)
+    # Birim farkı (ns/us/s) olan tablolar birleştirilemez; zaman kolonları hep ns tutulur
+    if 'Tarih' in df.columns and df['Tarih'].dtype != 'datetime64[ns]':
+        df['Tarih'] = pd.to_datetime(df['Tarih'], errors='coerce').astype('datetime64[ns]')
+    if 'Sayı' in df.columns:
+        df['Sayı'] = pd.to_numeric(df['Sayı'], errors='coerce').fillna(0).astype('int32')
+    if 'Ayrıntı' in df.columns:
+        df['Ayrıntı'] = df['Ayrıntı'].fillna("").astype(str)
+    if 'Kayit_Zamani' in df.columns and not pd.api.types.is_datetime64_dtype(df['Kayit_Zamani']):
+        df['Kayit_Zamani'] = pd.to_datetime(df['Kayit_Zamani'], format=ZAMAN_BICIMI, errors='coerce')
+    if 'Kayit_Zamani' in df.columns and df['Kayit_Zamani'].dtype != 'datetime64[ns]':
+        df['Kayit_Zamani'] = df['Kayit_Zamani'].astype('datetime64[ns]')
+    return df
+
+def kayit_metinleri(df):
+    """Tiplenmiş kayıtları metin tabanlı depolama biçimine çevir (tarih ve zaman metin olur)"""
+    df = df.reindex(columns=KOLONLAR)
+    metinler = {
+        'Tarih': pd.to_datetime(df['Tarih'], errors='coerce').dt.strftime('%Y-%m-%d'),
+        'Kayit_Zamani': pd.to_datetime(df['Kayit_Zamani'], format=ZAMAN_BICIMI, errors='coerce').dt.strftime(ZAMAN_BICIMI),
+        'Sayı': pd.to_numeric(df['Sayı'], errors='coerce').fillna(0).astype('int64'),
+    }
+    for kolon in ["Müdürlük", "Haber_Kaynagi", "Ayrıntı"]:
+        metinler[kolon] = df[kolon].astype(object)
+    return pd.DataFrame(metinler, index=df.index)[KOLONLAR].astype(object).fillna("")
+
+def kayit_listesi(df, kimlikler):
+    """Kayıtların metin değerleri, başta kimlikleriyle: [[kimlik, Tarih, ..., Kayit_Zamani], ...]"""
+    metinler = kayit_metinleri(df)
+    metinler.insert(0, KIMLIK, [int(kimlik) for kimlik in kimlikler])
+    return metinler.values.tolist()
+
+def tablo_birlestir(tablolar):
+    """Tabloları uç uca ekle; kategorik kolonlar ortak kategorilerle kategorik kalır"""
+    tablolar = [tablo for tablo in tablolar if len(tablo)] or list(tablolar)[:1]
+    for kolon, kategoriler in KATEGORILER.items():
+        tipler = [tablo[kolon].dtype for tablo in tablolar if kolon in tablo.columns]
+        if tipler and all(isinstance(tip, pd.CategoricalDtype) for tip in tipler):
+            mevcut = set().union(*(tip.categories for tip in tipler))
+            ortak = list(kategoriler) + sorted(mevcut - set(kategoriler))
+            tablolar = [
+                tablo.assign(**{kolon: tablo[kolon].cat.set_categories(ortak)}) if kolon in tablo.columns else tablo
+                for tablo in tablolar
+            ]
+    return pd.concat(tablolar, ignore_index=True)
+
+class Filtre(NamedTuple):
+    """Filtre panelindeki seçimler
+    
+    Önbellek anahtarı olarak kullanılır; eşitlik ve hash alanların değerlerine bakan
+    bir tuple olarak tutulur.
+    """
+    baslangic: date
+    bitis: date
+    mudurlukler: tuple = ()
+    kaynaklar: tuple = ()
+    arama: str = ""
+    
+    def maske(self, df, kimlikler=None):
+        """Bellekteki tablo için filtre maskesi (kimlikler: aramaya uyan kayıtlar)"""
+        with asama("maske"):
+            # Tarih filtresi (datetime64 kolon üzerinde vektörel karşılaştırma)
+            tarih = df['Tarih']
+            if not pd.api.types.is_datetime64_dtype(tarih):
+                tarih = pd.to_datetime(tarih)
+            mask = (tarih >= pd.Timestamp(self.baslangic)) & (tarih <= pd.Timestamp(self.bitis))
+            
+            # Müdürlük filtresi
+            if self.mudurlukler:
+                mask &= df['Müdürlük'].isin(self.mudurlukler)
+            
+            # Kaynak filtresi
+            if self.kaynaklar:
+                mask &= df['Haber_Kaynagi'].isin(self.kaynaklar)
+            
+            # Metin araması (arama dizininden gelen kimlikler)
+            if kimlikler is not None:
+                mask &= df[KIMLIK].isin(kimlikler)
+            
+            return mask
+
+# Arama dizini kurulurken okunan tarih aralığı
+TUM_KAYITLAR = Filtre(date(1900, 1, 1), date(2100, 12, 31))
+
+def sayfa_etiketleri(df, siralama, artan, ofset, limit):
+    """Tabloyu sıralayıp istenen sayfadaki satırların etiketlerini döndür
+    
+    Eşit değerler kayıt kimliğine göre sıralanır, böylece sayfalar arası geçişte
+    satırlar kaybolmaz ya da tekrarlanmaz.
+    """
+    siralama_kolonlari = list(dict.fromkeys([siralama, KIMLIK]))
+    if isinstance(df[siralama].dtype, pd.CategoricalDtype):
+        # Kategorik kolon tanım sırasına göre değil alfabetik sıralanır (SQLite ile aynı)
+        kategoriler = df[siralama].cat.categories
+        df = df.assign(**{siralama: df[siralama].cat.reorder_categories(sorted(kategoriler))})
+    sirali = df.sort_values(siralama_kolonlari, ascending=artan, kind='stable')
+    return sirali.index[ofset:ofset + limit]
+
+# Günlük özet: Tarih × Müdürlük × Kaynak başına toplam Sayı ve kayıt adedi
+OZET_ANAHTARI = ["Tarih", "Müdürlük", "Haber_Kaynagi"]
+OZET_KOLONLARI = OZET_ANAHTARI + ["Sayı", "Kayit"]
+
+def ozet_hesapla(df):
+    """Kayıtlardan günlük özet tablosunu çıkar"""
+    if df.empty:
+        # Boş özet de tipli döner (Tarih datetime64); dönem hesapları .dt kullanır
+        return ozet_hazirla(pd.DataFrame(columns=OZET_KOLONLARI))
+    sayi = pd.to_numeric(df['Sayı'], errors='coerce').fillna(0)
+    ozet = (
+        df[OZET_ANAHTARI]
+        .assign(**{'Sayı': sayi, 'Kayit': 1})
+        .groupby(OZET_ANAHTARI, as_index=False, sort=False, observed=True)[['Sayı', 'Kayit']].sum()
+    )
+    return ozet.astype({'Sayı': 'int64', 'Kayit': 'int64'})
+
+def ozet_hazirla(ozet):
+    """Depodan okunan özeti tip şemasına getir (toplamlar int64 kalır)"""
+    return veri_hazirla(ozet).astype({'Sayı': 'int64', 'Kayit': 'int64'})
+
+def ozet_birlestir(ozet, ek, isaret=1):
+    """Özete eklenen (isaret=1) ya da çıkarılan (isaret=-1) kayıtların özetini işle
+    
+    Maliyet kayıt sayısıyla değil özet satırı sayısıyla orantılıdır.
+    """
+    if ek.empty:
+        return ozet
+    ek = ek.copy()
+    ek[['Sayı', 'Kayit']] *= isaret
+    birlesik = (
+        tablo_birlestir([ozet, ek])
+        .groupby(OZET_ANAHTARI, as_index=False, sort=False, observed=True)[['Sayı', 'Kayit']].sum()
+        .astype({'Sayı': 'int64', 'Kayit': 'int64'})
+    )
+    return birlesik[birlesik['Kayit'] > 0].reset_index(drop=True)
+
+def ozet_farki(ozet, eski_df, yeni_df):
+    """Değişen kayıtların eski hallerini özetten çıkarıp yeni hallerini ekle"""
+    return ozet_birlestir(ozet_birlestir(ozet, ozet_hesapla(eski_df), -1), ozet_hesapla(yeni_df))
+
+def ozet_metrikleri(ozet_df):
+    """İstatistik kartlarındaki değerler (günlük özetten)"""
+    return {
+        "toplam_sayi": int(ozet_df['Sayı'].sum()),
+        "toplam_kayit": int(ozet_df['Kayit'].sum()),
+        "mudurluk_sayisi": ozet_df['Müdürlük'].nunique(),
+        "kaynak_sayisi": ozet_df['Haber_Kaynagi'].nunique(),
+        "gun_sayisi": ozet_df['Tarih'].nunique(),
+    }
+
+# ==================== TABLO DÜZENLEMELERİ ====================
+
+def degisiklikleri_uygula(df, duzenlenenler, eklenenler, silinenler, son_kimlik):
+    """Tablo düzenlemelerini bellekteki kayıtlara uygula
+    
+    duzenlenenler: {kimlik: {kolon: yeni değer}}, eklenenler: yeni kayıtlar tablosu,
+    silinenler: kimlik listesi. Yeni tabloyu ve eklenen kayıtların kimliklerini döndürür.
+    """
+    df = df.set_index(KIMLIK)
+    
+    # Düzenlemeler: her kolon için değişen satırlar tek atamada yazılır
+    if duzenlenenler:
+        degisiklikler = pd.DataFrame.from_dict(duzenlenenler, orient='index')
+        degisiklikler = degisiklikler[degisiklikler.index.isin(df.index)]
+        for kolon in degisiklikler.columns.intersection(KOLONLAR):
+            degerler = degisiklikler[kolon].dropna()
+            # Yeni değerler kolonun tipine uydurulur (kategoriye eklenir, tarihe çevrilir)
+            if isinstance(df[kolon].dtype, pd.CategoricalDtype):
+                yeni = pd.Index(degerler.astype(str).unique()).difference(df[kolon].cat.categories)
+                if len(yeni):
+                    df[kolon] = df[kolon].cat.add_categories(yeni)
+                degerler = degerler.astype(str)
+            elif pd.api.types.is_datetime64_dtype(df[kolon]):
+                degerler = pd.to_datetime(degerler)
+            elif pd.api.types.is_integer_dtype(df[kolon]):
+                degerler = degerler.astype(df[kolon].dtype)
+            df.loc[degerler.index, kolon] = degerler.values
+    
+    if silinenler:
+        df = df.drop(index=silinenler, errors='ignore')
+    
+    df = df.reset_index()
+    
+    eklenen_kimlikler = []
+    if len(eklenenler):
+        eklenenler = veri_hazirla(eklenenler.reindex(columns=KOLONLAR))
+        eklenen_kimlikler = list(range(son_kimlik + 1, son_kimlik + 1 + len(eklenenler)))
+        eklenenler.insert(0, KIMLIK, eklenen_kimlikler)
+        df = tablo_birlestir([df, eklenenler])
+    
+    return df, eklenen_kimlikler
+
+def tablo_degisiklikleri(gosterilen_df, durum):
+    """data_editor durumunu (edited/added/deleted_rows) kayıt kimliklerine çevir
+    
+    Düzenleyicideki satır numaraları gösterilen tablodaki sıradır; gösterilen
+    tablonun indeksi kayıt kimliğidir.
+    """
+    kimlikler = gosterilen_df.index
+    
+    def deger_hazirla(kolon, deger):
+        if kolon == "Tarih" and deger is not None:
+            return pd.to_datetime(deger).date()
+        if kolon == "Sayı" and deger is not None:
+            return int(deger)
+        return deger
+    
+    duzenlenenler = {
+        int(kimlikler[int(sira)]): {kolon: deger_hazirla(kolon, deger) for kolon, deger in degerler.items()}
+        for sira, degerler in durum.get("edited_rows", {}).items()
+    }
+    
+    eklenenler = pd.DataFrame(durum.get("added_rows", []), columns=KOLONLAR)
+    if not eklenenler.empty:
+        eklenenler['Tarih'] = pd.to_datetime(eklenenler['Tarih']).dt.date
+        eklenenler['Sayı'] = eklenenler['Sayı'].fillna(1).astype(int)
+        eklenenler['Ayrıntı'] = eklenenler['Ayrıntı'].fillna("")
+        eklenenler['Kayit_Zamani'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    
+    silinenler = [int(kimlikler[int(sira)]) for sira in durum.get("deleted_rows", [])]
+    
+    return duzenlenenler, eklenenler, silinenler
+
+def yeni_kayitlar(tarih, mudurlukler, kaynak, sayi, ayrinti):
+    """Form girdisinden her müdürlük için bir satırlık kayıt tablosu"""
+    kayit_zamani = datetime.now().strftime(ZAMAN_BICIMI)
+    return pd.DataFrame([
+        {
+            "Tarih": tarih,
+            "Müdürlük": mudurluk,
+            "Haber_Kaynagi": kaynak,
+            "Sayı": sayi,
+            "Ayrıntı": ayrinti,
+            "Kayit_Zamani": kayit_zamani
+        }
+        for mudurluk in mudurlukler
+    ], columns=KOLONLAR)
+
+def veri_kaydet(hedef, tarih, mudurlukler, kaynak, sayi, ayrinti, oturum=None):
+    """Yeni kayıt ekle, eklenen kayıtların kimliklerini döndür
+    
+    hedef bir depo ya da VeriYazici olabilir; ikisi de ekle(df) sunar. oturum
+    verilirse (yalnızca VeriYazici) aynı oturumun tekrar gönderdiği kayıtlar yazılmaz.
+    """
+    yeni_df = yeni_kayitlar(tarih, mudurlukler, kaynak, sayi, ayrinti)
+    if oturum is None:
+        return hedef.ekle(yeni_df)
+    return hedef.ekle(yeni_df, oturum=oturum)
+
+# ==================== ÖNBELLEK ====================
+
+class SorguOnbellegi:
+    """Depo sorgu sonuçları için küçük LRU önbellek
+    
+    Depo oturumlar arasında paylaşıldığından farklı filtrelerle çalışan oturumlar
+    birbirinin sonucunu silmesin diye birkaç sonuç birden tutulur.
+    """
+    
+    def __init__(self, boyut=8):
+        self.boyut = boyut
+        self._kayitlar = OrderedDict()
+        self._kilit = threading.Lock()
+    
+    def al(self, anahtar):
+        with self._kilit:
+            if anahtar not in self._kayitlar:
+                return None
+            self._kayitlar.move_to_end(anahtar)
+            return self._kayitlar[anahtar]
+    
+    def koy(self, anahtar, df):
+        with self._kilit:
+            self._kayitlar[anahtar] = df
+            self._kayitlar.move_to_end(anahtar)
+            while len(self._kayitlar) > self.boyut:
+                self._kayitlar.popitem(last=False)
+    
+    def degerler(self):
+        with self._kilit:
+            return list(self._kayitlar.values())
+    
+    def temizle(self):
+        with self._kilit:
+            self._kayitlar.clear()
+
+# Metin kolonlarının bellek tahmininde örneklenen en fazla değer
+BELLEK_ORNEKLEMI = 1000
+
+def tablo_bellegi(*tablolar):
+    """Tabloların yaklaşık bellek kullanımı (bayt); aynı tablo bir kez sayılır
+    
+    Metin kolonlarında her değeri ölçmek büyük tablolarda yavaştır; boyut eşit
+    aralıklı bir örneklemden tahmin edilir.
+    """
+    toplam = 0
+    for df in {id(df): df for df in tablolar if df is not None}.values():
+        toplam += int(df.memory_usage(index=True, deep=False).sum())
+        for kolon in df.columns[df.dtypes == object]:
+            seri = df[kolon]
+            if len(seri):
+                orneklem = seri.iloc[::max(1, len(seri) // BELLEK_ORNEKLEMI)]
+                toplam += int(sum(map(sys.getsizeof, orneklem)) / len(orneklem) * len(seri))
+    return toplam
@@ -0,0 +1,145 @@
+"""Beykoz haber kayıtları: çalışma süresi ölçümleri
+
+Her sayfa çalıştırması bir Olcum'dur; aşamalar asama(ad) ile ölçülür. Etkin
+ölçüm iş parçacığına bağlıdır, böylece depo ve rapor kodu Streamlit'e bağlı
+olmadan aynı ölçüme aşama ekleyebilir. Etkin ölçüm yoksa asama() bir şey yapmaz.
+"""
+import json
+import logging
+import logging.handlers
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Aşama başına bellekte tutulan son ölçüm sayısı
+OLCUM_PENCERESI = 500
+
+# Yapılandırılmış günlük (satır başına bir JSON) ve döndürme sınırları
+GUNLUK_BOYUTU = 5 * 1024 * 1024
+GUNLUK_YEDEK_SAYISI = 3
+
+_etkin = threading.local()
+
+class Olcum:
+    """Tek bir çalıştırmanın aşama süreleri (ms) ve satır sayıları"""
+
+    def __init__(self, oturum, kullanici):
+        self.oturum = oturum
+        self.kullanici = kullanici
+        self.zaman = datetime.now()
+        self.baslangic = time.perf_counter()
+        self.son_an = self.baslangic
+        self.asamalar = {}
+        self.satirlar = {}
+        self.bitti = False
+
+    def ekle(self, ad, sure_ms):
+        # Aynı aşama bir çalıştırmada birden çok kez çalışırsa süreler toplanır
+        self.asamalar[ad] = self.asamalar.get(ad, 0.0) + sure_ms
+        self.son_an = time.perf_counter()
+
+    def kayit(self, kesildi=False):
+        """Günlüğe yazılacak sözlük; kesilen çalıştırmada süre son aşamanın sonuna kadardır"""
+        bitis = self.son_an if kesildi else time.perf_counter()
+        return {
+            "zaman": self.zaman.strftime("%Y-%m-%d %H:%M:%S"),
+            "oturum": self.oturum,
+            "kullanici": self.kullanici,
+            "toplam_ms": round((bitis - self.baslangic) * 1000, 2),
+            "asamalar": {ad: round(sure, 2) for ad, sure in self.asamalar.items()},
+            "satirlar": self.satirlar,
+            "kesildi": kesildi,
+        }
+
+@contextmanager
+def asama(ad):
+    """Etkin ölçüme ad adlı aşamanın süresini ekle"""
+    olcum = getattr(_etkin, "olcum", None)
+    if olcum is None:
+        yield
+        return
+    baslangic = time.perf_counter()
+    try:
+        yield
+    finally:
+        olcum.ekle(ad, (time.perf_counter() - baslangic) * 1000)
+
+def satir_say(ad, adet):
+    """Etkin ölçüme bir satır sayısı (ör. okunan, filtrelenen, gösterilen) yaz"""
+    olcum = getattr(_etkin, "olcum", None)
+    if olcum is not None:
+        olcum.satirlar[ad] = int(adet)
+
+class OlcumDeposu:
+    """Son ölçümlerin süreç genelindeki kayan penceresi ve JSON satır günlüğü
+
+    Her aşama için son OLCUM_PENCERESI süre tutulur; yüzdelikler bu pencereden
+    hesaplanır. Günlük dosyası boyut sınırında döndürülür.
+    """
+
+    def __init__(self, gunluk_dosyasi=None, pencere=OLCUM_PENCERESI):
+        self._kilit = threading.Lock()
+        self._pencere = pencere
+        self._asamalar = {}
+        self._son_kayitlar = deque(maxlen=pencere)
+        self._gunluk = None
+        if gunluk_dosyasi:
+            # Aynı dosyaya tek işleyici; depo yeniden kurulursa işleyici çoğaltılmaz
+            self._gunluk = logging.getLogger(f"beykoz.olcum.{gunluk_dosyasi}")
+            self._gunluk.propagate = False
+            self._gunluk.setLevel(logging.INFO)
+            if not self._gunluk.handlers:
+                isleyici = logging.handlers.RotatingFileHandler(
+                    gunluk_dosyasi, maxBytes=GUNLUK_BOYUTU, backupCount=GUNLUK_YEDEK_SAYISI, encoding="utf-8"
+                )
+                isleyici.setFormatter(logging.Formatter("%(message)s"))
+                self._gunluk.addHandler(isleyici)
+
+    def baslat(self, oturum, kullanici):
+        """Bu iş parçacığı için yeni ölçüm başlat"""
+        olcum = Olcum(oturum, kullanici)
+        _etkin.olcum = olcum
+        return olcum
+
+    def bitir(self, olcum, kesildi=False):
+        """Ölçümü kapat, pencereye ve günlüğe ekle (ikinci çağrı etkisizdir)"""
+        if olcum.bitti:
+            return
+        olcum.bitti = True
+        if getattr(_etkin, "olcum", None) is olcum:
+            _etkin.olcum = None
+
+        kayit = olcum.kayit(kesildi)
+        with self._kilit:
+            self._son_kayitlar.append(kayit)
+            for ad, sure in [("toplam", kayit["toplam_ms"]), *kayit["asamalar"].items()]:
+                self._asamalar.setdefault(ad, deque(maxlen=self._pencere)).append(sure)
+        if self._gunluk is not None:
+            self._gunluk.info(json.dumps(kayit, ensure_ascii=False))
+
+    def yuzdelikler(self):
+        """Aşama başına ölçüm sayısı, p50, p95 ve en son süre (ms), p95'e göre azalan"""
+        with self._kilit:
+            asamalar = {ad: np.array(sureler) for ad, sureler in self._asamalar.items()}
+        satirlar = [
+            {
+                "Aşama": ad,
+                "Adet": len(sureler),
+                "p50 ms": round(float(np.percentile(sureler, 50)), 1),
+                "p95 ms": round(float(np.percentile(sureler, 95)), 1),
+                "Son ms": round(float(sureler[-1]), 1),
+            }
+            for ad, sureler in asamalar.items()
+        ]
+        tablo = pd.DataFrame(satirlar, columns=["Aşama", "Adet", "p50 ms", "p95 ms", "Son ms"])
+        return tablo.sort_values("p95 ms", ascending=False, ignore_index=True)
+
+    def son_kayitlar(self, adet=20):
+        """En yeni ölçüm kayıtları (yeniden eskiye)"""
+        with self._kilit:
+            return list(self._son_kayitlar)[-adet:][::-1]
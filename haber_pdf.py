@@ -0,0 +1,174 @@
+"""Beykoz haber kayıtları: PDF belgesi
+
+fpdf2 yalnızca bu modülde kullanılır; haber_rapor PDF raporu istendiğinde bu
+modülü yükler, böylece uygulama açılışı ve diğer raporlar fpdf'i beklemez.
+"""
+import os
+from functools import lru_cache
+
+from fpdf import FPDF, XPos, YPos
+
+from haber_veri import DATA_DIR
+
+# ==================== PDF ====================
+
+# PDF raporu için Türkçe karakterleri destekleyen yazı tipi (DejaVu Sans). Depodaki
+# fonts klasörüyle gelir; diğer klasörler yalnızca o klasör silinmişse aranır.
+PDF_FONT_KLASORLERI = [
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts"),
+    os.getenv("PDF_FONT_KLASORU", ""),
+    os.path.join(DATA_DIR, "fonts"),
+    "/usr/share/fonts/truetype/dejavu",
+    "/usr/share/fonts/dejavu",
+    "/usr/local/share/fonts",
+    "/Library/Fonts",
+    "C:/Windows/Fonts",
+]
+PDF_FONT_DOSYALARI = {"": "DejaVuSans.ttf", "B": "DejaVuSans-Bold.ttf"}
+
+@lru_cache(maxsize=None)
+def pdf_yazi_tipleri():
+    """Yazı tipi dosyalarını süreç başına bir kez ara, {stil: dosya yolu} döndür
+    
+    Yazı tipi bulunamazsa hata verir: çekirdek fontla üretilen PDF'te ğ, ş, ı, İ
+    gibi harfler yazılamaz ve adlar yanlış görünür.
+    """
+    for klasor in PDF_FONT_KLASORLERI:
+        yollar = {stil: os.path.join(klasor, ad) for stil, ad in PDF_FONT_DOSYALARI.items()}
+        if klasor and all(os.path.exists(yol) for yol in yollar.values()):
+            return yollar
+    raise FileNotFoundError(
+        f"PDF için Türkçe yazı tipi bulunamadı ({', '.join(PDF_FONT_DOSYALARI.values())}); "
+        "dosyaları fonts klasörüne ya da PDF_FONT_KLASORU ayarındaki klasöre koyun"
+    )
+
+class RaporPDF(FPDF):
+    """Sayfa numaralı, tabloları kendisi sayfalayan rapor belgesi"""
+    
+    SATIR_YUKSEKLIGI = 5
+    
+    def __init__(self, baslik):
+        super().__init__(orientation="P", unit="mm", format="A4")
+        self.rapor_basligi = baslik
+        self.set_auto_page_break(False, margin=15)
+        self.yazi_tipi = self._yazi_tipi_ekle()
+    
+    def _yazi_tipi_ekle(self):
+        """DejaVu Sans'ı belgeye ekle"""
+        for stil, yol in pdf_yazi_tipleri().items():
+            self.add_font("dejavu", stil, yol)
+        return "dejavu"
+    
+    def metin(self, deger):
+        """Değeri yazılabilir metne çevir (tarihler gün.ay.yıl)"""
+        if hasattr(deger, 'strftime'):
+            return deger.strftime('%d.%m.%Y')
+        return str(deger)
+    
+    def footer(self):
+        self.set_y(-12)
+        self.set_font(self.yazi_tipi, size=8)
+        self.set_text_color(120)
+        self.cell(0, 8, self.metin(f"{self.rapor_basligi} • Sayfa {self.page_no()}/{{nb}}"), align="C")
+        self.set_text_color(0)
+    
+    def bolum_basligi(self, baslik, bos_alan=30):
+        """Bölüm başlığı; sayfada yeterli yer yoksa yeni sayfadan başla"""
+        if self.page == 0 or self.get_y() + bos_alan > self.page_break_trigger:
+            self.add_page()
+        self.set_font(self.yazi_tipi, "B", 12)
+        self.cell(0, 9, self.metin(baslik), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    
+    def _satirlara_bol(self, metin, genislik, genislikler):
+        """Metni kelime kelime kolona sığan satırlara böl
+        
+        fpdf'in multi_cell'i her karakterde satır genişliğini baştan hesapladığından
+        uzun tablolarda çok yavaştır; kelime genişlikleri burada önbelleğe alınır.
+        """
+        bosluk = self.get_string_width(" ")
+        satirlar = []
+        for paragraf in metin.splitlines() or [""]:
+            satir, satir_genisligi = "", 0
+            for kelime in paragraf.split():
+                kelime_genisligi = genislikler.get(kelime)
+                if kelime_genisligi is None:
+                    kelime_genisligi = genislikler[kelime] = self.get_string_width(kelime)
+                
+                # Kolondan uzun kelimeyi karakterlerinden böl
+                while kelime_genisligi > genislik:
+                    if satir:
+                        satirlar.append(satir)
+                        satir, satir_genisligi = "", 0
+                    kesim = len(kelime) - 1
+                    while kesim > 1 and self.get_string_width(kelime[:kesim]) > genislik:
+                        kesim -= 1
+                    satirlar.append(kelime[:kesim])
+                    kelime = kelime[kesim:]
+                    kelime_genisligi = self.get_string_width(kelime)
+                
+                if satir and satir_genisligi + bosluk + kelime_genisligi > genislik:
+                    satirlar.append(satir)
+                    satir, satir_genisligi = kelime, kelime_genisligi
+                elif satir:
+                    satir, satir_genisligi = f"{satir} {kelime}", satir_genisligi + bosluk + kelime_genisligi
+                else:
+                    satir, satir_genisligi = kelime, kelime_genisligi
+            satirlar.append(satir)
+        return satirlar
+    
+    def tablo(self, basliklar, genislikler, satirlar):
+        """Satırları yaz; sayfa dolunca yeni sayfada başlığı tekrarla
+        
+        Son kolon uzun metin olabilir ve gerekirse birden fazla satıra bölünür;
+        bir sayfaya sığmayan satır sayfalara bölünür, devamında diğer kolonlar boş
+        kalır. Hücreler cell() yerine doğrudan text()/rect() ile çizilir.
+        """
+        def baslik_yaz():
+            self.set_font(self.yazi_tipi, "B", 8)
+            self.set_fill_color(44, 62, 80)
+            self.set_text_color(255)
+            for baslik, genislik in zip(basliklar, genislikler):
+                self.cell(genislik, 6, self.metin(baslik), border=1, fill=True)
+            self.ln(6)
+            self.set_text_color(0)
+            self.set_font(self.yazi_tipi, size=8)
+        
+        def sigan_satir():
+            # Kayan nokta hatası tam sığan satırı dışarıda bırakmasın
+            return int((self.page_break_trigger - self.get_y()) / satir_yuksekligi + 1e-9)
+        
+        baslik_yaz()
+        satir_yuksekligi = self.SATIR_YUKSEKLIGI
+        taban = (satir_yuksekligi + self.font_size * 0.7) / 2
+        son_genislik = genislikler[-1] - 2 * self.c_margin
+        kelime_genislikleri = {}
+        # Başlıktan sonra boş bir sayfaya sığan satır sayısı
+        sayfa_satiri = int((self.page_break_trigger - self.t_margin - 6) / satir_yuksekligi + 1e-9)
+        
+        for satir in satirlar:
+            degerler = [self.metin(deger) for deger in satir]
+            son_satirlar = self._satirlara_bol(degerler[-1], son_genislik, kelime_genislikleri)
+            
+            # Sayfaya sığmayan satır yeni sayfada başlar; tek sayfadan uzunsa orada bölünür
+            if len(son_satirlar) > sigan_satir() and (len(son_satirlar) <= sayfa_satiri or sigan_satir() < 1):
+                self.add_page()
+                baslik_yaz()
+            
+            while True:
+                sigan = sigan_satir()
+                parca, son_satirlar = son_satirlar[:sigan], son_satirlar[sigan:]
+                yukseklik = len(parca) * satir_yuksekligi
+                x, y = self.l_margin, self.get_y()
+                for deger, genislik in zip(degerler[:-1], genislikler[:-1]):
+                    self.rect(x, y, genislik, yukseklik)
+                    self.text(x + self.c_margin, y + taban, deger)
+                    x += genislik
+                self.rect(x, y, genislikler[-1], yukseklik)
+                for sira, metin in enumerate(parca):
+                    self.text(x + self.c_margin, y + sira * satir_yuksekligi + taban, metin)
+                self.set_xy(self.l_margin, y + yukseklik)
+                if not son_satirlar:
+                    break
+                self.add_page()
+                baslik_yaz()
+                degerler = [""] * len(degerler)
@@ -0,0 +1,398 @@
+"""Beykoz haber kayıtları: Excel, CSV ve PDF raporları
+
+Streamlit'e bağlı değildir; raporlar herhangi bir depo ve Filtre ile üretilir.
+Uygulamadaki dışa aktarmalar arka planda iş olarak üretilip DATA_DIR altına
+yazılır (RaporIsleri). xlsxwriter ve fpdf (haber_pdf) ilgili rapor istendiğinde
+yüklenir.
+"""
+import os
+import pandas as pd
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import re
+import tempfile
+import threading
+import time
+
+from haber_veri import (
+    DATA_DIR, KOLONLAR, PARCA_BOYUTU, VARSAYILAN_KURUM,
+    buyuk_harf, kayit_metinleri, ozet_metrikleri, tarih_formatla,
+)
+
+# ==================== RAPORLAR ====================
+
+def excel_sayfa_adi(ad, kullanilanlar):
+    """Excel kurallarına uygun, benzersiz sayfa adı (en fazla 31 karakter)"""
+    temiz = re.sub(r"[\[\]:*?/\\]", "", ad).strip() or "Sayfa"
+    aday = temiz[:31]
+    sira = 2
+    while aday.casefold() in kullanilanlar:
+        ek = f" ({sira})"
+        aday = temiz[:31 - len(ek)] + ek
+        sira += 1
+    kullanilanlar.add(aday.casefold())
+    return aday
+
+def excel_olustur(parcalar, mudurluk_sayfalari=False, klasor=None):
+    """Kayıtları parça parça, sabit bellekle geçici bir Excel dosyasına yaz
+    
+    xlsxwriter'ın constant_memory kipinde her satır yazıldığı anda diske aktarılır;
+    bellek kullanımı satır sayısından bağımsızdır. mudurluk_sayfalari=True ise ana
+    sayfaya ek olarak her müdürlük için ayrı bir sayfa eklenir. Dosya klasor
+    içinde (verilmezse sistemin geçici klasöründe) oluşturulur; yolunu döndürür,
+    dosyayı silmek çağırana aittir.
+    """
+    import xlsxwriter
+    
+    fd, yol = tempfile.mkstemp(prefix="beykoz_rapor_", suffix=".xlsx", dir=klasor)
+    os.close(fd)
+    
+    workbook = xlsxwriter.Workbook(yol, {'constant_memory': True})
+    
+    # Başlık formatı
+    header_format = workbook.add_format({
+        'bold': True,
+        'bg_color': '#2c3e50',
+        'font_color': 'white',
+        'border': 1
+    })
+    tarih_format = workbook.add_format({'num_format': 'yyyy-mm-dd'})
+    
+    sayfalar = {}
+    sayfa_adlari = set()
+    
+    def sayfa(anahtar, ad):
+        """Sayfayı ilk kullanımda oluştur; [sayfa, sıradaki satır] döndür"""
+        if anahtar not in sayfalar:
+            worksheet = workbook.add_worksheet(excel_sayfa_adi(ad, sayfa_adlari))
+            
+            # Sütun genişlikleri
+            worksheet.set_column('A:A', 12)  # Tarih
+            worksheet.set_column('B:B', 25)  # Müdürlük
+            worksheet.set_column('C:C', 20)  # Kaynak
+            worksheet.set_column('D:D', 10)  # Sayı
+            worksheet.set_column('E:E', 50)  # Ayrıntı
+            
+            # Başlıkları formatla
+            for col_num, value in enumerate(KOLONLAR):
+                worksheet.write(0, col_num, value, header_format)
+            
+            sayfalar[anahtar] = [worksheet, 1]
+        return sayfalar[anahtar]
+    
+    def satir_yaz(hedef, satir):
+        worksheet, satir_no = hedef
+        tarih = satir[0]
+        if hasattr(tarih, 'strftime'):
+            worksheet.write_datetime(satir_no, 0, tarih, tarih_format)
+        else:
+            worksheet.write(satir_no, 0, tarih)
+        worksheet.write_row(satir_no, 1, satir[1:])
+        hedef[1] += 1
+    
+    try:
+        ana_sayfa = sayfa(None, 'Rapor')
+        for parca in parcalar:
+            # Kayıt zamanı metin olarak yazılır (tarih biçimi verilmemiş zaman sayı görünür)
+            parca = parca[KOLONLAR].assign(Kayit_Zamani=kayit_metinleri(parca)['Kayit_Zamani'])
+            for satir in parca.itertuples(index=False, name=None):
+                satir_yaz(ana_sayfa, satir)
+                if mudurluk_sayfalari:
+                    satir_yaz(sayfa(satir[1], str(satir[1])), satir)
+    finally:
+        workbook.close()
+    
+    return yol
+
+def excel_raporu(depo, filtre, mudurluk_sayfalari=False):
+    """Filtreye uyan kayıtların Excel raporu (dosya içeriği)"""
+    yol = excel_olustur(depo.parcalar(filtre), mudurluk_sayfalari)
+    try:
+        with open(yol, 'rb') as f:
+            return f.read()
+    finally:
+        os.remove(yol)
+
+def csv_olustur(parcalar, klasor=None):
+    """Kayıtları parça parça geçici bir CSV dosyasına (Excel uyumlu UTF-8) yaz, yolunu döndür"""
+    fd, yol = tempfile.mkstemp(prefix="beykoz_rapor_", suffix=".csv", dir=klasor)
+    with open(fd, "w", encoding="utf-8-sig", newline="") as f:
+        baslik = True
+        for parca in parcalar:
+            parca[KOLONLAR].to_csv(f, index=False, header=baslik)
+            baslik = False
+        if baslik:
+            pd.DataFrame(columns=KOLONLAR).to_csv(f, index=False)
+    return yol
+
+def csv_raporu(depo, filtre):
+    """Filtreye uyan kayıtların CSV raporu (dosya içeriği)"""
+    yol = csv_olustur(depo.parcalar(filtre))
+    try:
+        with open(yol, 'rb') as f:
+            return f.read()
+    finally:
+        os.remove(yol)
+
+def pdf_olustur(depo, filtre, klasor=None, kurum=None):
+    """Özet sayfası ve müdürlük tablolarından oluşan PDF'i geçici bir dosyaya yaz
+    
+    Kayıtlar her müdürlük için depodan parça parça okunur. Başlık ve müdürlük
+    sırası kurumdan alınır (varsayılan kurum). Dosya yolunu döndürür, dosyayı
+    silmek çağırana aittir. fpdf yalnızca PDF istendiğinde yüklenir.
+    """
+    from fpdf import XPos, YPos
+    from haber_pdf import RaporPDF
+    
+    kurum = kurum or VARSAYILAN_KURUM
+    ozet_df = depo.ozet(filtre)
+    metrikler = ozet_metrikleri(ozet_df)
+    
+    pdf = RaporPDF(f"{kurum.baslik} Haber Takip Raporu")
+    
+    # ÖZET SAYFASI
+    pdf.add_page()
+    pdf.set_font(pdf.yazi_tipi, "B", 16)
+    pdf.cell(0, 12, pdf.metin(f"{buyuk_harf(kurum.baslik)} HABER TAKİP RAPORU"), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.set_font(pdf.yazi_tipi, size=10)
+    pdf.cell(0, 6, pdf.metin(f"Dönem: {tarih_formatla(filtre.baslangic)} - {tarih_formatla(filtre.bitis)}"),
+             new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    if filtre.arama:
+        pdf.cell(0, 6, pdf.metin(f"Arama: {filtre.arama}"), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.cell(0, 6, pdf.metin(f"Oluşturulma: {datetime.now().strftime('%d.%m.%Y %H:%M')}"),
+             new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.ln(4)
+    
+    for etiket, deger in [
+        ("Toplam Haber", f"{metrikler['toplam_sayi']} ({metrikler['toplam_kayit']} kayıt)"),
+        ("Müdürlük Sayısı", metrikler['mudurluk_sayisi']),
+        ("Kaynak Sayısı", metrikler['kaynak_sayisi']),
+        ("Gün Sayısı", metrikler['gun_sayisi']),
+    ]:
+        pdf.set_font(pdf.yazi_tipi, "B", 10)
+        pdf.cell(45, 7, pdf.metin(etiket), border=1)
+        pdf.set_font(pdf.yazi_tipi, size=10)
+        pdf.cell(0, 7, pdf.metin(deger), border=1, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.ln(6)
+    
+    # Müdürlükler listedeki sırayla, listede olmayanlar sonda
+    mudurluk_toplamlari = ozet_df.groupby('Müdürlük', observed=True)[['Kayit', 'Sayı']].sum()
+    sira = {mudurluk: i for i, mudurluk in enumerate(kurum.mudurlukler)}
+    mudurluk_toplamlari = mudurluk_toplamlari.loc[
+        sorted(mudurluk_toplamlari.index, key=lambda m: (sira.get(m, len(sira)), m))
+    ]
+    
+    pdf.bolum_basligi("Müdürlüklere Göre Dağılım")
+    pdf.tablo(
+        ["Müdürlük", "Kayıt", "Toplam Haber"], [120, 30, 40],
+        mudurluk_toplamlari.reset_index().itertuples(index=False, name=None)
+    )
+    
+    # MÜDÜRLÜK TABLOLARI
+    for mudurluk, toplam in mudurluk_toplamlari.iterrows():
+        pdf.ln(4)
+        pdf.bolum_basligi(f"{mudurluk} ({int(toplam['Kayit'])} kayıt, {int(toplam['Sayı'])} haber)")
+        satirlar = (
+            satir
+            for parca in depo.parcalar(filtre._replace(mudurlukler=(mudurluk,)))
+            for satir in parca[['Tarih', 'Haber_Kaynagi', 'Sayı', 'Ayrıntı']].itertuples(index=False, name=None)
+        )
+        pdf.tablo(["Tarih", "Kaynak", "Sayı", "Ayrıntı"], [22, 35, 13, 120], satirlar)
+    
+    fd, yol = tempfile.mkstemp(prefix="beykoz_rapor_", suffix=".pdf", dir=klasor)
+    os.close(fd)
+    pdf.output(yol)
+    return yol
+
+def pdf_raporu(depo, filtre):
+    """Filtreye uyan kayıtların PDF raporu (dosya içeriği)"""
+    yol = pdf_olustur(depo, filtre)
+    try:
+        with open(yol, 'rb') as f:
+            return f.read()
+    finally:
+        os.remove(yol)
+
+RAPOR_OLUSTURUCULARI = {
+    "xlsx": excel_raporu,
+    "xlsx_mudurluk": lambda depo, filtre: excel_raporu(depo, filtre, mudurluk_sayfalari=True),
+    "csv": csv_raporu,
+    "pdf": pdf_raporu,
+}
+
+# ==================== DIŞA AKTARMA İŞLERİ ====================
+
+# Hazırlanan dosyaların klasörü, saklama süresi (sn) ve aynı anda çalışan iş sayısı
+DISA_AKTARMA_KLASORU = os.path.join(DATA_DIR, "disa_aktarma")
+DISA_AKTARMA_OMRU = 60 * 60
+DISA_AKTARMA_ISCI_SAYISI = 2
+
+# Eski dosyalar en fazla bu aralıkla (sn) taranır
+DISA_AKTARMA_TARAMA_ARALIGI = 60
+
+# İlerleme: kayıtların okunması işin bu kadarını oluşturur, kalanı dosyanın kapatılmasıdır
+RAPOR_OKUMA_PAYI = 0.95
+
+# Rapor türü → (dosyayı klasörde üreten fonksiyon(depo, filtre, klasor, kurum), uzantı)
+RAPOR_DOSYALARI = {
+    "xlsx": (lambda depo, filtre, klasor, kurum: excel_olustur(depo.parcalar(filtre), klasor=klasor), ".xlsx"),
+    "xlsx_mudurluk": (lambda depo, filtre, klasor, kurum: excel_olustur(depo.parcalar(filtre), True, klasor), ".xlsx"),
+    "csv": (lambda depo, filtre, klasor, kurum: csv_olustur(depo.parcalar(filtre), klasor), ".csv"),
+    "pdf": (pdf_olustur, ".pdf"),
+}
+
+class IlerlemeDeposu:
+    """Raporun okuduğu kayıtları sayıp ilerleme bildiren depo sarmalayıcısı
+    
+    Rapor üreticileri kayıtları depo.parcalar ile okuduğundan ilerleme, üreticiler
+    değiştirilmeden okunan kayıt sayısından hesaplanır.
+    """
+    
+    def __init__(self, depo, toplam, bildir):
+        self._depo = depo
+        self._toplam = max(toplam, 1)
+        self._okunan = 0
+        self._bildir = bildir
+    
+    def __getattr__(self, ad):
+        return getattr(self._depo, ad)
+    
+    def parcalar(self, filtre, parca_boyutu=PARCA_BOYUTU):
+        for parca in self._depo.parcalar(filtre, parca_boyutu):
+            yield parca
+            # Parça rapora yazıldıktan sonra sayılır
+            self._okunan += len(parca)
+            self._bildir(min(self._okunan / self._toplam, 1.0))
+
+class RaporIsi:
+    """Tek bir dışa aktarma işi: durum (bekliyor, calisiyor, hazir, hata), ilerleme ve dosya"""
+    
+    def __init__(self, anahtar, tur, yol):
+        self.anahtar = anahtar
+        self.tur = tur
+        self.yol = yol
+        self.durum = "bekliyor"
+        self.ilerleme = 0.0
+        self.hata = None
+        self.sure = None
+    
+    @property
+    def bitti(self):
+        return self.durum in ("hazir", "hata")
+    
+    def oku(self):
+        """Hazır dosyanın içeriği"""
+        with open(self.yol, "rb") as f:
+            return f.read()
+
+class RaporIsleri:
+    """Arka planda rapor üreten iş kuyruğu
+    
+    İşler bir iş parçacığı havuzunda çalışır; sayfa beklemeden kullanılmaya devam
+    eder. Aynı anahtarla (rapor türü, filtre, veri sürümü) gelen istekler tek işte
+    birleşir. Hazır dosyalar klasorde anahtarın özetiyle adlandırılır; süreç yeniden
+    başlasa da ömrü dolmamış dosya tekrar üretilmez. Ömrü dolan dosyalar silinir.
+    """
+    
+    def __init__(self, klasor=DISA_AKTARMA_KLASORU, omur=DISA_AKTARMA_OMRU, isci_sayisi=DISA_AKTARMA_ISCI_SAYISI):
+        self.klasor = klasor
+        self.omur = omur
+        self._isler = {}
+        self._kilit = threading.Lock()
+        self._havuz = ThreadPoolExecutor(max_workers=isci_sayisi, thread_name_prefix="disa-aktarma")
+        self._son_tarama = 0.0
+        os.makedirs(self.klasor, exist_ok=True)
+    
+    def _yol(self, anahtar, tur):
+        ozet = hashlib.blake2b(repr(anahtar).encode("utf-8"), digest_size=12).hexdigest()
+        return os.path.join(self.klasor, f"{tur}_{ozet}{RAPOR_DOSYALARI[tur][1]}")
+    
+    def _taze_mi(self, yol):
+        try:
+            return time.time() - os.path.getmtime(yol) < self.omur
+        except OSError:
+            return False
+    
+    def eskileri_sil(self):
+        """Ömrü dolan dosyaları ve işlerini sil (yarım kalmış geçici dosyalar dahil)"""
+        simdi = time.time()
+        with self._kilit:
+            if simdi - self._son_tarama < DISA_AKTARMA_TARAMA_ARALIGI:
+                return
+            self._son_tarama = simdi
+            calisanlar = {is_.yol for is_ in self._isler.values() if not is_.bitti}
+            for ad in os.listdir(self.klasor):
+                yol = os.path.join(self.klasor, ad)
+                if yol in calisanlar or self._taze_mi(yol):
+                    continue
+                try:
+                    os.remove(yol)
+                except OSError:
+                    pass
+            self._isler = {
+                anahtar: is_ for anahtar, is_ in self._isler.items()
+                if not is_.bitti or is_.durum == "hata" or os.path.exists(is_.yol)
+            }
+    
+    def al(self, anahtar, tur):
+        """Anahtarın işi: çalışan, hazır ya da hatalı iş; yoksa None
+        
+        Bu süreçte iş yoksa ama ömrü dolmamış dosya diskte varsa hazır iş döner.
+        """
+        self.eskileri_sil()
+        with self._kilit:
+            is_ = self._isler.get(anahtar)
+            if is_ is not None and is_.durum == "hazir" and not self._taze_mi(is_.yol):
+                del self._isler[anahtar]
+                is_ = None
+            if is_ is None:
+                yol = self._yol(anahtar, tur)
+                if self._taze_mi(yol):
+                    is_ = RaporIsi(anahtar, tur, yol)
+                    is_.durum, is_.ilerleme = "hazir", 1.0
+                    self._isler[anahtar] = is_
+            return is_
+    
+    def gonder(self, anahtar, tur, depo, filtre, kurum=None):
+        """Raporu arka planda üretmek üzere kuyruğa al; aynı anahtarın işi varsa onu döndür
+        
+        Klasör ve havuz kurumlar arasında paylaşılır; anahtar kurumu da içermelidir.
+        """
+        # Yalnızca yan etkisi için: eski işler temizlenir, diskte hazır dosya varsa işe alınır
+        self.al(anahtar, tur)
+        with self._kilit:
+            # al ile kilit arasında başka bir oturum göndermiş olabilir
+            is_ = self._isler.get(anahtar)
+            if is_ is not None and is_.durum != "hata":
+                return is_
+            is_ = RaporIsi(anahtar, tur, self._yol(anahtar, tur))
+            self._isler[anahtar] = is_
+        self._havuz.submit(self._calistir, is_, depo, filtre, kurum)
+        return is_
+    
+    def _calistir(self, is_, depo, filtre, kurum):
+        baslangic = time.perf_counter()
+        is_.durum = "calisiyor"
+        try:
+            toplam = int(depo.ozet(filtre)['Kayit'].sum())
+            
+            def bildir(oran):
+                is_.ilerleme = RAPOR_OKUMA_PAYI * oran
+            
+            uret, _ = RAPOR_DOSYALARI[is_.tur]
+            gecici = uret(IlerlemeDeposu(depo, toplam, bildir), filtre, self.klasor, kurum)
+            # Okuyanlar yarım dosya görmez: dosya hazır olunca yerine taşınır
+            os.replace(gecici, is_.yol)
+        except ImportError as e:
+            # Rapor kütüphaneleri (fpdf, xlsxwriter) ilk raporda yüklenir
+            is_.hata = f"{e.name or e} yüklü değil: pip install -r requirements.txt"
+            is_.durum = "hata"
+        except Exception as e:
+            is_.hata = str(e) or type(e).__name__
+            is_.durum = "hata"
+        else:
+            is_.ilerleme = 1.0
+            is_.durum = "hazir"
+        finally:
+            is_.sure = time.perf_counter() - baslangic
@@ -0,0 +1,52 @@
+"""Beykoz haber kayıtları: veri katmanı
+
+Streamlit'e bağlı değildir; web uygulaması, komut satırı araçları ve
+performans ölçümleri aynı depo, filtre ve yazıcı sınıflarını kullanır.
+Sınıflar konularına göre ayrı modüllerdedir; bu modül dışarıya açık olanları
+tek yerden sunar (iç yardımcılar kendi modüllerinden alınır):
+
+    haber_kayit     kayıt şeması, ayarlar, kurumlar, Filtre ve özetler
+    haber_donem     zaman dilimleri (grafik ve dönem karşılaştırmaları)
+    haber_arama     metin araması (AramaDizini) ve tekrar kontrolü (KayitOzetleri)
+    haber_depolar   BellekDepo, CsvDepo/CsvArsivi, SqliteDepo, ParquetDepo, KurumHavuzu
+    haber_yazici    VeriYazici ve süreçler arası dosya_kilidi
+"""
+
+from haber_kayit import (
+    ARSIV_UFKU_GUN, DATA_DIR, GORUNUM_KOLONLARI, HABER_KAYNAKLARI, KIMLIK, KOLONLAR,
+    KURUMLAR_KLASORU, MUDURLUKLER, OLCUM_GUNLUGU, OZET_ANAHTARI, OZET_KOLONLARI,
+    PARCA_BOYUTU, TUM_KAYITLAR, VARSAYILAN_KURUM, VERI_DEPOSU, YAZMA_KILIDI,
+    ZAMAN_BICIMI, Filtre, Kurum, buyuk_harf, degisiklikleri_uygula, kayit_metinleri,
+    ozet_hesapla, ozet_metrikleri, tablo_degisiklikleri, tarih_formatla, veri_hazirla,
+    veri_kaydet, yeni_kayitlar,
+)
+from haber_donem import (
+    EN_FAZLA_DONEM, ZAMAN_DILIMLERI, donem_etiketleri, donem_karsilastirmasi,
+    isi_haritasi, karsilastirma_araligi, zaman_dilimi_sec, zaman_serisi,
+)
+from haber_arama import metin_katla, yakin_tekrarlar
+from haber_depolar import (
+    BellekDepo, CsvDepo, KurumHavuzu, ParquetDepo, SqliteDepo, arsiv_siniri,
+    depo_olustur, veri_yukle,
+)
+from haber_yazici import VeriYazici
+
+__all__ = [
+    # Ayarlar ve kayıt şeması
+    "ARSIV_UFKU_GUN", "DATA_DIR", "GORUNUM_KOLONLARI", "HABER_KAYNAKLARI", "KIMLIK",
+    "KOLONLAR", "KURUMLAR_KLASORU", "MUDURLUKLER", "OLCUM_GUNLUGU", "OZET_ANAHTARI",
+    "OZET_KOLONLARI", "PARCA_BOYUTU", "TUM_KAYITLAR", "VARSAYILAN_KURUM",
+    "VERI_DEPOSU", "YAZMA_KILIDI", "ZAMAN_BICIMI", "Filtre", "Kurum",
+    # Kayıtlar ve özetler
+    "buyuk_harf", "degisiklikleri_uygula", "kayit_metinleri", "ozet_hesapla",
+    "ozet_metrikleri", "tablo_degisiklikleri", "tarih_formatla", "veri_hazirla",
+    "veri_kaydet", "yeni_kayitlar",
+    # Zaman dilimleri
+    "EN_FAZLA_DONEM", "ZAMAN_DILIMLERI", "donem_etiketleri", "donem_karsilastirmasi",
+    "isi_haritasi", "karsilastirma_araligi", "zaman_dilimi_sec", "zaman_serisi",
+    # Arama ve tekrarlar
+    "metin_katla", "yakin_tekrarlar",
+    # Depolar, yükleme ve yazma
+    "BellekDepo", "CsvDepo", "KurumHavuzu", "ParquetDepo", "SqliteDepo",
+    "arsiv_siniri", "depo_olustur", "veri_yukle", "VeriYazici",
+]
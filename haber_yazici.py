@@ -0,0 +1,275 @@
+"""Beykoz haber kayıtları: yazıcı
+
+Tüm yazmalar süreç genelindeki tek VeriYazici iş parçacığından sıralanır;
+aynı veri klasörünü kullanan süreçler dosya_kilidi ile birbirini bekler.
+"""
+
+import pandas as pd
+import numpy as np
+from contextlib import contextmanager
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+
+from haber_kayit import KIMLIK, kayit_listesi
+from haber_arama import kayit_ozetleri
+
+# Dosya kilidi (Windows'ta yoktur; orada yazıcı iş parçacığı tek başına sıralar)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+gunluk = logging.getLogger("beykoz.yazici")
+
+# ==================== YAZICI ====================
+
+@contextmanager
+def dosya_kilidi(yol):
+    """Süreçler arası özel kilit (aynı veri klasörünü kullanan diğer uygulama süreçleri için)"""
+    with open(yol, "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+class VeriYazici:
+    """Süreç genelindeki tek yazıcı
+    
+    Oturumlar yazma işlerini kuyruğa bırakıp sonucunu bekler; tek bir iş parçacığı
+    kuyruğu boşaltır. Aynı anda gelen kayıt eklemeleri tek bir yazmada birleştirilir
+    (grup kaydı) ve her oturuma kendi kayıtlarının kimlikleri döndürülür. Her grup
+    dosya kilidi altında yazılır.
+    
+    Yazılan her kaydın içerik özeti deponun tekrar dizinine (KayitOzetleri) işlenir;
+    oturum verilen eklemelerde dizinde zaten bulunan kayıtlar yazılmaz.
+    
+    gecmis verilirse (anlik_goruntu.DegisiklikGecmisi) her değişiklik geçmişe
+    yazılır ve geri_yukle ile veriler geçmişteki herhangi bir ana döndürülebilir.
+    
+    Yazma başarılıysa iş başarılı sayılır. Ardından dizinler ya da geçmiş
+    işlenemezse hata günlüğe yazılır; sonraki işten önce işlenemeyen taraf depodan
+    baştan kurulur (geçmiş için yeni taban başlatılır).
+    """
+    
+    GRUP_SINIRI = 256
+    
+    # Oturumun yazma sonucunu bekleme süresi (sn); kayıt sayısıyla uzar. Süre dolarsa
+    # yalnızca bekleyen vazgeçer, yazıcı işi yine de tamamlar
+    ZAMAN_ASIMI = 120
+    SATIR_ZAMAN_ASIMI = 0.002
+    
+    def __init__(self, depo, kilit_dosyasi, gecmis=None):
+        self.depo = depo
+        self.kilit_dosyasi = kilit_dosyasi
+        self.gecmis = gecmis
+        self._onarilacak = set()
+        self._kuyruk = queue.Queue()
+        self._is_parcacigi = threading.Thread(target=self._calis, name="veri-yazici", daemon=True)
+        self._is_parcacigi.start()
+    
+    def zaman_asimi(self, kayit_sayisi=0):
+        """kayit_sayisi kayıtlık bir yazmanın sonucunu bekleme süresi (sn)"""
+        return self.ZAMAN_ASIMI + kayit_sayisi * self.SATIR_ZAMAN_ASIMI
+    
+    def _gonder(self, islem, *argumanlar, bekle=True, kayit_sayisi=0):
+        sonuc = Future()
+        self._kuyruk.put((islem, argumanlar, sonuc))
+        return sonuc.result(timeout=self.zaman_asimi(kayit_sayisi)) if bekle else sonuc
+    
+    def ekle(self, yeni_df, oturum=None, bekle=True):
+        """Kayıtları ekle, verilen kimlikleri döndür
+        
+        oturum verilirse (toplu aktarımda "") aynı oturumdan aynı içerikle daha önce
+        yazılmış ya da aynı tabloda tekrarlanan kayıtlar atlanır; yalnızca yazılan
+        kayıtların kimlikleri döner. bekle=False ise kimlikleri veren Future döner;
+        süresiz beklemek isteyen (toplu aktarım) sonucu ondan alır.
+        """
+        return self._gonder("ekle", yeni_df, oturum, bekle=bekle, kayit_sayisi=len(yeni_df))
+    
+    def guncelle(self, duzenlenenler, eklenenler, silinenler):
+        """Tablo düzenlemelerini uygula, eklenen kayıtların kimliklerini döndür"""
+        return self._gonder(
+            "guncelle", duzenlenenler, eklenenler, silinenler,
+            kayit_sayisi=len(duzenlenenler) + len(eklenenler) + len(silinenler)
+        )
+    
+    def temizle(self):
+        """Boş veritabanı oluştur"""
+        return self._gonder("temizle")
+    
+    def geri_yukle(self, zaman):
+        """Verileri geçmişteki zaman anındaki haline getir, kayıt sayısını döndür"""
+        return self._gonder("geri_yukle", zaman)
+    
+    def arsivle(self, sinir, bekle=True):
+        """Tarihi sinir'den önceki kayıtları arşive taşı (arsivle sunan depolarda)
+        
+        bekle=False ise iş kuyruğa bırakılır ve sonucu veren Future döner.
+        """
+        return self._gonder("arsivle", sinir, bekle=bekle)
+    
+    def _calis(self):
+        while True:
+            isler = [self._kuyruk.get()]
+            # Bu arada birikmiş işleri de aynı gruba al
+            while len(isler) < self.GRUP_SINIRI:
+                try:
+                    isler.append(self._kuyruk.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with dosya_kilidi(self.kilit_dosyasi):
+                    self._uygula(isler)
+            except Exception as e:
+                # Yalnızca henüz çalıştırılamamış işler başarısız olur
+                for _, _, sonuc in isler:
+                    if not sonuc.done():
+                        sonuc.set_exception(e)
+    
+    def _uygula(self, isler):
+        """İşleri geliş sırasıyla uygula; art arda gelen eklemeler tek yazmada birleşir"""
+        # Başka süreçlerin yazdığı özetler kilit altında okunur
+        self.depo.ozetler.yenile()
+        self._onar()
+        # Değişiklikler yazılmadan önce geçmişin bir tabanı olmalı
+        if self.gecmis is not None and self.gecmis.taban_gerekli():
+            self.gecmis.taban_baslat(self.depo.yukle())
+        eklemeler = []
+        for is_ in isler + [None]:
+            if is_ is not None and is_[0] == "ekle":
+                eklemeler.append(is_)
+                continue
+            if eklemeler:
+                self._onar()
+                self._grup_ekle(eklemeler)
+                eklemeler = []
+            if is_ is None:
+                break
+            
+            islem, argumanlar, sonuc = is_
+            self._onar()
+            try:
+                onceki_surum = self.depo.surum()
+                if islem == "geri_yukle":
+                    deger = self._geri_yukle(*argumanlar)
+                else:
+                    deger = getattr(self.depo, islem)(*argumanlar)
+            except Exception as e:
+                sonuc.set_exception(e)
+                continue
+            # Dizinler sonuç dönmeden güncellenir; sonraki iş güncel dizini görür
+            if islem == "guncelle":
+                with self._defter(islem, "dizinler"):
+                    self._dizine_isle(onceki_surum, *argumanlar, deger)
+                with self._defter(islem, "gecmis"):
+                    self._gecmise_yaz("guncelle", *argumanlar, deger)
+            elif islem == "temizle":
+                with self._defter(islem, "dizinler"):
+                    self.depo.ozetler.temizle()
+                with self._defter(islem, "gecmis"):
+                    self._gecmise_yaz("temizle")
+            elif islem == "arsivle":
+                # Kayıtlar yer değiştirdi, içerikleri aynı; arama dizini yeni sürüme geçer
+                with self._defter(islem, "dizinler"):
+                    self.depo.dizin.degisti(onceki_surum, self.depo.surum(), [], [])
+            sonuc.set_result(deger)
+    
+    @contextmanager
+    def _defter(self, islem, taraf):
+        """Yazılmış işin dizinlere ya da geçmişe işlenmesi; hata işi bozmaz, o taraf onarılır"""
+        try:
+            yield
+        except Exception:
+            gunluk.exception("%s yazıldı ancak %s işlenemedi; sonraki işten önce onarılacak", islem, taraf)
+            self._onarilacak.add(taraf)
+    
+    def _onar(self):
+        """İşlenemeyen dizinleri depodan baştan kur, geçmişe depodaki tablodan yeni taban başlat"""
+        if "dizinler" in self._onarilacak:
+            self.depo.dizin.bosalt()
+            self.depo.ozetler.yeniden_kur()
+            self._onarilacak.discard("dizinler")
+        if "gecmis" in self._onarilacak:
+            self.gecmis.taban_baslat(self.depo.yukle())
+            self._onarilacak.discard("gecmis")
+    
+    def _gecmise_yaz(self, islem, duzenlenenler=None, eklenenler=(), silinenler=(), eklenen_kimlikler=()):
+        """Değişikliği geçmişe yaz (eklenen kayıtlar verilen kimlikleriyle)"""
+        if self.gecmis is None:
+            return
+        duzenlenenler = duzenlenenler or {}
+        veri = {}
+        if len(eklenenler):
+            veri["kayitlar"] = kayit_listesi(eklenenler, eklenen_kimlikler)
+        if duzenlenenler:
+            veri["duzenlenenler"] = {int(kimlik): degerler for kimlik, degerler in duzenlenenler.items()}
+        if silinenler:
+            veri["silinenler"] = [int(kimlik) for kimlik in silinenler]
+        self.gecmis.kaydet(islem, veri, len(eklenenler) + len(duzenlenenler) + len(silinenler))
+    
+    def _geri_yukle(self, zaman):
+        """Geçmişten zaman anındaki tabloyu kurup depoya yaz; dizinler baştan kurulur"""
+        if self.gecmis is None:
+            raise ValueError("Değişiklik geçmişi tutulmuyor")
+        df = self.gecmis.tablo(zaman)
+        self.depo.geri_yukle(df)
+        with self._defter("geri_yukle", "dizinler"):
+            self.depo.ozetler.temizle()
+            self.depo.ozetler.ekle(kayit_ozetleri(df), df[KIMLIK].tolist())
+        
+        # Geri yükleme de geçmişe işlenir ve yeni tabandan devam edilir
+        with self._defter("geri_yukle", "gecmis"):
+            self.gecmis.kaydet("geri_yukle", {"hedef": zaman.isoformat()}, len(df))
+            self.gecmis.taban_baslat(df)
+        return len(df)
+    
+    def _dizine_isle(self, onceki_surum, duzenlenenler, eklenenler, silinenler, eklenen_kimlikler):
+        """Tablo düzenlemesinde metni değişen ve eklenen kayıtları arama dizinine işle"""
+        metinler = {kimlik: degerler["Ayrıntı"] for kimlik, degerler in duzenlenenler.items() if "Ayrıntı" in degerler}
+        if len(eklenenler):
+            metinler.update(zip(eklenen_kimlikler, eklenenler["Ayrıntı"]))
+        self.depo.dizin.degisti(onceki_surum, self.depo.surum(), list(metinler), list(metinler.values()))
+        
+        # Düzenlenen kayıtların içeriği değişti; eklenenler oturumsuz özetle dizine girer
+        self.depo.ozetler.sil(list(duzenlenenler) + list(silinenler))
+        if len(eklenenler):
+            self.depo.ozetler.ekle(kayit_ozetleri(eklenenler), eklenen_kimlikler)
+    
+    def _grup_ekle(self, eklemeler):
+        try:
+            # Her eklemenin tekrar olmayan satırları; gruptaki önceki eklemeler de dizinde sayılır
+            tablolar, ozetler = [], []
+            for _, (yeni_df, oturum), _ in eklemeler:
+                ozet = kayit_ozetleri(yeni_df, oturum or "")
+                if oturum is not None:
+                    secili = ~self.depo.ozetler.tekrarlar(ozet, np.concatenate(ozetler) if ozetler else ())
+                    yeni_df, ozet = yeni_df[secili], ozet[secili]
+                tablolar.append(yeni_df)
+                ozetler.append(ozet)
+            
+            yeni_df = pd.concat(tablolar, ignore_index=True)
+            onceki_surum = self.depo.surum()
+            kimlikler = self.depo.ekle(yeni_df) if len(yeni_df) else []
+        except Exception as e:
+            for _, _, sonuc in eklemeler:
+                sonuc.set_exception(e)
+            return
+        
+        # Arama dizini baştan kurulmadan yeni kayıtlarla genişletilir
+        with self._defter("ekle", "dizinler"):
+            self.depo.dizin.degisti(onceki_surum, self.depo.surum(), kimlikler, yeni_df['Ayrıntı'])
+            self.depo.ozetler.ekle(np.concatenate(ozetler), kimlikler)
+        if len(kimlikler):
+            with self._defter("ekle", "gecmis"):
+                self._gecmise_yaz("ekle", eklenenler=yeni_df, eklenen_kimlikler=kimlikler)
+        
+        bas = 0
+        for (_, _, sonuc), tablo in zip(eklemeler, tablolar):
+            son = bas + len(tablo)
+            sonuc.set_result(kimlikler[bas:son])
+            bas = son
@@ -0,0 +1,250 @@
+"""Beykoz haber kayıtları: performans ölçümleri
+
+Sentetik veriyle doldurulan her depo ve veri boyutu için yükleme, filtreleme,
+özetleme, dışa aktarma ve düzenleme kaydetme adımlarının sürelerini ölçer. Arşivi
+olan depolarda (CSV) eski kayıtlar arşive taşındıktan sonraki süreler de ölçülür.
+Uygulamanın soğuk açılışı (Streamlit'in yüklenmesi, giriş ekranının ve ana sayfanın
+yeni bir süreçteki ilk çizimi) ve aynı süreçteki ikinci çizim de aynı veriyle ölçülür.
+
+Kullanım:
+    python performans.py --boyutlar 10000,100000,1000000 --depolar csv,sqlite
+    python performans.py --boyutlar 100000 --json sonuclar.json --pdf
+    python performans.py --boyutlar 10000 --depolar csv --acilis-yok
+"""
+import argparse
+import importlib.util
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from haber_veri import DATA_DIR, MUDURLUKLER, TUM_KAYITLAR, ZAMAN_BICIMI, Filtre, arsiv_siniri, ozet_metrikleri
+from haber_rapor import csv_raporu, excel_raporu, pdf_raporu
+from sentetik_veri import DEPO_SINIFLARI, depo_doldur
+
+VARSAYILAN_BOYUTLAR = "10000,100000,1000000"
+VARSAYILAN_DEPOLAR = "csv,sqlite,parquet"
+
+# Ölçümlerde kullanılan tipik ekran seçimleri
+SON_GUN_SAYISI = 90
+SAYFA_BOYUTU = 50
+ARAMA_METNI = "çöp"
+
+# Düzenleme kaydı: tablodan bir sayfa düzeltmesi kadar değişiklik
+DUZENLEME_SAYISI = 50
+SILME_SAYISI = 10
+EKLEME_SAYISI = 10
+
+UYGULAMA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+# Giriş ekranı çizilirken yüklenmemesi gereken modüller
+AGIR_MODULLER = "altair,fpdf,xlsxwriter,haber_veri,haber_rapor,haber_api"
+
+# Yeni süreçte çalışır: Streamlit'i yükler, sayfayı (giris ya da ana_sayfa) iki kez
+# çizer ve süreleri ile ilk çizimden sonra yüklü olan ağır modülleri JSON yazar
+ACILIS_BETIGI = """
+import json, sys, time
+from datetime import datetime
+baslangic = time.perf_counter()
+import streamlit
+streamlit_suresi = time.perf_counter() - baslangic
+from streamlit.testing.v1 import AppTest
+
+def ciz():
+    at = AppTest.from_file(sys.argv[1], default_timeout=600)
+    if sys.argv[2] == "ana_sayfa":
+        for anahtar, deger in dict(giris_yapildi=True, kullanici_adi="performans", kullanici_rol="admin",
+                                   kullanici_isim="Performans", giris_zamani=datetime.now()).items():
+            at.session_state[anahtar] = deger
+    baslangic = time.perf_counter()
+    at.run()
+    if at.exception:
+        sys.exit(at.exception[0].message)
+    return time.perf_counter() - baslangic
+
+ilk = ciz()
+yuklenen = [modul for modul in sys.argv[3].split(",") if modul in sys.modules]
+print(json.dumps({"streamlit": streamlit_suresi, "ilk": ilk, "ikinci": ciz(), "yuklenen": yuklenen}))
+"""
+
+def olc(islem, tekrar):
+    """İşlemi tekrar kez çalıştır, saniye cinsinden süreleri döndür"""
+    sureler = []
+    for _ in range(tekrar):
+        baslangic = time.perf_counter()
+        islem()
+        sureler.append(time.perf_counter() - baslangic)
+    return sureler
+
+def duzenleme_paketi(satir_sayisi, sira, rng):
+    """guncelle() için bir tablo kaydı: düzenlemeler, eklemeler ve silmeler
+    
+    Silmeler en yüksek kimliklerden, düzenlemeler onların altından seçilir; böylece
+    tekrarlanan ölçümler silinmiş bir kaydı düzenlemeye çalışmaz.
+    """
+    silinecek_bas = satir_sayisi - (sira + 1) * SILME_SAYISI
+    silinenler = list(range(silinecek_bas + 1, silinecek_bas + 1 + SILME_SAYISI))
+    ust_sinir = max(satir_sayisi - 10 * SILME_SAYISI, 1)
+    kimlikler = rng.choice(np.arange(1, ust_sinir + 1), min(DUZENLEME_SAYISI, ust_sinir), replace=False)
+    
+    duzenlenenler = {}
+    for sayac, kimlik in enumerate(kimlikler.tolist()):
+        degerler = {"Sayı": int(rng.integers(1, 10)), "Ayrıntı": f"düzeltildi {sira}"}
+        if sayac % 5 == 0:
+            # Bazı kayıtların tarihi değişir (başka bir güne/aya taşınır)
+            degerler["Tarih"] = date.today() - timedelta(days=int(rng.integers(0, 400)))
+        duzenlenenler[kimlik] = degerler
+    
+    eklenenler = pd.DataFrame({
+        "Tarih": [date.today()] * EKLEME_SAYISI,
+        "Müdürlük": [MUDURLUKLER[i % len(MUDURLUKLER)] for i in range(EKLEME_SAYISI)],
+        "Haber_Kaynagi": ["Diğer"] * EKLEME_SAYISI,
+        "Sayı": [1] * EKLEME_SAYISI,
+        "Ayrıntı": ["performans ölçümü"] * EKLEME_SAYISI,
+        "Kayit_Zamani": [datetime.now().strftime(ZAMAN_BICIMI)] * EKLEME_SAYISI,
+    })
+    return duzenlenenler, eklenenler, silinenler
+
+def depo_olc(depo_turu, satir_sayisi, klasor, tekrar, pdf):
+    """Tek depo ve boyut için adım adım süreler: {adım: [saniye, ...]}"""
+    sonuclar = {}
+    depo_kur = DEPO_SINIFLARI[depo_turu]
+    
+    baslangic = time.perf_counter()
+    depo_doldur(depo_kur(klasor), satir_sayisi)
+    sonuclar["doldurma"] = [time.perf_counter() - baslangic]
+    
+    # Yükleme: her seferinde yeni depo nesnesi (süreç ilk açılışı gibi, önbellek yok)
+    sonuclar["yukleme"] = olc(lambda: depo_kur(klasor).yukle(), tekrar)
+    
+    depo = depo_kur(klasor)
+    depo.yukle()
+    bugun = date.today()
+    filtre = Filtre(bugun - timedelta(days=SON_GUN_SAYISI), bugun)
+    mudurluk_filtresi = filtre._replace(mudurlukler=tuple(MUDURLUKLER[:3]))
+    arama_filtresi = filtre._replace(arama=ARAMA_METNI)
+    
+    sonuclar["filtre_sorgu"] = olc(lambda: depo.sorgula(mudurluk_filtresi), tekrar)
+    sonuclar["filtre_sayfa"] = olc(
+        lambda: depo.sayfa(filtre, siralama="Tarih", artan=False, ofset=SAYFA_BOYUTU, limit=SAYFA_BOYUTU), tekrar
+    )
+    # İlk arama dizini kurar, sonrakiler hazır dizini kullanır
+    sonuclar["arama_ilk"] = olc(lambda: depo.sorgula(arama_filtresi), 1)
+    sonuclar["arama"] = olc(lambda: depo.sorgula(arama_filtresi), tekrar)
+    
+    sonuclar["ozet_tum"] = olc(lambda: ozet_metrikleri(depo.ozet(TUM_KAYITLAR)), tekrar)
+    sonuclar["ozet_filtre"] = olc(lambda: ozet_metrikleri(depo.ozet(mudurluk_filtresi)), tekrar)
+    
+    sonuclar["disa_excel"] = olc(lambda: excel_raporu(depo, filtre), tekrar)
+    sonuclar["disa_csv"] = olc(lambda: csv_raporu(depo, filtre), tekrar)
+    if pdf:
+        sonuclar["disa_pdf"] = olc(lambda: pdf_raporu(depo, filtre), tekrar)
+    
+    rng = np.random.default_rng(1)
+    paketler = iter([duzenleme_paketi(satir_sayisi, sira, rng) for sira in range(tekrar)])
+    sonuclar["duzenleme_kaydi"] = olc(lambda: depo.guncelle(*next(paketler)), tekrar)
+    
+    if hasattr(depo, "arsivle"):
+        # Eski kayıtlar arşive taşındıktan sonra son günlerin sorguları yalnızca sıcak kayıtları okur
+        sonuclar["arsivleme"] = olc(lambda: depo.arsivle(arsiv_siniri()), 1)
+        sonuclar["ilk_sorgu_arsivli"] = olc(lambda: depo_kur(klasor).sorgula(mudurluk_filtresi), tekrar)
+        sonuclar["filtre_sorgu_arsivli"] = olc(lambda: depo.sorgula(mudurluk_filtresi), tekrar)
+        sonuclar["ozet_tum_arsivli"] = olc(lambda: ozet_metrikleri(depo.ozet(TUM_KAYITLAR)), tekrar)
+    return sonuclar
+
+def acilis_olc(depo_turu, kok, tekrar):
+    """Uygulamanın açılış süreleri: ({adım: [saniye, ...]}, giriş ekranında yüklenen ağır modüller)
+    
+    Her tekrar giriş ekranı ve ana sayfa için ayrı, yeni bir süreçte çalışır;
+    uygulama kok altındaki DATA_DIR'deki depoyu okur. Sayfalar Streamlit'in test
+    çalıştırıcısıyla çizilir (tarayıcıya gönderim süresi dahil değildir).
+    """
+    ortam = dict(os.environ, VERI_DEPOSU=depo_turu)
+    ortam["PYTHONPATH"] = os.pathsep.join(filter(None, [os.path.dirname(UYGULAMA), ortam.get("PYTHONPATH")]))
+    ortam.pop("HABER_API_PORTU", None)
+    
+    sonuclar = {adim: [] for adim in ("acilis_streamlit", "acilis_giris", "acilis_ana_sayfa", "ana_sayfa_tekrar")}
+    yuklenenler = set()
+    for _ in range(tekrar):
+        for sayfa in ("giris", "ana_sayfa"):
+            cikti = subprocess.run(
+                [sys.executable, "-c", ACILIS_BETIGI, UYGULAMA, sayfa, AGIR_MODULLER],
+                cwd=kok, env=ortam, capture_output=True, text=True,
+            )
+            if cikti.returncode != 0:
+                raise RuntimeError(f"{sayfa} açılış ölçümü başarısız: {cikti.stderr.strip()[-500:]}")
+            olcum = json.loads(cikti.stdout.strip().splitlines()[-1])
+            if sayfa == "giris":
+                sonuclar["acilis_streamlit"].append(olcum["streamlit"])
+                sonuclar["acilis_giris"].append(olcum["ilk"])
+                yuklenenler.update(olcum["yuklenen"])
+            else:
+                sonuclar["acilis_ana_sayfa"].append(olcum["ilk"])
+                sonuclar["ana_sayfa_tekrar"].append(olcum["ikinci"])
+    return sonuclar, sorted(yuklenenler)
+
+def sonuc_satirlari(boyut, depo_turu, sonuclar):
+    """Ölçümleri tablo/JSON satırlarına çevir"""
+    for adim, sureler in sonuclar.items():
+        yield {
+            "boyut": boyut,
+            "depo": depo_turu,
+            "adim": adim,
+            "en_iyi_ms": round(min(sureler) * 1000, 1),
+            "medyan_ms": round(statistics.median(sureler) * 1000, 1),
+            "tekrar": len(sureler),
+        }
+
+def main():
+    ayristirici = argparse.ArgumentParser(description="Depo ve rapor işlemlerinin süre ölçümleri")
+    ayristirici.add_argument("--boyutlar", default=VARSAYILAN_BOYUTLAR, help="virgülle ayrılmış kayıt sayıları")
+    ayristirici.add_argument("--depolar", default=VARSAYILAN_DEPOLAR, help="csv, sqlite, parquet")
+    ayristirici.add_argument("--tekrar", type=int, default=3)
+    ayristirici.add_argument("--pdf", action="store_true", help="PDF dışa aktarmayı da ölç (yavaş)")
+    ayristirici.add_argument("--acilis-yok", action="store_true", help="uygulama açılış ölçümünü atla")
+    ayristirici.add_argument("--json", help="sonuçların yazılacağı JSON dosyası")
+    ayristirici.add_argument("--klasor", help="geçici depoların kurulacağı klasör")
+    argumanlar = ayristirici.parse_args()
+    
+    boyutlar = [int(boyut) for boyut in argumanlar.boyutlar.split(",") if boyut.strip()]
+    depolar = [depo.strip().lower() for depo in argumanlar.depolar.split(",") if depo.strip()]
+    if "parquet" in depolar and importlib.util.find_spec("pyarrow") is None:
+        print("pyarrow yüklü değil, parquet deposu atlanıyor")
+        depolar.remove("parquet")
+    
+    tum_satirlar = []
+    print(f"{'boyut':>10} {'depo':<8} {'adım':<16} {'en iyi ms':>11} {'medyan ms':>11}")
+    for boyut in boyutlar:
+        for depo_turu in depolar:
+            # Depo uygulamanın okuyacağı yerde (kok/DATA_DIR) kurulur
+            kok = tempfile.mkdtemp(prefix=f"performans_{depo_turu}_", dir=argumanlar.klasor)
+            klasor = os.path.join(kok, DATA_DIR)
+            os.makedirs(klasor)
+            try:
+                sonuclar = depo_olc(depo_turu, boyut, klasor, argumanlar.tekrar, argumanlar.pdf)
+                if not argumanlar.acilis_yok:
+                    acilis, yuklenenler = acilis_olc(depo_turu, kok, argumanlar.tekrar)
+                    sonuclar.update(acilis)
+                    if yuklenenler:
+                        print(f"uyarı: giriş ekranında yüklenen modüller: {', '.join(yuklenenler)}")
+            finally:
+                shutil.rmtree(kok, ignore_errors=True)
+            for satir in sonuc_satirlari(boyut, depo_turu, sonuclar):
+                tum_satirlar.append(satir)
+                print(f"{satir['boyut']:>10,} {satir['depo']:<8} {satir['adim']:<16} "
+                      f"{satir['en_iyi_ms']:>11,.1f} {satir['medyan_ms']:>11,.1f}")
+    
+    if argumanlar.json:
+        with open(argumanlar.json, "w", encoding="utf-8") as f:
+            json.dump(tum_satirlar, f, ensure_ascii=False, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Beykoz haber kayıtları: müdürlük başına rapor paketi (komut satırı)
+
+Tarih aralığındaki kayıtlar depodan bir kez okunur; her müdürlüğün raporu bir
+süreç havuzunda paralel üretilir. İşçiler tabloyu kopyalamadan paylaşır (fork
+olan sistemlerde süreç belleği devralınır, diğerlerinde işçi başına bir kez
+aktarılır).
+
+Kullanım:
+    python rapor_paketi.py --baslangic 2026-10-12 --bitis 2026-10-18 --bicim xlsx,pdf
+"""
+import argparse
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, timedelta
+
+from haber_veri import MUDURLUKLER, VERI_DEPOSU, BellekDepo, Filtre, depo_olustur
+from haber_rapor import RAPOR_OLUSTURUCULARI
+
+# Desteklenen biçimler (RAPOR_OLUSTURUCULARI anahtarı ve dosya uzantısı)
+BICIMLER = ["xlsx", "csv", "pdf"]
+
+# İşçi süreçlerde paylaşılan depo (_isci_hazirla ile kurulur)
+_paylasilan_depo = None
+
+def _isci_hazirla(df):
+    """İşçi süreç başlangıcı: paylaşılan tabloyu bir kez depoya sar"""
+    global _paylasilan_depo
+    _paylasilan_depo = BellekDepo(df)
+
+def dosya_adi(mudurluk, filtre, uzanti):
+    """Müdürlük ve tarih aralığından dosya adı (Türkçe harfler korunur)"""
+    ad = re.sub(r"[^\w-]+", "_", mudurluk).strip("_")
+    return f"{ad}_{filtre.baslangic:%Y%m%d}_{filtre.bitis:%Y%m%d}.{uzanti}"
+
+def mudurluk_raporu(mudurluk, filtre, bicim, klasor):
+    """Tek müdürlüğün raporunu üret ve yaz; (müdürlük, biçim, yol, kayıt sayısı, süre) döndürür"""
+    baslangic = time.perf_counter()
+    mudurluk_filtresi = filtre._replace(mudurlukler=(mudurluk,))
+    kayit_sayisi = int(_paylasilan_depo.ozet(mudurluk_filtresi)['Kayit'].sum())
+    
+    yol = os.path.join(klasor, dosya_adi(mudurluk, filtre, bicim))
+    veri = RAPOR_OLUSTURUCULARI[bicim](_paylasilan_depo, mudurluk_filtresi)
+    gecici = yol + ".tmp"
+    with open(gecici, "wb") as f:
+        f.write(veri)
+    os.replace(gecici, yol)
+    return mudurluk, bicim, yol, kayit_sayisi, time.perf_counter() - baslangic
+
+def paket_olustur(filtre, bicimler, klasor, isci_sayisi=None, bos_dahil=False, veri_deposu=None):
+    """Filtreye uyan her müdürlük ve biçim için rapor üret, sonuç listesini döndür
+    
+    Müdürlük filtresi boşsa MUDURLUKLER ve veride geçen diğer müdürlükler kullanılır;
+    kaydı olmayan müdürlükler bos_dahil=False iken atlanır.
+    """
+    depo = BellekDepo(depo_olustur(veri_deposu).sorgula(filtre))
+    kayitli = set(depo.ozet(filtre)['Müdürlük'].astype(str))
+    adaylar = list(filtre.mudurlukler) or MUDURLUKLER + sorted(kayitli - set(MUDURLUKLER))
+    mudurlukler = [mudurluk for mudurluk in adaylar if bos_dahil or mudurluk in kayitli]
+    isler = [(mudurluk, bicim) for mudurluk in mudurlukler for bicim in bicimler]
+    
+    os.makedirs(klasor, exist_ok=True)
+    isci_sayisi = min(isci_sayisi or os.cpu_count() or 1, len(isler))
+    if isci_sayisi <= 1:
+        _isci_hazirla(depo.yukle())
+        return [mudurluk_raporu(mudurluk, filtre, bicim, klasor) for mudurluk, bicim in isler]
+    
+    # fork varsa işçiler tabloyu süreç belleğinden devralır (kopyalanmaz)
+    baglam = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else None)
+    sonuclar = []
+    with ProcessPoolExecutor(
+        max_workers=isci_sayisi,
+        mp_context=baglam,
+        initializer=_isci_hazirla,
+        initargs=(depo.yukle(),),
+    ) as havuz:
+        gelecekler = [havuz.submit(mudurluk_raporu, mudurluk, filtre, bicim, klasor) for mudurluk, bicim in isler]
+        for gelecek in as_completed(gelecekler):
+            sonuclar.append(gelecek.result())
+    return sorted(sonuclar, key=lambda sonuc: (adaylar.index(sonuc[0]), sonuc[1]))
+
+def main():
+    bugun = date.today()
+    ayristirici = argparse.ArgumentParser(description="Müdürlük başına rapor paketi üret")
+    ayristirici.add_argument("--baslangic", type=date.fromisoformat, default=bugun - timedelta(days=6))
+    ayristirici.add_argument("--bitis", type=date.fromisoformat, default=bugun)
+    ayristirici.add_argument("--bicim", default="xlsx", help="virgülle ayrılmış: xlsx, csv, pdf")
+    ayristirici.add_argument("--cikti", help="raporların yazılacağı klasör (varsayılan: raporlar/<aralık>)")
+    ayristirici.add_argument("--mudurluk", action="append", default=[], help="yalnızca bu müdürlük (tekrarlanabilir)")
+    ayristirici.add_argument("--kaynak", action="append", default=[], help="yalnızca bu kaynak (tekrarlanabilir)")
+    ayristirici.add_argument("--arama", default="", help="Ayrıntı içinde aranacak kelimeler")
+    ayristirici.add_argument("--isci", type=int, default=None, help="süreç sayısı (varsayılan: işlemci sayısı)")
+    ayristirici.add_argument("--bos-dahil", action="store_true", help="kaydı olmayan müdürlükler için de rapor üret")
+    ayristirici.add_argument("--depo", choices=["csv", "sqlite", "parquet"], default=VERI_DEPOSU)
+    argumanlar = ayristirici.parse_args()
+    
+    bicimler = [bicim.strip().lower() for bicim in argumanlar.bicim.split(",") if bicim.strip()]
+    bilinmeyen = sorted(set(bicimler) - set(BICIMLER))
+    if bilinmeyen:
+        ayristirici.error(f"bilinmeyen biçim: {', '.join(bilinmeyen)}")
+    
+    filtre = Filtre(
+        baslangic=argumanlar.baslangic,
+        bitis=argumanlar.bitis,
+        mudurlukler=tuple(argumanlar.mudurluk),
+        kaynaklar=tuple(argumanlar.kaynak),
+        arama=argumanlar.arama.strip(),
+    )
+    klasor = argumanlar.cikti or os.path.join(
+        "raporlar", f"{filtre.baslangic:%Y%m%d}_{filtre.bitis:%Y%m%d}"
+    )
+    
+    baslangic = time.perf_counter()
+    sonuclar = paket_olustur(
+        filtre, bicimler, klasor, argumanlar.isci, argumanlar.bos_dahil, argumanlar.depo
+    )
+    for mudurluk, bicim, yol, kayit_sayisi, sure in sonuclar:
+        print(f"{kayit_sayisi:>8} kayıt  {sure:6.2f} sn  {yol}")
+    print(f"{len(sonuclar)} rapor {klasor} klasörüne yazıldı ({time.perf_counter() - baslangic:.1f} sn)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Beykoz haber kayıtları: performans denemeleri için sentetik veri
+
+MUDURLUKLER ve HABER_KAYNAKLARI üzerinde gerçekçi dağılımlı kayıtlar üretir:
+öncelikli müdürlükler ve yaygın kaynaklar daha sık, hafta sonları daha seyrek,
+Ayrıntı metinleri Beykoz semtleri ve tipik şikayet kalıplarından oluşur.
+
+Kullanım:
+    python sentetik_veri.py 1000000 --depo sqlite --klasor /tmp/deneme
+"""
+import argparse
+import os
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from haber_veri import (
+    HABER_KAYNAKLARI, KOLONLAR, MUDURLUKLER,
+    CsvDepo, ParquetDepo, SqliteDepo, veri_hazirla,
+)
+
+# Ayrıntı metinleri: semt + konu (+ ek not)
+SEMTLER = [
+    "Kavacık", "Paşabahçe", "Çubuklu", "Anadoluhisarı", "Kanlıca", "Göksu",
+    "Yalıköy", "Riva", "Polonezköy", "Acarlar", "Ortaçeşme", "Çiğdem",
+    "Soğuksu", "Gümüşsuyu", "Rüzgarlıbahçe", "Göztepe", "Akbaba", "Elmalı",
+]
+KONULAR = [
+    "çöp konteyneri taşmış", "yol çalışması trafiği aksatıyor", "sokak lambası yanmıyor",
+    "kaldırım kırık", "su borusu patlamış", "park bakımsız", "seyyar satıcı şikayeti",
+    "başıboş köpek ihbarı", "kaçak yapı iddiası", "otobüs durağı hasarlı",
+    "yağmur suyu ızgarası tıkalı", "gürültü şikayeti", "ağaç budaması talebi",
+    "asfalt çukuru", "sahil temizliği yapılmamış", "kültür etkinliği duyurusu",
+    "sosyal yardım başvurusu", "imar planı tartışması", "yangın riski bildirimi",
+    "hal fiyatları haberi",
+]
+EKLER = [
+    "", "", "", "vatandaş tepkili", "acil müdahale bekleniyor", "tekrarlayan sorun",
+    "fotoğraflı ihbar", "yerel basında yer aldı", "sosyal medyada yayıldı",
+]
+
+# Dağılımlar: listenin başındaki müdürlükler/kaynaklar daha sık görülür
+MUDURLUK_EGIMI = 0.9
+KAYNAK_EGIMI = 0.7
+HAFTA_SONU_AGIRLIGI = 0.4
+
+SENTETIK_PARCA_BOYUTU = 200_000
+
+DEPO_SINIFLARI = {
+    "csv": lambda klasor: CsvDepo(os.path.join(klasor, "beykoz_haber_veritabani.csv")),
+    "sqlite": lambda klasor: SqliteDepo(os.path.join(klasor, "beykoz_haber_veritabani.sqlite3")),
+    "parquet": lambda klasor: ParquetDepo(os.path.join(klasor, "parquet")),
+}
+
+def _olasiliklar(adet, egim):
+    """Sıraya göre azalan (Zipf benzeri) seçim olasılıkları"""
+    agirlik = 1.0 / np.arange(1, adet + 1) ** egim
+    return agirlik / agirlik.sum()
+
+def sentetik_parcalar(satir_sayisi, baslangic=date(2023, 1, 1), bitis=None,
+                      parca_boyutu=SENTETIK_PARCA_BOYUTU, tohum=0):
+    """satir_sayisi kayıtlık sentetik veriyi tarih sırasıyla parça parça üret
+    
+    Parçalar tip şemasındadır (veri_hazirla çıktısı) ve depo.ekle ile doğrudan
+    eklenebilir. Aynı tohum aynı veriyi üretir.
+    """
+    rng = np.random.default_rng(tohum)
+    bitis = bitis or date.today()
+    gunler = pd.date_range(baslangic, bitis, freq="D")
+    
+    # Günlere hafta sonu ağırlıklı dağıtılmış kayıt sayıları, tarih sırasıyla
+    gun_agirligi = np.where(gunler.dayofweek >= 5, HAFTA_SONU_AGIRLIGI, 1.0)
+    gun_sayilari = rng.multinomial(satir_sayisi, gun_agirligi / gun_agirligi.sum())
+    gun_indisleri = np.repeat(np.arange(len(gunler), dtype=np.int32), gun_sayilari)
+    
+    metinler = np.array(
+        [f"{semt} {konu}" + (f", {ek}" if ek else "") for semt in SEMTLER for konu in KONULAR for ek in EKLER],
+        dtype=object
+    )
+    mudurluk_olasiligi = _olasiliklar(len(MUDURLUKLER), MUDURLUK_EGIMI)
+    kaynak_olasiligi = _olasiliklar(len(HABER_KAYNAKLARI), KAYNAK_EGIMI)
+    
+    for bas in range(0, satir_sayisi, parca_boyutu):
+        adet = min(parca_boyutu, satir_sayisi - bas)
+        tarihler = gunler[gun_indisleri[bas:bas + adet]]
+        # Kayıt, haberin günü mesai saatlerinde (08:00-20:00) girilir
+        saniyeler = rng.integers(8 * 3600, 20 * 3600, adet)
+        
+        parca = pd.DataFrame({
+            "Tarih": tarihler,
+            "Müdürlük": pd.Categorical.from_codes(
+                rng.choice(len(MUDURLUKLER), adet, p=mudurluk_olasiligi), MUDURLUKLER),
+            "Haber_Kaynagi": pd.Categorical.from_codes(
+                rng.choice(len(HABER_KAYNAKLARI), adet, p=kaynak_olasiligi), HABER_KAYNAKLARI),
+            "Sayı": np.minimum(rng.geometric(0.55, adet), 20).astype("int32"),
+            "Ayrıntı": metinler[rng.integers(0, len(metinler), adet)],
+            "Kayit_Zamani": tarihler + pd.to_timedelta(saniyeler, unit="s"),
+        }, columns=KOLONLAR)
+        yield veri_hazirla(parca)
+
+def sentetik_veri(satir_sayisi, **secenekler):
+    """Tüm sentetik veriyi tek tabloda döndür"""
+    return pd.concat(list(sentetik_parcalar(satir_sayisi, **secenekler)), ignore_index=True)
+
+def depo_doldur(depo, satir_sayisi, **secenekler):
+    """Depoya sentetik kayıtları parça parça ekle, eklenen kayıt sayısını döndür"""
+    eklenen = 0
+    for parca in sentetik_parcalar(satir_sayisi, **secenekler):
+        eklenen += len(depo.ekle(parca))
+    return eklenen
+
+def main():
+    ayristirici = argparse.ArgumentParser(description="Sentetik haber kayıtlarıyla depo doldur")
+    ayristirici.add_argument("satir_sayisi", type=int, help="üretilecek kayıt sayısı")
+    ayristirici.add_argument("--depo", choices=sorted(DEPO_SINIFLARI), default="csv")
+    ayristirici.add_argument("--klasor", default=".data", help="deponun oluşturulacağı klasör")
+    ayristirici.add_argument("--baslangic", type=date.fromisoformat, default=date(2023, 1, 1))
+    ayristirici.add_argument("--bitis", type=date.fromisoformat, default=None)
+    ayristirici.add_argument("--tohum", type=int, default=0)
+    argumanlar = ayristirici.parse_args()
+    
+    os.makedirs(argumanlar.klasor, exist_ok=True)
+    depo = DEPO_SINIFLARI[argumanlar.depo](argumanlar.klasor)
+    baslangic = time.perf_counter()
+    eklenen = depo_doldur(
+        depo, argumanlar.satir_sayisi,
+        baslangic=argumanlar.baslangic, bitis=argumanlar.bitis, tohum=argumanlar.tohum
+    )
+    print(f"{eklenen:,} kayıt eklendi ({argumanlar.depo}, {time.perf_counter() - baslangic:.1f} sn)")
+
+if __name__ == "__main__":
+    main()
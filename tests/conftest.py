@@ -0,0 +1,49 @@
+"""Ortak test düzeni
+
+DATA_DIR göreli bir klasördür (".data"); her test kendi geçici klasöründe
+çalışır, böylece depolar, kilit dosyaları ve geçmiş testler arasında paylaşılmaz.
+"""
+import os
+import sys
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from haber_veri import DATA_DIR, KOLONLAR, ZAMAN_BICIMI
+from sentetik_veri import DEPO_SINIFLARI
+
+@pytest.fixture(autouse=True)
+def calisma_klasoru(tmp_path, monkeypatch):
+    """Testi boş bir çalışma klasöründe çalıştır"""
+    monkeypatch.chdir(tmp_path)
+    os.makedirs(DATA_DIR, exist_ok=True)
+    return tmp_path
+
+@pytest.fixture
+def kayitlar():
+    """(tarih, müdürlük, kaynak, sayı, ayrıntı) satırlarından yeni kayıtlar tablosu kuran fonksiyon"""
+    def kur(*satirlar):
+        kayit_zamani = datetime.now().strftime(ZAMAN_BICIMI)
+        return pd.DataFrame(
+            [(tarih, mudurluk, kaynak, sayi, ayrinti, kayit_zamani) for tarih, mudurluk, kaynak, sayi, ayrinti in satirlar],
+            columns=KOLONLAR,
+        )
+    return kur
+
+@pytest.fixture(params=sorted(DEPO_SINIFLARI))
+def depo_ac(request, tmp_path):
+    """Aynı klasördeki depoyu her çağrıda yeni bir nesneyle açan fonksiyon (csv, parquet, sqlite)
+    
+    Yeni nesne, aynı veri klasörünü kullanan başka bir süreç gibi davranır.
+    """
+    if request.param == "parquet":
+        pytest.importorskip("pyarrow")
+    return lambda: DEPO_SINIFLARI[request.param](str(tmp_path))
+
+@pytest.fixture
+def depo(depo_ac):
+    """Her depo türünden boş bir depo"""
+    return depo_ac()
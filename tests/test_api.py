@@ -0,0 +1,95 @@
+"""JSON API (HaberApi): ETag ile 304, kayıt sayfaları, istek hataları ve HTTP sunucusu"""
+import gzip
+import json
+import urllib.error
+import urllib.request
+from datetime import date
+
+import pytest
+
+from haber_api import HaberApi, IstekHatasi, arka_planda_baslat
+
+ARALIK = {"baslangic": ["2026-10-01"], "bitis": ["2026-10-31"]}
+
+@pytest.fixture
+def api(depo, kayitlar):
+    depo.ekle(kayitlar(*[
+        (date(2026, 10, gun), "Zabıta Müdürlüğü" if gun % 2 else "Fen İşleri Müdürlüğü", "Diğer", gun, f"kayıt {gun}")
+        for gun in range(1, 8)
+    ]))
+    return HaberApi(depo_bul=lambda kurum_adi: depo if kurum_adi == "" else None)
+
+def govde(yanit):
+    return json.loads(yanit["govde"])
+
+def test_veri_degismediyse_304(api, kayitlar):
+    durum, yanit, etag = api.yanitla("/ozet", ARALIK)
+    assert durum == 200
+    assert govde(yanit)["metrikler"]["toplam_sayi"] == sum(range(1, 8))
+    
+    assert api.yanitla("/ozet", ARALIK, etag_istegi=etag) == (304, None, etag)
+    assert api.yanitla("/ozet", ARALIK, etag_istegi=f'"baska", {etag}')[0] == 304
+    # Başka filtre ya da başka uç nokta başka ETag alır
+    assert api.yanitla("/ozet", {**ARALIK, "mudurluk": ["Zabıta Müdürlüğü"]}, etag_istegi=etag)[0] == 200
+    assert api.yanitla("/kayitlar", ARALIK, etag_istegi=etag)[0] == 200
+    
+    api.depo_bul("").ekle(kayitlar((date(2026, 10, 8), "Zabıta Müdürlüğü", "Diğer", 1, "yeni")))
+    durum, yanit, yeni_etag = api.yanitla("/ozet", ARALIK, etag_istegi=etag)
+    assert durum == 200
+    assert yeni_etag != etag
+    assert govde(yanit)["metrikler"]["toplam_kayit"] == 8
+
+def test_kayit_sayfalari(api):
+    parametreler = {**ARALIK, "boyut": ["3"], "siralama": ["kimlik"], "yon": ["artan"]}
+    sayfalar = [govde(api.yanitla("/kayitlar", {**parametreler, "sayfa": [str(sayfa)]})[1]) for sayfa in (1, 2, 3, 4)]
+    
+    assert [sayfa["toplam"] for sayfa in sayfalar] == [7] * 4
+    assert sayfalar[0]["sayfa_sayisi"] == 3
+    assert [[kayit["kimlik"] for kayit in sayfa["kayitlar"]] for sayfa in sayfalar] == [[1, 2, 3], [4, 5, 6], [7], []]
+    assert sayfalar[0]["kayitlar"][0] == {
+        "kimlik": 1, "tarih": "2026-10-01", "mudurluk": "Zabıta Müdürlüğü",
+        "kaynak": "Diğer", "sayi": 1, "ayrinti": "kayıt 1",
+    }
+    
+    # Sayfa parametreleri ETag'e girer
+    _, _, etag = api.yanitla("/kayitlar", {**parametreler, "sayfa": ["1"]})
+    assert api.yanitla("/kayitlar", {**parametreler, "sayfa": ["2"]}, etag_istegi=etag)[0] == 200
+
+def test_siralama_ve_filtre(api):
+    parametreler = {**ARALIK, "siralama": ["sayi"], "yon": ["azalan"], "mudurluk": ["Zabıta Müdürlüğü"]}
+    sayfa = govde(api.yanitla("/kayitlar", parametreler)[1])
+    assert sayfa["toplam"] == 4
+    assert [kayit["sayi"] for kayit in sayfa["kayitlar"]] == [7, 5, 3, 1]
+
+@pytest.mark.parametrize("yol, parametreler, durum", [
+    ("/yok", ARALIK, 404),
+    ("/ozet", {**ARALIK, "kurum": ["baska"]}, 404),
+    ("/ozet", {**ARALIK, "kurum": ["../disari"]}, 404),
+    ("/ozet", {"baslangic": ["2026-10-31"], "bitis": ["2026-10-01"]}, 400),
+    ("/ozet", {"baslangic": ["31.10.2026"]}, 400),
+    ("/kayitlar", {**ARALIK, "boyut": ["0"]}, 400),
+    ("/kayitlar", {**ARALIK, "siralama": ["Ayrıntı"]}, 400),
+    ("/kayitlar", {**ARALIK, "yon": ["yukari"]}, 400),
+])
+def test_gecersiz_istekler(api, yol, parametreler, durum):
+    with pytest.raises(IstekHatasi) as hata:
+        api.yanitla(yol, parametreler)
+    assert hata.value.durum == durum
+
+def test_http_uzerinden(api):
+    sunucu = arka_planda_baslat(api, port=0)
+    try:
+        adres = f"http://127.0.0.1:{sunucu.server_port}/kayitlar?baslangic=2026-10-01&bitis=2026-10-31&boyut=500"
+        with urllib.request.urlopen(urllib.request.Request(adres, headers={"Accept-Encoding": "gzip"})) as yanit:
+            etag = yanit.headers["ETag"]
+            ham = yanit.read()
+            if yanit.headers.get("Content-Encoding") == "gzip":
+                ham = gzip.decompress(ham)
+        assert json.loads(ham)["toplam"] == 7
+        
+        with pytest.raises(urllib.error.HTTPError) as hata:
+            urllib.request.urlopen(urllib.request.Request(adres, headers={"If-None-Match": etag}))
+        assert hata.value.code == 304
+    finally:
+        sunucu.shutdown()
+        sunucu.server_close()
@@ -0,0 +1,75 @@
+"""Ayrıntı araması (AramaDizini) ve Türkçe metin katlama"""
+from datetime import date
+
+import pandas as pd
+
+from haber_veri import KIMLIK, KOLONLAR, TUM_KAYITLAR, VeriYazici, metin_katla
+
+def arama(depo, sorgu):
+    # Boş sonuç kolonsuz bir tablo olabilir (depolar boş sonuçta pd.DataFrame() döndürür)
+    df = depo.sorgula(TUM_KAYITLAR._replace(arama=sorgu))
+    return [] if df.empty else sorted(df[KIMLIK].tolist())
+
+def test_turkce_katlama():
+    katlanmis = metin_katla(pd.Series(["IŞIK Çalışması", "İmar", None]))
+    assert katlanmis.tolist() == ["isik calismasi", "imar", ""]
+
+def test_onek_ve_tum_kelimeler(depo, kayitlar):
+    depo.ekle(kayitlar(
+        (date(2026, 10, 1), "Zabıta Müdürlüğü", "Diğer", 1, "Yol çalışması trafiği aksatıyor"),
+        (date(2026, 10, 1), "Fen İşleri Müdürlüğü", "Diğer", 1, "Sokak lambası yanmıyor"),
+        (date(2026, 10, 2), "Fen İşleri Müdürlüğü", "Diğer", 1, "Yol kenarı SOKAK temizliği"),
+    ))
+    assert arama(depo, "cal") == [1]
+    assert arama(depo, "SOKAK") == [2, 3]
+    assert arama(depo, "sokak yol") == [3]
+    assert arama(depo, "yok") == []
+    assert depo.dizin.ara("") is None
+
+def test_duzenleme_ve_silme_sonrasi(depo, kayitlar, tmp_path):
+    yazici = VeriYazici(depo, str(tmp_path / "yazma.kilit"))
+    yazici.ekle(kayitlar(
+        (date(2026, 10, 1), "Zabıta Müdürlüğü", "Diğer", 1, "çöp konteyneri taşmış"),
+        (date(2026, 10, 1), "Zabıta Müdürlüğü", "Diğer", 1, "kaldırım kırık"),
+        (date(2026, 10, 2), "Fen İşleri Müdürlüğü", "Diğer", 1, "çöp toplanmadı"),
+    ))
+    # Dizin ilk aramada kurulur; sonraki yazmalar yazıcı tarafından dizine işlenir
+    assert arama(depo, "cop") == [1, 3]
+    surum = depo.dizin.surum
+    
+    yazici.guncelle({1: {"Ayrıntı": "konteyner boşaltıldı"}, 2: {"Ayrıntı": "kırık kaldırım ve çöp"}}, pd.DataFrame(columns=KOLONLAR), [3])
+    assert depo.dizin.surum not in (None, surum)
+    assert arama(depo, "cop") == [2]
+    assert arama(depo, "konteyner") == [1]
+    assert arama(depo, "tasmis") == []
+    
+    yazici.ekle(kayitlar((date(2026, 10, 3), "Zabıta Müdürlüğü", "Diğer", 1, "çöp yine taşmış")))
+    assert arama(depo, "cop") == [2, 4]
+    assert arama(depo, "tasmis") == [4]
+
+def test_depo_disaridan_degisince_yeniden_kurulur(depo, kayitlar):
+    depo.ekle(kayitlar((date(2026, 10, 1), "Zabıta Müdürlüğü", "Diğer", 1, "park bakımsız")))
+    assert arama(depo, "park") == [1]
+    # Yazıcıdan geçmeyen yazma: dizin sürümü geride kalır ve baştan kurulur
+    depo.guncelle({1: {"Ayrıntı": "bahçe bakımsız"}}, pd.DataFrame(columns=KOLONLAR), [])
+    assert arama(depo, "park") == []
+    assert arama(depo, "bahce") == [1]
+
+def test_dizin_islenemezse_bastan_kurulur(depo, kayitlar, tmp_path, monkeypatch):
+    yazici = VeriYazici(depo, str(tmp_path / "yazma.kilit"))
+    yazici.ekle(kayitlar((date(2026, 10, 1), "Zabıta Müdürlüğü", "Diğer", 1, "çöp konteyneri taşmış")))
+    assert arama(depo, "cop") == [1]
+    
+    def bozuk(*argumanlar):
+        raise MemoryError
+    monkeypatch.setattr(depo.dizin, "degisti", bozuk)
+    # Kayıt yazıldı; dizin hatası düzenlemeyi bozmaz
+    assert yazici.guncelle({1: {"Ayrıntı": "konteyner boşaltıldı"}}, kayitlar(
+        (date(2026, 10, 2), "Fen İşleri Müdürlüğü", "Diğer", 1, "çöp toplanmadı"),
+    ), []) == [2]
+    monkeypatch.undo()
+    
+    # Sonraki işten önce dizinler depodan baştan kurulur
+    yazici.ekle(kayitlar((date(2026, 10, 3), "Zabıta Müdürlüğü", "Diğer", 1, "kaldırım kırık")))
+    assert arama(depo, "cop") == [2]
+    assert arama(depo, "konteyner") == [1]
@@ -0,0 +1,73 @@
+"""CSV arşivi: eski kayıtların aylık bölümlere taşınması ve arşivdeki kayıtların düzenlenmesi"""
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from haber_veri import KIMLIK, KOLONLAR, TUM_KAYITLAR, CsvDepo, Filtre, VeriYazici
+
+SINIR = date(2026, 3, 1)
+
+@pytest.fixture
+def arsivli_depo(kayitlar, tmp_path):
+    """Ocak ve şubat kayıtları arşivde, mart kaydı sıcak dosyada olan CSV deposu"""
+    depo = CsvDepo(str(tmp_path / "haber.csv"))
+    depo.ekle(kayitlar(
+        (date(2026, 1, 5), "Zabıta Müdürlüğü", "Diğer", 1, "ocak kaydı"),
+        (date(2026, 1, 20), "Fen İşleri Müdürlüğü", "Diğer", 2, "ocak ikinci kayıt"),
+        (date(2026, 2, 10), "Zabıta Müdürlüğü", "Diğer", 3, "şubat kaydı"),
+        (date(2026, 3, 15), "Zabıta Müdürlüğü", "Diğer", 4, "mart kaydı"),
+    ))
+    assert depo.arsivle(SINIR) == 3
+    return depo
+
+def kayit(depo, kimlik):
+    return depo.yukle().set_index(KIMLIK).loc[kimlik]
+
+def test_arsivlenen_kayitlar_okunur(arsivli_depo):
+    assert arsivli_depo.arsiv.aylar() == ["2026-01", "2026-02"]
+    assert pd.read_csv(arsivli_depo.dosya_adi, encoding="utf-8-sig")[KIMLIK].tolist() == [4]
+    assert arsivli_depo.yukle()[KIMLIK].tolist() == [1, 2, 3, 4]
+    ocak = arsivli_depo.sorgula(Filtre(date(2026, 1, 1), date(2026, 1, 31)))
+    assert sorted(ocak[KIMLIK].tolist()) == [1, 2]
+    assert int(arsivli_depo.ozet(TUM_KAYITLAR)['Sayı'].sum()) == 10
+
+def test_arsivdeki_kayit_duzenlenir_ve_silinir(arsivli_depo):
+    arsivli_depo.guncelle({1: {"Sayı": 9, "Ayrıntı": "ocak düzeltildi"}}, pd.DataFrame(columns=KOLONLAR), [3])
+    
+    assert kayit(arsivli_depo, 1)["Sayı"] == 9
+    assert kayit(arsivli_depo, 1)["Ayrıntı"] == "ocak düzeltildi"
+    assert arsivli_depo.yukle()[KIMLIK].tolist() == [1, 2, 4]
+    # Sıcak dosyaya dokunulmaz; boşalan şubat bölümü arşivden çıkar
+    assert pd.read_csv(arsivli_depo.dosya_adi, encoding="utf-8-sig")[KIMLIK].tolist() == [4]
+    assert arsivli_depo.arsiv.aylar() == ["2026-01"]
+    ozet = arsivli_depo.ozet(TUM_KAYITLAR)
+    assert int(ozet['Sayı'].sum()) == 9 + 2 + 4
+    assert int(ozet['Kayit'].sum()) == 3
+
+def test_tarihi_degisen_kayit_yeni_ayina_gecer(arsivli_depo):
+    arsivli_depo.guncelle({2: {"Tarih": date(2026, 2, 25)}}, pd.DataFrame(columns=KOLONLAR), [])
+    
+    assert arsivli_depo.arsiv.bolum("2026-01")[KIMLIK].tolist() == [1]
+    assert sorted(arsivli_depo.arsiv.bolum("2026-02")[KIMLIK].tolist()) == [2, 3]
+    subat = arsivli_depo.sorgula(Filtre(date(2026, 2, 1), date(2026, 2, 28)))
+    assert sorted(subat[KIMLIK].tolist()) == [2, 3]
+
+def test_sicak_ve_arsivdeki_kayitlar_birlikte_duzenlenir(arsivli_depo, kayitlar):
+    eklenen = arsivli_depo.guncelle(
+        {1: {"Sayı": 5}, 4: {"Sayı": 6}}, kayitlar((date(2026, 3, 20), "Zabıta Müdürlüğü", "Diğer", 1, "yeni")), [2]
+    )
+    assert eklenen == [5]
+    df = arsivli_depo.yukle().set_index(KIMLIK)
+    assert df.index.tolist() == [1, 3, 4, 5]
+    assert df['Sayı'].tolist() == [5, 3, 6, 1]
+
+def test_duzenleme_baska_surecte_gorulur(arsivli_depo, tmp_path):
+    yazici = VeriYazici(arsivli_depo, str(tmp_path / "yazma.kilit"))
+    yazici.guncelle({1: {"Ayrıntı": "arşivde düzeltme"}}, pd.DataFrame(columns=KOLONLAR), [])
+    
+    yeni = CsvDepo(arsivli_depo.dosya_adi)
+    assert kayit(yeni, 1)["Ayrıntı"] == "arşivde düzeltme"
+    # Arşiv sürümü değiştiğinden arama dizini de yeni metni görür
+    bulunan = arsivli_depo.sorgula(TUM_KAYITLAR._replace(arama="duzeltme"))
+    assert bulunan[KIMLIK].tolist() == [1]
@@ -0,0 +1,72 @@
+"""Tablo düzenlemelerinin kayıtlara uygulanması (degisiklikleri_uygula, tablo_degisiklikleri)"""
+from datetime import date
+
+import pandas as pd
+
+from haber_veri import KIMLIK, KOLONLAR, degisiklikleri_uygula, tablo_degisiklikleri, veri_hazirla
+
+def tablo(kayitlar, *kimlikler):
+    df = veri_hazirla(kayitlar(
+        (date(2026, 10, 1), "Zabıta Müdürlüğü", "Beykoz Anlık", 1, "çöp konteyneri taşmış"),
+        (date(2026, 10, 2), "Fen İşleri Müdürlüğü", "Diğer", 2, "asfalt çukuru"),
+        (date(2026, 10, 3), "Zabıta Müdürlüğü", "Diğer", 3, "seyyar satıcı şikayeti"),
+    ))
+    df.insert(0, KIMLIK, list(kimlikler or (1, 2, 3)))
+    return df
+
+def test_duzenleme_silme_ve_ekleme(kayitlar):
+    df = tablo(kayitlar)
+    eklenenler = kayitlar((date(2026, 10, 4), "Park ve Bahçeler Müdürlüğü", "Diğer", 1, "park bakımsız"))
+    
+    sonuc, eklenen_kimlikler = degisiklikleri_uygula(
+        df, {2: {"Sayı": 7, "Ayrıntı": "asfalt yenilendi"}}, eklenenler, [3], son_kimlik=5
+    )
+    
+    assert eklenen_kimlikler == [6]
+    assert sonuc[KIMLIK].tolist() == [1, 2, 6]
+    duzenlenen = sonuc.set_index(KIMLIK).loc[2]
+    assert duzenlenen["Sayı"] == 7
+    assert duzenlenen["Ayrıntı"] == "asfalt yenilendi"
+    assert sonuc.set_index(KIMLIK).loc[6, "Müdürlük"] == "Park ve Bahçeler Müdürlüğü"
+
+def test_paylasilan_tablo_degismez(kayitlar):
+    df = tablo(kayitlar)
+    onceki = df.copy()
+    degisiklikleri_uygula(df, {1: {"Sayı": 9}}, pd.DataFrame(columns=KOLONLAR), [2], son_kimlik=3)
+    pd.testing.assert_frame_equal(df, onceki)
+
+def test_kolon_tipleri_korunur(kayitlar):
+    df = tablo(kayitlar)
+    sonuc, _ = degisiklikleri_uygula(
+        df, {1: {"Tarih": date(2026, 9, 30), "Müdürlük": "Listede olmayan birim"}},
+        pd.DataFrame(columns=KOLONLAR), [], son_kimlik=3
+    )
+    assert sonuc['Tarih'].dtype == df['Tarih'].dtype
+    assert isinstance(sonuc['Müdürlük'].dtype, pd.CategoricalDtype)
+    assert sonuc.set_index(KIMLIK).loc[1, "Tarih"] == pd.Timestamp(2026, 9, 30)
+    assert sonuc.set_index(KIMLIK).loc[1, "Müdürlük"] == "Listede olmayan birim"
+
+def test_olmayan_kimlikler_yok_sayilir(kayitlar):
+    df = tablo(kayitlar)
+    sonuc, eklenen_kimlikler = degisiklikleri_uygula(
+        df, {99: {"Sayı": 5}}, pd.DataFrame(columns=KOLONLAR), [98], son_kimlik=3
+    )
+    assert eklenen_kimlikler == []
+    assert sonuc[KIMLIK].tolist() == [1, 2, 3]
+    assert sonuc['Sayı'].tolist() == [1, 2, 3]
+
+def test_duzenleyici_satirlari_kimliklere_cevrilir(kayitlar):
+    # Gösterilen tablo kimliğe göre indeksli ve sayfadaki sırasıyla
+    gosterilen = tablo(kayitlar, 10, 20, 30).set_index(KIMLIK).iloc[::-1]
+    durum = {
+        "edited_rows": {0: {"Sayı": 4.0}},
+        "added_rows": [{"Tarih": "2026-10-05", "Müdürlük": "Zabıta Müdürlüğü", "Haber_Kaynagi": "Diğer", "Sayı": None}],
+        "deleted_rows": [2],
+    }
+    duzenlenenler, eklenenler, silinenler = tablo_degisiklikleri(gosterilen, durum)
+    
+    assert duzenlenenler == {30: {"Sayı": 4}}
+    assert silinenler == [10]
+    assert eklenenler['Tarih'].tolist() == [date(2026, 10, 5)]
+    assert eklenenler['Sayı'].tolist() == [1]
+    assert eklenenler['Ayrıntı'].tolist() == [""]
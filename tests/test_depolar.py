@@ -0,0 +1,103 @@
+"""Depoların eşdeğerliği: aynı kayıtlar ve aynı Filtre her depoda aynı sonucu verir"""
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from haber_veri import (
+    GORUNUM_KOLONLARI, KIMLIK, KOLONLAR, OZET_ANAHTARI, TUM_KAYITLAR,
+    Filtre, VeriYazici, kayit_metinleri,
+)
+from sentetik_veri import DEPO_SINIFLARI, depo_doldur
+
+KAYIT_SAYISI = 3000
+BASLANGIC = date(2025, 1, 1)
+BITIS = date(2026, 6, 30)
+
+FILTRELER = [
+    TUM_KAYITLAR,
+    Filtre(date(2025, 3, 1), date(2025, 3, 31)),
+    Filtre(date(2025, 6, 15), date(2026, 2, 10), mudurlukler=("Zabıta Müdürlüğü", "Fen İşleri Müdürlüğü")),
+    Filtre(BASLANGIC, BITIS, kaynaklar=("Beykoz Anlık", "Diğer")),
+    Filtre(BASLANGIC, BITIS, arama="çöp"),
+    Filtre(date(2025, 9, 1), date(2025, 12, 31), mudurlukler=("Zabıta Müdürlüğü",), arama="kavacik sikayet"),
+    Filtre(date(2027, 1, 1), date(2027, 12, 31)),
+]
+
+@pytest.fixture(scope="module")
+def depolar(tmp_path_factory):
+    """Aynı sentetik kayıtlarla doldurulmuş, ardından aynı düzenlemeleri almış depolar"""
+    # ParquetDepo pyarrow ister
+    pytest.importorskip("pyarrow")
+    depolar = {}
+    for tur, depo_sinifi in sorted(DEPO_SINIFLARI.items()):
+        klasor = tmp_path_factory.mktemp(tur)
+        depo = depo_sinifi(str(klasor))
+        depo_doldur(depo, KAYIT_SAYISI, baslangic=BASLANGIC, bitis=BITIS, tohum=7)
+        yazici = VeriYazici(depo, str(klasor / "yazma.kilit"))
+        eklenen = yazici.guncelle(
+            {5: {"Sayı": 11, "Ayrıntı": "çöp toplanmadı"}, 40: {"Tarih": date(2026, 1, 2), "Müdürlük": "Zabıta Müdürlüğü"}},
+            pd.DataFrame([{
+                "Tarih": date(2025, 3, 3), "Müdürlük": "Fen İşleri Müdürlüğü", "Haber_Kaynagi": "Beykoz Anlık",
+                "Sayı": 2, "Ayrıntı": "Kavacık çöp şikayeti", "Kayit_Zamani": "2025-03-03 10:00:00",
+            }], columns=KOLONLAR),
+            [1, 2, 3, 100],
+        )
+        assert eklenen == [KAYIT_SAYISI + 1]
+        depolar[tur] = depo
+    return depolar
+
+def kayit_satirlari(df):
+    """Kayıtların metin değerleri, kimlik sırasıyla (boş sonuç kolonsuz olabilir)"""
+    if df.empty:
+        return []
+    metinler = kayit_metinleri(df)
+    metinler.insert(0, KIMLIK, df[KIMLIK].astype('int64').values)
+    return sorted(metinler.values.tolist())
+
+def ozet_satirlari(ozet):
+    """Günlük özet satırları (Tarih, Müdürlük, Kaynak, Sayı, Kayit), sıralı ve boş satırsız"""
+    if ozet.empty:
+        return []
+    ozet = ozet.assign(Tarih=pd.to_datetime(ozet['Tarih']).dt.strftime('%Y-%m-%d'))
+    for kolon in OZET_ANAHTARI[1:]:
+        ozet[kolon] = ozet[kolon].astype(str)
+    toplam = ozet.groupby(OZET_ANAHTARI)[['Sayı', 'Kayit']].sum()
+    return [(*anahtar, int(sayi), int(kayit)) for anahtar, sayi, kayit in toplam[toplam['Kayit'] > 0].itertuples(name=None)]
+
+def esit(depolar, hesapla):
+    sonuclar = {tur: hesapla(depo) for tur, depo in depolar.items()}
+    ilk = next(iter(sonuclar.values()))
+    for tur, sonuc in sonuclar.items():
+        assert sonuc == ilk, tur
+    return ilk
+
+def test_tum_kayitlar(depolar):
+    satirlar = esit(depolar, lambda depo: kayit_satirlari(depo.yukle()))
+    assert len(satirlar) == KAYIT_SAYISI - 4 + 1
+
+@pytest.mark.parametrize("filtre", FILTRELER)
+def test_sorgu(depolar, filtre):
+    esit(depolar, lambda depo: kayit_satirlari(depo.sorgula(filtre)))
+    esit(depolar, lambda depo: kayit_satirlari(depo.sorgula(filtre, kolonlar=GORUNUM_KOLONLARI)))
+
+@pytest.mark.parametrize("filtre", FILTRELER)
+def test_ozet(depolar, filtre):
+    ozet = esit(depolar, lambda depo: ozet_satirlari(depo.ozet(filtre)))
+    # Özet aynı filtrenin kayıtlarıyla tutarlıdır
+    kayitlar = depolar["csv"].sorgula(filtre)
+    assert sum(satir[-1] for satir in ozet) == len(kayitlar)
+    assert sum(satir[-2] for satir in ozet) == (int(kayitlar['Sayı'].sum()) if len(kayitlar) else 0)
+
+@pytest.mark.parametrize("filtre", FILTRELER)
+def test_parcalar(depolar, filtre):
+    def parcalar(depo):
+        return kayit_satirlari(pd.concat(list(depo.parcalar(filtre, parca_boyutu=500)) or [pd.DataFrame()]))
+    assert esit(depolar, parcalar) == esit(depolar, lambda depo: kayit_satirlari(depo.sorgula(filtre)))
+
+@pytest.mark.parametrize("siralama", [KIMLIK, "Tarih", "Sayı", "Müdürlük"])
+@pytest.mark.parametrize("artan", [True, False])
+@pytest.mark.parametrize("filtre", FILTRELER[:3])
+def test_sayfa(depolar, filtre, siralama, artan):
+    for ofset in (0, 37):
+        esit(depolar, lambda depo: depo.sayfa(filtre, siralama, artan=artan, ofset=ofset, limit=25)[KIMLIK].tolist())
@@ -0,0 +1,70 @@
+"""Zaman dilimleri ve dönem karşılaştırmaları (haber_donem)"""
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from haber_veri import (
+    TUM_KAYITLAR, donem_karsilastirmasi, isi_haritasi, karsilastirma_araligi, ozet_hesapla,
+    veri_hazirla, zaman_dilimi_sec, zaman_serisi,
+)
+
+@pytest.mark.parametrize("baslangic, bitis, istenen, dilim", [
+    (date(2026, 10, 1), date(2026, 10, 31), None, "gun"),
+    (date(2026, 1, 1), date(2026, 4, 30), None, "gun"),
+    (date(2026, 1, 1), date(2026, 5, 1), None, "hafta"),
+    (date(2026, 1, 1), date(2026, 5, 1), "ay", "ay"),
+    # El ile seçilen dilim fazla inceyse bir üst dilime geçilir
+    (date(2016, 1, 1), date(2025, 12, 31), "gun", "ay"),
+    (date(2015, 1, 1), date(2025, 12, 31), "hafta", "ceyrek"),
+    (date(1000, 1, 1), date(2025, 12, 31), "gun", "yil"),
+])
+def test_zaman_dilimi_sec(baslangic, bitis, istenen, dilim):
+    assert zaman_dilimi_sec(baslangic, bitis, istenen) == dilim
+
+@pytest.mark.parametrize("bitis, dilim, aralik", [
+    # Yarım kalan ay, önceki ayın aynı sayıda ilk günüyle karşılaştırılır
+    (date(2026, 3, 10), "ay", (date(2026, 2, 1), date(2026, 2, 10), date(2026, 3, 1))),
+    # Önceki ay daha kısaysa önceki dönem ay sonunda biter
+    (date(2026, 3, 31), "ay", (date(2026, 2, 1), date(2026, 2, 28), date(2026, 3, 1))),
+    (date(2024, 3, 30), "ay", (date(2024, 2, 1), date(2024, 2, 29), date(2024, 3, 1))),
+    (date(2026, 5, 31), "ay", (date(2026, 4, 1), date(2026, 4, 30), date(2026, 5, 1))),
+    # Haftalar pazartesi başlar
+    (date(2026, 10, 14), "hafta", (date(2026, 10, 5), date(2026, 10, 7), date(2026, 10, 12))),
+    (date(2026, 10, 14), "gun", (date(2026, 10, 13), date(2026, 10, 13), date(2026, 10, 14))),
+])
+def test_karsilastirma_araligi(bitis, dilim, aralik):
+    assert karsilastirma_araligi(bitis, dilim) == aralik
+
+def test_donem_karsilastirmasi(kayitlar):
+    ozet = ozet_hesapla(veri_hazirla(kayitlar(
+        (date(2026, 10, 1), "Zabıta Müdürlüğü", "Diğer", 4, ""),
+        (date(2026, 10, 2), "Zabıta Müdürlüğü", "Diğer", 2, ""),
+        (date(2026, 9, 1), "Zabıta Müdürlüğü", "Diğer", 3, ""),
+        (date(2026, 9, 2), "Fen İşleri Müdürlüğü", "Diğer", 5, ""),
+        # Önceki ayın karşılaştırılan kısmının dışında
+        (date(2026, 9, 20), "Fen İşleri Müdürlüğü", "Diğer", 7, ""),
+        (date(2026, 10, 1), "Park ve Bahçeler Müdürlüğü", "Diğer", 1, ""),
+    )))
+    tablo = donem_karsilastirmasi(ozet, "ay", date(2026, 10, 2))
+    
+    assert list(tablo.columns) == ["Müdürlük", "Bu dönem", "Önceki dönem", "Fark", "Değişim %"]
+    # En büyük mutlak fark üstte; önceki dönem boşsa değişim yüzdesi yok
+    assert tablo.drop(columns="Değişim %").values.tolist() == [
+        ["Fen İşleri Müdürlüğü", 0, 5, -5],
+        ["Zabıta Müdürlüğü", 6, 3, 3],
+        ["Park ve Bahçeler Müdürlüğü", 1, 0, 1],
+    ]
+    assert tablo["Değişim %"].tolist()[:2] == [-100.0, 100.0]
+    assert pd.isna(tablo["Değişim %"].iloc[2])
+
+def test_bos_ozet(depo):
+    # Kaydı olmayan depoda da özet tarihleri datetime64'tür
+    ozet = depo.ozet(TUM_KAYITLAR)
+    assert pd.api.types.is_datetime64_any_dtype(ozet["Tarih"])
+    
+    seri = zaman_serisi(ozet, "hafta", date(2026, 10, 1), date(2026, 10, 18))
+    assert seri.index.tolist() == [pd.Timestamp(2026, 9, 28), pd.Timestamp(2026, 10, 5), pd.Timestamp(2026, 10, 12)]
+    assert (seri[["Sayı", "Kayit"]] == 0).all().all()
+    assert isi_haritasi(ozet, "ay").empty
+    assert donem_karsilastirmasi(ozet, "ay", date(2026, 10, 18)).empty
@@ -0,0 +1,88 @@
+"""Değişiklik geçmişi (DegisiklikGecmisi) ve geçmişteki bir ana geri yükleme"""
+from datetime import date, datetime
+
+import pandas as pd
+import pytest
+
+from anlik_goruntu import DegisiklikGecmisi
+from haber_veri import KIMLIK, KOLONLAR, VeriYazici
+
+def icerik(df):
+    """Karşılaştırma için kimlik sırasıyla (kimlik, sayı, ayrıntı) satırları"""
+    return [tuple(satir) for satir in df.sort_values(KIMLIK)[[KIMLIK, 'Sayı', 'Ayrıntı']].itertuples(index=False, name=None)]
+
+@pytest.fixture
+def gecmisli_yazici(depo, tmp_path):
+    gecmis = DegisiklikGecmisi(str(tmp_path / "gecmis"))
+    return VeriYazici(depo, str(tmp_path / "yazma.kilit"), gecmis=gecmis), gecmis
+
+def test_her_an_geri_kurulur(gecmisli_yazici, kayitlar):
+    yazici, gecmis = gecmisli_yazici
+    with pytest.raises(ValueError):
+        gecmis.tablo(datetime.now())
+    
+    yazici.ekle(kayitlar(
+        (date(2026, 10, 1), "Zabıta Müdürlüğü", "Diğer", 1, "birinci"),
+        (date(2026, 10, 1), "Zabıta Müdürlüğü", "Diğer", 2, "ikinci"),
+    ))
+    gecmis.bekle()
+    eklemeden_sonra = datetime.now()
+    
+    yazici.guncelle(
+        {1: {"Sayı": 5, "Ayrıntı": "birinci düzeltildi"}},
+        kayitlar((date(2026, 10, 2), "Fen İşleri Müdürlüğü", "Diğer", 3, "üçüncü")),
+        [2],
+    )
+    duzenlemeden_sonra = datetime.now()
+    
+    yazici.temizle()
+    temizlemeden_sonra = datetime.now()
+    
+    yazici.ekle(kayitlar((date(2026, 10, 3), "Zabıta Müdürlüğü", "Diğer", 4, "dördüncü")))
+    son = datetime.now()
+    
+    assert icerik(gecmis.tablo(eklemeden_sonra)) == [(1, 1, "birinci"), (2, 2, "ikinci")]
+    assert icerik(gecmis.tablo(duzenlemeden_sonra)) == [(1, 5, "birinci düzeltildi"), (3, 3, "üçüncü")]
+    assert gecmis.tablo(temizlemeden_sonra).empty
+    assert icerik(gecmis.tablo(son)) == [(4, 4, "dördüncü")]
+    assert icerik(gecmis.tablo(son)) == icerik(yazici.depo.yukle())
+
+def test_geri_yukleme(gecmisli_yazici, kayitlar):
+    yazici, gecmis = gecmisli_yazici
+    yazici.ekle(kayitlar(
+        (date(2026, 10, 1), "Zabıta Müdürlüğü", "Diğer", 1, "birinci"),
+        (date(2026, 10, 1), "Zabıta Müdürlüğü", "Diğer", 2, "ikinci"),
+    ))
+    gecmis.bekle()
+    hedef = datetime.now()
+    yazici.guncelle({}, pd.DataFrame(columns=KOLONLAR), [1, 2])
+    yazici.ekle(kayitlar((date(2026, 10, 2), "Zabıta Müdürlüğü", "Diğer", 3, "üçüncü")))
+    
+    assert yazici.geri_yukle(hedef) == 2
+    assert icerik(yazici.depo.yukle()) == [(1, 1, "birinci"), (2, 2, "ikinci")]
+    # Geri yüklemeden sonra kimlikler yeniden verilmez
+    assert yazici.ekle(kayitlar((date(2026, 10, 3), "Zabıta Müdürlüğü", "Diğer", 1, "yeni"))) == [4]
+    
+    # Geri yükleme de geçmişe işlenir: sonraki anlar geri yüklenen tablodan devam eder
+    gecmis.bekle()
+    assert [kimlik for kimlik, _, _ in icerik(gecmis.tablo(datetime.now()))] == [1, 2, 4]
+    assert gecmis.son_islemler()["İşlem"].tolist()[:2] == ["ekle", "geri_yukle"]
+
+def test_gecmis_yazilamazsa_kayit_korunur(gecmisli_yazici, kayitlar, monkeypatch):
+    yazici, gecmis = gecmisli_yazici
+    yazici.ekle(kayitlar((date(2026, 10, 1), "Zabıta Müdürlüğü", "Diğer", 1, "birinci")))
+    gecmis.bekle()
+    
+    def bozuk(*argumanlar):
+        raise OSError("disk dolu")
+    monkeypatch.setattr(gecmis, "kaydet", bozuk)
+    # Kayıt yazıldı; geçmiş hatası eklemeyi bozmaz
+    assert yazici.ekle(kayitlar((date(2026, 10, 2), "Zabıta Müdürlüğü", "Diğer", 2, "ikinci")), oturum="a") == [2]
+    monkeypatch.undo()
+    
+    # Sonraki işten önce dizinler ve geçmiş depodan baştan kurulur
+    assert yazici.ekle(kayitlar((date(2026, 10, 2), "Zabıta Müdürlüğü", "Diğer", 2, "ikinci")), oturum="a") == []
+    assert yazici.ekle(kayitlar((date(2026, 10, 3), "Zabıta Müdürlüğü", "Diğer", 3, "üçüncü"))) == [3]
+    assert yazici.depo.dizin.ara("ikinci").tolist() == [2]
+    gecmis.bekle()
+    assert icerik(gecmis.tablo(datetime.now())) == icerik(yazici.depo.yukle())
@@ -0,0 +1,116 @@
+"""Kurumlar: kurum havuzunun bellek sınırı (KurumHavuzu) ve kurumların ayrı listeleri/verileri"""
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from haber_kayit import tablo_bellegi
+from haber_veri import KIMLIK, TUM_KAYITLAR, Kurum, KurumHavuzu, VeriYazici, depo_olustur
+from sentetik_veri import DEPO_SINIFLARI
+from toplu_aktarim import kurum_eslemeleri, toplu_aktar
+
+@pytest.fixture(params=sorted(DEPO_SINIFLARI))
+def depo_turu(request):
+    if request.param == "parquet":
+        pytest.importorskip("pyarrow")
+    return request.param
+
+@pytest.fixture
+def kurum_deposu(depo_turu, kayitlar):
+    """Adı verilen kurumun, birkaç kaydı yazılmış ve bir kez sorgulanmış deposu"""
+    def kur(ad):
+        depo = depo_olustur(depo_turu, Kurum(ad))
+        depo.ekle(kayitlar(
+            (date(2026, 10, 1), "Zabıta Müdürlüğü", "Diğer", 1, f"{ad} çöp konteyneri taşmış"),
+            (date(2026, 10, 2), "Fen İşleri Müdürlüğü", "Diğer", 2, f"{ad} asfalt çukuru"),
+        ))
+        sorgu(depo, "cop")
+        return depo
+    return kur
+
+def sorgu(depo, arama=""):
+    df = depo.sorgula(TUM_KAYITLAR._replace(arama=arama))
+    return [] if df.empty else sorted(df["Ayrıntı"].tolist())
+
+def test_bosta_kalan_kurum_bosaltilir(kurum_deposu):
+    havuz = KurumHavuzu(sinir=1, kontrol_araligi=0)
+    a, b = kurum_deposu("a"), kurum_deposu("b")
+    
+    havuz.kullan("a", a)
+    assert havuz.bosaltilan == 0
+    havuz.kullan("b", b)
+    
+    # Sınır aşıldı: en uzun süredir kullanılmayan boşaltılır, en son kullanılan kalır
+    assert havuz.bosaltilan == 1
+    bellek = havuz.bellek()
+    assert list(bellek) == ["a", "b"]
+    assert bellek["a"] == 0 and bellek["b"] > 0
+    
+    # Boşaltılan depo sonraki sorguda diskten yeniden okunur
+    assert sorgu(a) == ["a asfalt çukuru", "a çöp konteyneri taşmış"]
+    assert sorgu(a, "cop") == ["a çöp konteyneri taşmış"]
+    assert sorgu(a, "b") == []
+    
+    havuz.kullan("a", a)
+    assert havuz.bellek()["b"] == 0 and havuz.bellek()["a"] > 0
+    assert sorgu(b, "asfalt") == ["b asfalt çukuru"]
+
+def test_tek_kurum_sinir_asilsa_da_bosaltilmaz(kurum_deposu):
+    havuz = KurumHavuzu(sinir=1, kontrol_araligi=0)
+    a = kurum_deposu("a")
+    havuz.kullan("a", a)
+    assert havuz.sinirla() == []
+    assert havuz.bellek()["a"] > 0
+
+def test_sinir_altinda_bosaltilmaz(kurum_deposu):
+    havuz = KurumHavuzu(sinir=1 << 40, kontrol_araligi=0)
+    havuz.kullan("a", kurum_deposu("a"))
+    havuz.kullan("b", kurum_deposu("b"))
+    assert havuz.bosaltilan == 0
+    assert all(havuz.bellek().values())
+
+def test_bellek_orneklemle_tahmin_edilir():
+    uzunluklar = np.random.default_rng(0).integers(0, 200, 20_000)
+    df = pd.DataFrame({"Ayrıntı": [f"kayıt {sira} " + "x" * uzunluk for sira, uzunluk in enumerate(uzunluklar)]})
+    gercek = int(df.memory_usage(index=True, deep=True).sum())
+    assert abs(tablo_bellegi(df) - gercek) < gercek * 0.05
+    # Aynı tablo bir kez sayılır
+    assert tablo_bellegi(df, df, None) == tablo_bellegi(df)
+
+def test_kurumlarin_listeleri_ve_verileri_ayri(depo_turu, tmp_path):
+    su = Kurum("su", baslik="Su İdaresi", mudurlukler=["Su İşleri Müdürlüğü"], haber_kaynaklari=["Radyo"])
+    beykoz = Kurum("beykoz")
+    su.mudurlukler.append("Arıtma Müdürlüğü")
+    
+    # Liste değişikliği diğer kurumlara ve varsayılan listelere yansımaz
+    assert "Su İşleri Müdürlüğü" not in beykoz.mudurlukler
+    assert "Arıtma Müdürlüğü" not in Kurum("diger").mudurlukler
+    assert "Radyo" not in beykoz.haber_kaynaklari
+    assert "suisleri" in kurum_eslemeleri(su)[0] and "suisleri" not in kurum_eslemeleri(beykoz)[0]
+    assert su.dizin != beykoz.dizin
+    
+    dosya = tmp_path / "arsiv.csv"
+    dosya.write_text(
+        "Tarih;Müdürlük;Kaynak;Ayrıntı\n"
+        "01.10.2026;Su İşleri;RADYO;boru patladı\n"
+        "01.10.2026;Zabıta Müdürlüğü;Beykoz Anlık;seyyar satıcı\n",
+        encoding="utf-8",
+    )
+    sonuclar = {}
+    for kurum in (su, beykoz):
+        depo = depo_olustur(depo_turu, kurum)
+        sonuclar[kurum.ad] = toplu_aktar(str(dosya), VeriYazici(depo, kurum.yazma_kilidi), kurum=kurum), depo
+    
+    sonuc, depo = sonuclar["su"]
+    assert sonuc.hata_tablosu()["Satır"].tolist() == [3]
+    assert depo.yukle()[["Müdürlük", "Haber_Kaynagi", "Ayrıntı"]].values.tolist() == [
+        ["Su İşleri Müdürlüğü", "Radyo", "boru patladı"]
+    ]
+    sonuc, depo = sonuclar["beykoz"]
+    assert sonuc.hata_tablosu()["Satır"].tolist() == [2]
+    assert depo.yukle()[["Müdürlük", "Haber_Kaynagi", "Ayrıntı"]].values.tolist() == [
+        ["Zabıta Müdürlüğü", "Beykoz Anlık", "seyyar satıcı"]
+    ]
+    # Her kurumun kimlikleri kendi deposunda baştan başlar
+    assert [sonuclar[ad][1].yukle()[KIMLIK].tolist() for ad in ("su", "beykoz")] == [[1], [1]]
@@ -0,0 +1,55 @@
+"""PDF raporu: Türkçe yazı tipi depoyla gelir, bulunamazsa rapor sessizce bozulmaz"""
+import os
+from datetime import date
+
+import pytest
+
+import haber_pdf
+from haber_rapor import pdf_raporu
+from haber_veri import TUM_KAYITLAR
+
+@pytest.fixture(autouse=True)
+def yazi_tipi_aramasi():
+    # Yazı tipi araması süreç başına önbelleğe alınır; her test baştan arar
+    haber_pdf.pdf_yazi_tipleri.cache_clear()
+    yield
+    haber_pdf.pdf_yazi_tipleri.cache_clear()
+
+def test_depodaki_yazi_tipi_kullanilir(depo, kayitlar):
+    depo.ekle(kayitlar(
+        (date(2026, 10, 1), "Zabıta Müdürlüğü", "Diğer", 1, "Işıklı çağrı: İğne şişesi • ölçüm"),
+    ))
+    assert pdf_raporu(depo, TUM_KAYITLAR).startswith(b"%PDF")
+    assert set(haber_pdf.pdf_yazi_tipleri().values()) == {
+        os.path.join(haber_pdf.PDF_FONT_KLASORLERI[0], ad) for ad in haber_pdf.PDF_FONT_DOSYALARI.values()
+    }
+    
+    pdf = haber_pdf.RaporPDF("Beykoz")
+    assert pdf.yazi_tipi == "dejavu"
+    assert pdf.metin("İğne • şişe") == "İğne • şişe"
+
+def test_yazi_tipi_yoksa_hata(monkeypatch, tmp_path):
+    monkeypatch.setattr(haber_pdf, "PDF_FONT_KLASORLERI", [str(tmp_path)])
+    with pytest.raises(FileNotFoundError, match="yazı tipi"):
+        haber_pdf.RaporPDF("Beykoz")
+
+def test_sayfadan_uzun_satir_bolunur(monkeypatch):
+    pdf = haber_pdf.RaporPDF("Beykoz")
+    pdf.add_page()
+    cizilenler = []
+    ciz = pdf.text
+    def text(x, y, metin=""):
+        cizilenler.append((pdf.page, y, metin))
+        ciz(x, y, metin)
+    monkeypatch.setattr(pdf, "text", text)
+    
+    kelimeler = [f"kelime{sira}" for sira in range(4000)]
+    pdf.tablo(["Tarih", "Ayrıntı"], [30, 160], [("01.10.2026", " ".join(kelimeler)), ("02.10.2026", "son satır")])
+    
+    # Metnin tamamı sayfa sınırları içinde çizilir, hiçbir kelime kaybolmaz
+    assert pdf.page > 2
+    assert all(y <= pdf.page_break_trigger for _, y, _ in cizilenler)
+    assert " ".join(metin for _, _, metin in cizilenler if metin.startswith("kelime")).split() == kelimeler
+    assert cizilenler[-1][2] == "son satır"
+    assert cizilenler[-1][1] <= pdf.get_y() <= pdf.page_break_trigger
+    assert bytes(pdf.output()).startswith(b"%PDF")
@@ -0,0 +1,89 @@
+"""Tekrar kontrolü: içerik özeti dizini (KayitOzetleri) ve olası tekrarlar (yakin_tekrarlar)"""
+from datetime import date
+
+import pandas as pd
+
+from haber_arama import kayit_ozetleri
+from haber_veri import KIMLIK, KOLONLAR, VeriYazici, veri_hazirla, veri_kaydet, yakin_tekrarlar
+
+def test_ayni_oturumun_tekrari_yazilmaz(depo, kayitlar, tmp_path):
+    yazici = VeriYazici(depo, str(tmp_path / "yazma.kilit"))
+    kayit = kayitlar((date(2026, 10, 1), "Zabıta Müdürlüğü", "Diğer", 1, "kaldırım kırık"))
+    
+    assert yazici.ekle(kayit, oturum="a") == [1]
+    # Çift tıklama ya da yeniden çalıştırma: aynı oturum, aynı içerik
+    assert yazici.ekle(kayit, oturum="a") == []
+    # Başka oturumdan aynı içerik ayrı bir haberdir
+    assert yazici.ekle(kayit, oturum="b") == [2]
+    # Oturumsuz ekleme tekrar kontrolüne girmez
+    assert yazici.ekle(kayit) == [3]
+
+def test_form_kaydi_oturumla_yazilir(depo, tmp_path):
+    yazici = VeriYazici(depo, str(tmp_path / "yazma.kilit"))
+    form = (date(2026, 10, 1), ["Zabıta Müdürlüğü", "Fen İşleri Müdürlüğü"], "Diğer", 1, "kaldırım kırık")
+    
+    assert veri_kaydet(yazici, *form, oturum="a") == [1, 2]
+    assert veri_kaydet(yazici, *form, oturum="a") == []
+    # Depoya doğrudan yazmada tekrar kontrolü yoktur
+    assert veri_kaydet(depo, *form) == [3, 4]
+
+def test_tablodaki_tekrarlar_bir_kez_yazilir(depo, kayitlar, tmp_path):
+    yazici = VeriYazici(depo, str(tmp_path / "yazma.kilit"))
+    satir = (date(2026, 10, 1), "Zabıta Müdürlüğü", "Diğer", 1, "kaldırım kırık")
+    assert yazici.ekle(kayitlar(satir, satir), oturum="") == [1]
+
+def test_dizin_gunlukten_yeniden_okunur(depo, depo_ac, kayitlar, tmp_path):
+    kayit = kayitlar((date(2026, 10, 1), "Zabıta Müdürlüğü", "Diğer", 1, "kaldırım kırık"))
+    VeriYazici(depo, str(tmp_path / "yazma.kilit")).ekle(kayit, oturum="a")
+    
+    # Yeni süreçteki depo ve yazıcı aynı günlüğü okur
+    assert VeriYazici(depo_ac(), str(tmp_path / "yazma.kilit")).ekle(kayit, oturum="a") == []
+
+def test_duzenlenen_kayit_dizinden_cikar(depo, kayitlar, tmp_path):
+    yazici = VeriYazici(depo, str(tmp_path / "yazma.kilit"))
+    kayit = kayitlar((date(2026, 10, 1), "Zabıta Müdürlüğü", "Diğer", 1, "kaldırım kırık"))
+    yazici.ekle(kayit, oturum="a")
+    yazici.guncelle({1: {"Sayı": 2}}, pd.DataFrame(columns=KOLONLAR), [])
+    # Eski içerik artık depoda yok; yeniden gönderilebilir
+    assert yazici.ekle(kayit, oturum="a") == [2]
+
+def test_ozet_icerige_ve_oturuma_baglidir(kayitlar):
+    df = kayitlar(
+        (date(2026, 10, 1), "Zabıta Müdürlüğü", "Diğer", 1, "kaldırım kırık"),
+        (date(2026, 10, 1), "Zabıta Müdürlüğü", "Diğer", 1, " kaldırım kırık "),
+        (date(2026, 10, 1), "Zabıta Müdürlüğü", "Diğer", 2, "kaldırım kırık"),
+    )
+    ozetler = kayit_ozetleri(df)
+    assert ozetler[0] == ozetler[1]
+    assert ozetler[0] != ozetler[2]
+    assert kayit_ozetleri(df, "a")[0] != ozetler[0]
+    # Tiplenmiş tablo aynı özetleri verir (depodan okunan kayıtlar)
+    assert (kayit_ozetleri(veri_hazirla(df)) == ozetler).all()
+
+def test_yakin_tekrarlar(kayitlar):
+    df = veri_hazirla(kayitlar(
+        (date(2026, 10, 1), "Zabıta Müdürlüğü", "Diğer", 1, "Çöp konteyneri taşmış!"),
+        (date(2026, 10, 1), "Zabıta Müdürlüğü", "Diğer", 3, "cop  KONTEYNERI tasmis"),
+        (date(2026, 10, 2), "Zabıta Müdürlüğü", "Diğer", 1, "çöp konteyneri taşmış"),
+        (date(2026, 10, 1), "Fen İşleri Müdürlüğü", "Diğer", 1, "çöp konteyneri taşmış"),
+        (date(2026, 10, 2), "Fen İşleri Müdürlüğü", "Diğer", 1, "asfalt çukuru"),
+        (date(2026, 10, 2), "Fen İşleri Müdürlüğü", "Diğer", 1, "Asfalt çukuru."),
+    ))
+    df.insert(0, KIMLIK, [5, 2, 3, 4, 6, 1])
+    
+    tablo = yakin_tekrarlar(df)
+    
+    # Gruplar ilk kaydın kimliğine göre sıralı, grup içinde kimlik sırası
+    assert tablo[KIMLIK].tolist() == [1, 6, 2, 5]
+    assert tablo["Grup"].tolist() == [1, 1, 2, 2]
+    assert tablo["Adet"].tolist() == [2, 2, 2, 2]
+
+def test_tekrar_yoksa_bos_tablo(kayitlar):
+    df = veri_hazirla(kayitlar(
+        (date(2026, 10, 1), "Zabıta Müdürlüğü", "Diğer", 1, "kaldırım kırık"),
+        (date(2026, 10, 1), "Zabıta Müdürlüğü", "Diğer", 1, "asfalt çukuru"),
+    ))
+    df.insert(0, KIMLIK, [1, 2])
+    tablo = yakin_tekrarlar(df)
+    assert tablo.empty
+    assert "Grup" in tablo.columns
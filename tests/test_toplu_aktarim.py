@@ -0,0 +1,120 @@
+"""Excel/CSV arşivlerinden toplu aktarım (toplu_aktar)"""
+from datetime import date, datetime
+
+import pandas as pd
+import pytest
+
+from haber_veri import TUM_KAYITLAR, VeriYazici
+from toplu_aktarim import tarihleri_coz, toplu_aktar
+
+CSV_METNI = (
+    "Tarih;Müdürlük;Haber Kaynağı;Sayı;Ayrıntı\r\n"
+    "01.10.2024;Fen İşleri;beykoz anlik;2;Yol çalışması\r\n"
+    "2024-10-02;ZABITA MÜD.;Mahalle grubu;;Kaldırım işgali\r\n"
+    "45000;Temizlik İşleri Müdürlüğü;;1;Çöp toplanmadı\r\n"
+    "32.13.2024;Zabıta Müdürlüğü;;1;Tarihi bozuk\r\n"
+    "03.10.2024;Olmayan Müdürlüğü;;1;Müdürlüğü yok\r\n"
+    "03.10.2024;Zabıta Müdürlüğü;;0;Sayısı sıfır\r\n"
+)
+
+@pytest.fixture
+def yazici(depo, tmp_path):
+    return VeriYazici(depo, str(tmp_path / "yazma.kilit"))
+
+@pytest.fixture
+def csv_dosyasi(tmp_path):
+    yol = tmp_path / "arsiv.csv"
+    yol.write_bytes(CSV_METNI.encode("cp1254"))
+    return str(yol)
+
+def kayit_icerigi(depo):
+    df = depo.yukle().sort_values("Tarih")
+    return [
+        (tarih.date(), mudurluk, kaynak, sayi, ayrinti)
+        for tarih, mudurluk, kaynak, sayi, ayrinti
+        in df[["Tarih", "Müdürlük", "Haber_Kaynagi", "Sayı", "Ayrıntı"]].itertuples(index=False, name=None)
+    ]
+
+def test_excel_seri_numarasi_ve_tarih_nesneleri():
+    seri = pd.Series([45000, "45000", date(2024, 10, 1), datetime(2024, 10, 2, 14, 30), "15/03/2023", "", "yarın"])
+    assert tarihleri_coz(seri).tolist()[:5] == [
+        pd.Timestamp(2023, 3, 15), pd.Timestamp(2023, 3, 15), pd.Timestamp(2024, 10, 1),
+        pd.Timestamp(2024, 10, 2, 14, 30), pd.Timestamp(2023, 3, 15),
+    ]
+    assert tarihleri_coz(seri).iloc[5:].isna().all()
+
+def test_windows_1254_noktali_virgullu_csv(yazici, csv_dosyasi):
+    sonuc = toplu_aktar(csv_dosyasi, yazici)
+    
+    assert (sonuc.okunan, sonuc.eklenen, sonuc.hatali, sonuc.tekrar) == (6, 3, 3, 0)
+    assert kayit_icerigi(yazici.depo) == [
+        (date(2023, 3, 15), "Temizlik İşleri Müdürlüğü", "Diğer", 1, "Çöp toplanmadı"),
+        (date(2024, 10, 1), "Fen İşleri Müdürlüğü", "Beykoz Anlık", 2, "Yol çalışması"),
+        (date(2024, 10, 2), "Zabıta Müdürlüğü", "Mahalle grubu", 1, "Kaldırım işgali"),
+    ]
+    # Hatalı satırlar dosyadaki satır numaralarıyla raporlanır (1. satır başlık)
+    assert sonuc.hata_tablosu()[["Satır", "Hata"]].values.tolist() == [
+        [5, "Tarih okunamadı"],
+        [6, "Müdürlük listede yok"],
+        [7, "Sayı pozitif tam sayı olmalı"],
+    ]
+
+def test_xlsx(yazici, tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    kitap = openpyxl.Workbook()
+    sayfa = kitap.active
+    sayfa.append(["Tarih", "Müdürlük", "Ayrıntı"])
+    sayfa.append([datetime(2024, 10, 1), "Zabıta Müdürlüğü", "hücre tarihi"])
+    sayfa.append([45000, "fen işleri müdürlüğü", "seri numarası"])
+    sayfa.append([None, None, None])
+    sayfa.append(["01.10.2024", "", "müdürlüğü boş"])
+    yol = str(tmp_path / "arsiv.xlsx")
+    kitap.save(yol)
+    
+    sonuc = toplu_aktar(yol, yazici)
+    
+    # Tamamen boş satır sayılmaz; hatalı satır Excel satır numarasıyla raporlanır
+    assert (sonuc.okunan, sonuc.eklenen, sonuc.hatali) == (3, 2, 1)
+    assert sonuc.hata_tablosu()[["Satır", "Hata"]].values.tolist() == [[5, "Müdürlük boş"]]
+    assert kayit_icerigi(yazici.depo) == [
+        (date(2023, 3, 15), "Fen İşleri Müdürlüğü", "Diğer", 1, "seri numarası"),
+        (date(2024, 10, 1), "Zabıta Müdürlüğü", "Diğer", 1, "hücre tarihi"),
+    ]
+
+def test_ayni_dosya_ikinci_kez_eklenmez(yazici, csv_dosyasi):
+    toplu_aktar(csv_dosyasi, yazici)
+    sonuc = toplu_aktar(csv_dosyasi, yazici)
+    
+    assert (sonuc.eklenen, sonuc.tekrar, sonuc.hatali) == (0, 3, 3)
+    assert len(yazici.depo.sorgula(TUM_KAYITLAR)) == 3
+
+def test_kuru_aktarim_yazmaz(yazici, csv_dosyasi):
+    sonuc = toplu_aktar(csv_dosyasi, yazici, kuru=True)
+    assert (sonuc.okunan, sonuc.eklenen, sonuc.hatali) == (6, 3, 3)
+    assert yazici.depo.yukle().empty
+
+@pytest.mark.parametrize("yazdiktan_sonra", [False, True])
+def test_yazilamayan_parti_sayilir(yazici, csv_dosyasi, monkeypatch, yazdiktan_sonra):
+    depo = yazici.depo
+    ekle = depo.ekle
+    cagri = []
+    
+    def bozuk(df):
+        cagri.append(len(df))
+        if len(cagri) == 1:
+            return ekle(df)
+        if yazdiktan_sonra:
+            ekle(df)
+        raise OSError("disk dolu")
+    monkeypatch.setattr(depo, "ekle", bozuk)
+    
+    # Her parça (2 satır) ayrı partide yazılır; ikinci parti hata verir
+    sonuc = toplu_aktar(csv_dosyasi, yazici, parca_boyutu=2, yazma_partisi=1)
+    
+    assert sonuc.yazma_hatasi == "disk dolu"
+    if yazdiktan_sonra:
+        # Depoya girmiş kayıtlar eklenen sayılır
+        assert (sonuc.eklenen, sonuc.yazilamayan) == (3, 0)
+    else:
+        assert (sonuc.eklenen, sonuc.yazilamayan) == (2, 1)
+    assert len(depo.yukle()) == sonuc.eklenen
@@ -0,0 +1,409 @@
+"""Beykoz haber kayıtları: Excel/CSV arşivlerinden toplu aktarım
+
+Dosya parça parça okunur (openpyxl salt okunur kip / pandas parçalı okuyucu),
+her parça doğrulanıp şemaya çevrilir ve geçerli satırlar büyük partiler halinde
+yazılır; tüm dosya hiçbir zaman belleğe alınmaz. Tarihler farklı biçimlerden
+(Excel tarihi, gg.aa.yyyy, yyyy-aa-gg, ...) okunur, müdürlük adları kurumun
+müdürlük listesine eşlenir; eşlenemeyen satırlar hata raporuna yazılır.
+Depoda (ya da dosyanın önceki satırlarında) aynı içerikle bulunan kayıtlar
+yazılmaz, böylece aynı arşiv iki kez aktarıldığında kayıtlar çoğalmaz.
+
+Kullanım:
+    python toplu_aktarim.py arsiv_2019.xlsx --hata-dosyasi hatalar.csv
+    python toplu_aktarim.py eski_kayitlar.csv --kuru
+"""
+import argparse
+import csv
+import io
+import os
+import time
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+import pandas as pd
+
+from haber_veri import (
+    KOLONLAR, TUM_KAYITLAR, VARSAYILAN_KURUM, VERI_DEPOSU, YAZMA_KILIDI, ZAMAN_BICIMI,
+    VeriYazici, depo_olustur, metin_katla,
+)
+from anlik_goruntu import DegisiklikGecmisi
+
+# Okuma parçası ve yazma partisi (satır)
+OKUMA_PARCASI = 20_000
+YAZMA_PARTISI = 100_000
+
+# Raporda ayrıntısı tutulan en fazla hatalı satır (sayaç tüm hataları sayar)
+HATA_ORNEK_SINIRI = 5000
+
+# Kabul edilen tarih aralığı ve metin tarih biçimleri (sırayla denenir)
+EN_ESKI_TARIH = date(2000, 1, 1)
+TARIH_BICIMLERI = [
+    "%d.%m.%Y", "%d/%m/%Y", "%Y-%m-%d", "%d-%m-%Y", "%Y/%m/%d", "%d.%m.%y",
+    "%Y-%m-%d %H:%M:%S", "%d.%m.%Y %H:%M", "%d.%m.%Y %H:%M:%S", "%d/%m/%Y %H:%M",
+]
+
+# Excel seri tarihleri (1900 tarih sistemi) için makul aralık
+EXCEL_TARIH_BASLANGICI = "1899-12-30"
+EXCEL_SERI_ARALIGI = (20_000, 80_000)
+
+# Başlık adları katlanıp harf/rakam dışı karakterler atılarak eşlenir
+KOLON_ADLARI = {
+    "Tarih": ["tarih", "habertarihi"],
+    "Müdürlük": ["mudurluk", "mudurlukler", "ilgilimudurluk", "birim"],
+    "Haber_Kaynagi": ["haberkaynagi", "kaynak", "haberkaynak"],
+    "Sayı": ["sayi", "habersayi", "habersayisi", "adet"],
+    "Ayrıntı": ["ayrinti", "ayrintisikayet", "aciklama", "detay", "sikayet"],
+    "Kayit_Zamani": ["kayitzamani"],
+}
+ZORUNLU_KOLONLAR = ["Tarih", "Müdürlük"]
+
+def anahtarlar(metinler):
+    """Eşleştirme anahtarı: Türkçe küçük harf, aksansız, yalnızca harf ve rakam"""
+    return metin_katla(pd.Series(metinler, dtype=object)).str.replace(r"[^a-z0-9]+", "", regex=True)
+
+@lru_cache(maxsize=None)
+def _eslemeler(mudurlukler, kaynaklar):
+    """Katlanmış ad → listedeki ad: (müdürlük eşlemesi, kaynak eşlemesi)
+    
+    Müdürlüklerde "Fen İşleri", "FEN ISLERI MUD." gibi yazımlar da eşlenir.
+    Listeler önbellek anahtarı olabilmesi için demet olarak verilir.
+    """
+    mudurluk_eslemesi = {}
+    for mudurluk, anahtar in zip(mudurlukler, anahtarlar(list(mudurlukler))):
+        mudurluk_eslemesi[anahtar] = mudurluk
+        for ek in ("mudurlugu", "mudurluk", "mud"):
+            if anahtar.endswith(ek) and len(anahtar) > len(ek):
+                # Ek yazılmasa da kısaltılsa da aynı müdürlük
+                kok = anahtar[:-len(ek)]
+                for yazim in ("", "mudurlugu", "mudurluk", "mud"):
+                    mudurluk_eslemesi.setdefault(kok + yazim, mudurluk)
+    return mudurluk_eslemesi, dict(zip(anahtarlar(list(kaynaklar)), kaynaklar))
+
+def kurum_eslemeleri(kurum=None):
+    """Kurumun (varsayılan kurum) listelerine göre (müdürlük eşlemesi, kaynak eşlemesi)"""
+    kurum = kurum or VARSAYILAN_KURUM
+    return _eslemeler(tuple(kurum.mudurlukler), tuple(kurum.haber_kaynaklari))
+
+class AktarimSonucu:
+    """Toplu aktarımın sayaçları ve hatalı satır örnekleri"""
+    
+    def __init__(self, dosya_adi=""):
+        self.dosya_adi = dosya_adi
+        self.okunan = 0
+        self.eklenen = 0
+        self.tekrar = 0
+        self.hatali = 0
+        self.yazilamayan = 0
+        self.yazma_hatasi = None
+        self.hatalar = []
+        self.sure = 0.0
+    
+    def hata_ekle(self, satirlar, mesajlar, ham):
+        self.hatali += len(satirlar)
+        yer = HATA_ORNEK_SINIRI - len(self.hatalar)
+        if yer > 0:
+            ornek = ham.iloc[:yer].astype(str)
+            self.hatalar.extend(
+                {"Satır": satir, "Hata": mesaj, **degerler}
+                for satir, mesaj, degerler in zip(satirlar[:yer], mesajlar[:yer], ornek.to_dict("records"))
+            )
+    
+    def hata_tablosu(self):
+        return pd.DataFrame(self.hatalar)
+    
+    def hata_csv(self):
+        """Hata raporu (Excel'de açılabilen UTF-8 CSV)"""
+        return self.hata_tablosu().to_csv(index=False).encode("utf-8-sig")
+
+# ==================== OKUMA ====================
+
+def _xlsx_parcalari(dosya, parca_boyutu, sayfa=None):
+    """(ham parça, ilerleme oranı) çiftleri; parça indeksi Excel satır numarasıdır"""
+    from openpyxl import load_workbook
+    
+    kitap = load_workbook(dosya, read_only=True, data_only=True)
+    try:
+        tablo = kitap[sayfa] if sayfa else kitap.worksheets[0]
+        toplam = tablo.max_row or 0
+        satirlar = enumerate(tablo.iter_rows(values_only=True), start=1)
+        
+        # Başlık: ilk boş olmayan satır
+        basliklar = None
+        for _, satir in satirlar:
+            if any(deger not in (None, "") for deger in satir):
+                basliklar = [str(deger).strip() if deger is not None else "" for deger in satir]
+                break
+        if basliklar is None:
+            return
+        
+        tampon, numaralar = [], []
+        for satir_no, satir in satirlar:
+            tampon.append(satir[:len(basliklar)])
+            numaralar.append(satir_no)
+            if len(tampon) >= parca_boyutu:
+                yield pd.DataFrame(tampon, columns=basliklar, index=numaralar), satir_no / toplam if toplam else None
+                tampon, numaralar = [], []
+        if tampon:
+            yield pd.DataFrame(tampon, columns=basliklar, index=numaralar), 1.0
+    finally:
+        kitap.close()
+
+def _csv_parcalari(dosya, parca_boyutu):
+    """(ham parça, ilerleme oranı) çiftleri; kodlama (UTF-8/Windows-1254) ve ayraç dosyadan bulunur"""
+    kendimiz_actik = isinstance(dosya, (str, os.PathLike))
+    akis = open(dosya, "rb") if kendimiz_actik else dosya
+    try:
+        akis.seek(0, os.SEEK_END)
+        toplam = akis.tell()
+        akis.seek(0)
+        ornek = akis.read(64 * 1024)
+        akis.seek(0)
+        
+        try:
+            ornek.decode("utf-8")
+            kodlama = "utf-8-sig"
+        except UnicodeDecodeError as hata:
+            # Örnek çok baytlı bir harfin ortasında kesilmiş olabilir
+            kodlama = "utf-8-sig" if hata.start >= len(ornek) - 3 else "cp1254"
+        try:
+            ayrac = csv.Sniffer().sniff(ornek.decode(kodlama, errors="ignore"), delimiters=",;\t|").delimiter
+        except csv.Error:
+            ayrac = ","
+        
+        metin = io.TextIOWrapper(akis, encoding=kodlama, newline="")
+        okuyucu = pd.read_csv(
+            metin, sep=ayrac, dtype=str, keep_default_na=False, chunksize=parca_boyutu, skip_blank_lines=True
+        )
+        satir_no = 2  # 1. satır başlık
+        for parca in okuyucu:
+            parca.index = range(satir_no, satir_no + len(parca))
+            satir_no += len(parca)
+            yield parca, min(akis.tell() / toplam, 1.0) if toplam else None
+        metin.detach()
+    finally:
+        if kendimiz_actik:
+            akis.close()
+
+def ham_parcalar(dosya, parca_boyutu=OKUMA_PARCASI, sayfa=None, dosya_adi=None):
+    """Dosyayı uzantısına göre parça parça oku (dosya yolu ya da ikili dosya nesnesi)"""
+    dosya_adi = dosya_adi or getattr(dosya, "name", None) or str(dosya)
+    uzanti = os.path.splitext(dosya_adi)[1].lower()
+    if uzanti in (".xlsx", ".xlsm"):
+        return _xlsx_parcalari(dosya, parca_boyutu, sayfa)
+    if uzanti in (".csv", ".txt"):
+        return _csv_parcalari(dosya, parca_boyutu)
+    raise ValueError(f"Desteklenmeyen dosya türü: {uzanti or dosya_adi} (xlsx veya csv olmalı)")
+
+# ==================== DÖNÜŞTÜRME ====================
+
+def kolon_eslemesi(basliklar):
+    """Dosya başlığı → şema kolonu; zorunlu kolon yoksa ValueError"""
+    adlar = {ad: kolon for kolon, liste in KOLON_ADLARI.items() for ad in liste}
+    esleme = {}
+    for baslik, anahtar in zip(basliklar, anahtarlar([str(baslik) for baslik in basliklar])):
+        kolon = adlar.get(anahtar)
+        if kolon and kolon not in esleme.values():
+            esleme[baslik] = kolon
+    eksik = [kolon for kolon in ZORUNLU_KOLONLAR if kolon not in esleme.values()]
+    if eksik:
+        raise ValueError(f"Dosyada zorunlu kolon bulunamadı: {', '.join(eksik)} (başlıklar: {', '.join(map(str, basliklar))})")
+    return esleme
+
+def _bos_mu(seri):
+    return seri.isna() | (seri.astype(str).str.strip() == "")
+
+def tarihleri_coz(seri, bicimler=TARIH_BICIMLERI):
+    """Karışık biçimli tarih kolonunu datetime64'e çevir (çözülemeyen NaT)"""
+    sonuc = pd.Series(pd.NaT, index=seri.index, dtype="datetime64[ns]")
+    
+    # Excel hücresinden gelen tarih nesneleri
+    nesne = seri.map(lambda deger: isinstance(deger, (datetime, date)))
+    if nesne.any():
+        sonuc[nesne] = pd.to_datetime(seri[nesne], errors="coerce")
+    
+    # Excel seri numaraları (metin ya da sayı)
+    kalan = ~nesne & ~_bos_mu(seri)
+    sayilar = pd.to_numeric(seri[kalan], errors="coerce")
+    seri_no = sayilar.between(*EXCEL_SERI_ARALIGI)
+    if seri_no.any():
+        sonuc[seri_no[seri_no].index] = pd.to_datetime(
+            sayilar[seri_no], unit="D", origin=pd.Timestamp(EXCEL_TARIH_BASLANGICI)
+        )
+    
+    # Metin biçimleri sırayla; her biçim yalnızca hâlâ çözülmemiş satırlara uygulanır
+    metinler = seri[kalan & sonuc.isna()].astype(str).str.strip()
+    for bicim in bicimler:
+        if metinler.empty:
+            break
+        cozulen = pd.to_datetime(metinler, format=bicim, errors="coerce")
+        sonuc[cozulen.index[cozulen.notna()]] = cozulen[cozulen.notna()]
+        metinler = metinler[cozulen.isna()]
+    return sonuc
+
+def parca_donustur(ham, esleme, kayit_zamani, kurum=None):
+    """Ham parçayı kurumun listelerine göre şemaya çevir; (geçerli kayıtlar, hatalı satır numaraları, hata mesajları)"""
+    mudurluk_eslemesi, kaynak_eslemesi = kurum_eslemeleri(kurum)
+    df = ham.rename(columns=esleme)[[kolon for kolon in KOLONLAR if kolon in esleme.values()]]
+    hatalar = pd.Series("", index=df.index, dtype=object)
+    
+    def hata(maske, mesaj):
+        hatalar[maske & (hatalar == "")] = mesaj
+    
+    # Tamamen boş satırlar (ör. Excel'de biçimlendirilmiş boş satırlar) sessizce atlanır
+    bos = pd.concat([_bos_mu(ham[kolon]) for kolon in ham.columns], axis=1).all(axis=1)
+    df, hatalar = df[~bos], hatalar[~bos].copy()
+    
+    tarih = tarihleri_coz(df["Tarih"]).dt.normalize()
+    hata(tarih.isna(), "Tarih okunamadı")
+    hata((tarih < pd.Timestamp(EN_ESKI_TARIH)) | (tarih > pd.Timestamp(date.today() + timedelta(days=366))), "Tarih kabul edilen aralık dışında")
+    
+    mudurluk_metni = df["Müdürlük"].fillna("").astype(str).str.strip()
+    mudurluk = anahtarlar(mudurluk_metni).map(mudurluk_eslemesi)
+    hata(mudurluk_metni == "", "Müdürlük boş")
+    hata(mudurluk.isna(), "Müdürlük listede yok")
+    
+    if "Haber_Kaynagi" in df.columns:
+        kaynak_metni = df["Haber_Kaynagi"].fillna("").astype(str).str.strip()
+        kaynak = anahtarlar(kaynak_metni).map(kaynak_eslemesi)
+        # Listede olmayan kaynak serbest metin olarak kalır (formdaki "Diğer" gibi)
+        kaynak = kaynak.fillna(kaynak_metni).replace("", "Diğer")
+    else:
+        kaynak = pd.Series("Diğer", index=df.index)
+    
+    if "Sayı" in df.columns:
+        sayi_bos = _bos_mu(df["Sayı"])
+        sayi = pd.to_numeric(df["Sayı"].where(~sayi_bos, 1), errors="coerce")
+        hata(sayi.isna() | (sayi < 1) | (sayi % 1 != 0), "Sayı pozitif tam sayı olmalı")
+    else:
+        sayi = pd.Series(1, index=df.index)
+    
+    ayrinti = df["Ayrıntı"].fillna("").astype(str).str.strip() if "Ayrıntı" in df.columns else ""
+    zaman = pd.Series(pd.Timestamp(kayit_zamani), index=df.index)
+    if "Kayit_Zamani" in df.columns:
+        dosya_zamani = tarihleri_coz(df["Kayit_Zamani"], [ZAMAN_BICIMI] + TARIH_BICIMLERI)
+        zaman = dosya_zamani.fillna(zaman).dt.floor("s")
+    
+    gecerli = hatalar == ""
+    kayitlar = pd.DataFrame({
+        "Tarih": tarih,
+        "Müdürlük": mudurluk,
+        "Haber_Kaynagi": kaynak,
+        "Sayı": sayi,
+        "Ayrıntı": ayrinti,
+        "Kayit_Zamani": zaman,
+    }, index=df.index)[gecerli].astype({"Sayı": "int32", "Kayit_Zamani": "datetime64[ns]"})
+    return kayitlar.reset_index(drop=True), hatalar.index[~gecerli].tolist(), hatalar[~gecerli].tolist()
+
+# ==================== AKTARIM ====================
+
+def depodaki_kayit_sayisi(depo):
+    """Depodaki toplam kayıt sayısı (günlük özetten)"""
+    return int(depo.ozet(TUM_KAYITLAR)['Kayit'].sum())
+
+def toplu_aktar(dosya, hedef, dosya_adi=None, sayfa=None, kuru=False, ilerleme=None,
+                parca_boyutu=OKUMA_PARCASI, yazma_partisi=YAZMA_PARTISI, kurum=None):
+    """Dosyadaki kayıtları doğrulayıp hedef VeriYazici'ya partiler halinde ekle
+    
+    Müdürlük ve kaynak adları kurumun (varsayılan kurum) listelerine eşlenir.
+    Tekrar dizininde bulunan kayıtlar atlanır (sonuc.tekrar). kuru=True ise yalnızca
+    doğrulanır, yazılmaz ve tekrar kontrolü yapılmaz. ilerleme(sonuc, oran) her parçadan
+    sonra çağrılır (oran bilinmiyorsa None). AktarimSonucu döndürür; zorunlu kolonlar
+    yoksa ValueError yükselir ve hiçbir şey yazılmaz. Yazması hata veren partinin
+    depoya girmiş kayıtları eklenen, kalanı yazılamayan olarak sayılır (sonuc.yazma_hatasi).
+    """
+    baslangic = time.perf_counter()
+    dosya_adi = dosya_adi or getattr(dosya, "name", None) or str(dosya)
+    sonuc = AktarimSonucu(os.path.basename(dosya_adi))
+    kayit_zamani = datetime.now().replace(microsecond=0)
+    
+    esleme = None
+    parti, parti_boyutu = [], 0
+    
+    def yaz():
+        nonlocal parti, parti_boyutu
+        if parti and not kuru:
+            onceki = depodaki_kayit_sayisi(hedef.depo)
+            try:
+                # Oturumsuz özet: dosyadan gelen kayıt kim aktarırsa aktarsın aynı kayıttır.
+                # Parti süresiz beklenir; zaman aşımında yazıcı partiyi yine yazar, sayaçlar eksik kalırdı
+                eklenen = len(hedef.ekle(pd.concat(parti, ignore_index=True), oturum="", bekle=False).result())
+            except Exception as hata:
+                # Hata kayıtlar depoya girdikten sonra da (dizin ya da geçmiş yazılırken) olabilir;
+                # yazılanlar depodan sayılır. Başka oturumların eklemeleri sayılmasın diye parti boyuyla sınırlı
+                eklenen = min(max(depodaki_kayit_sayisi(hedef.depo) - onceki, 0), parti_boyutu)
+                sonuc.yazilamayan += parti_boyutu - eklenen
+                sonuc.yazma_hatasi = str(hata) or type(hata).__name__
+            else:
+                sonuc.tekrar += parti_boyutu - eklenen
+            sonuc.eklenen += eklenen
+        parti, parti_boyutu = [], 0
+    
+    for ham, oran in ham_parcalar(dosya, parca_boyutu, sayfa, dosya_adi):
+        if esleme is None:
+            esleme = kolon_eslemesi(list(ham.columns))
+        kayitlar, hatali_satirlar, mesajlar = parca_donustur(ham, esleme, kayit_zamani, kurum)
+        sonuc.okunan += len(kayitlar) + len(hatali_satirlar)
+        if hatali_satirlar:
+            sonuc.hata_ekle(hatali_satirlar, mesajlar, ham.loc[hatali_satirlar])
+        if len(kayitlar):
+            parti.append(kayitlar)
+            parti_boyutu += len(kayitlar)
+        if parti_boyutu >= yazma_partisi:
+            yaz()
+        if kuru:
+            sonuc.eklenen = sonuc.okunan - sonuc.hatali
+        if ilerleme:
+            ilerleme(sonuc, oran)
+    yaz()
+    
+    sonuc.sure = time.perf_counter() - baslangic
+    return sonuc
+
+def main():
+    ayristirici = argparse.ArgumentParser(description="Excel/CSV arşivinden toplu kayıt aktarımı")
+    ayristirici.add_argument("dosya", help=".xlsx veya .csv dosyası")
+    ayristirici.add_argument("--sayfa", help="Excel sayfa adı (varsayılan: ilk sayfa)")
+    ayristirici.add_argument("--depo", choices=["csv", "sqlite", "parquet"], default=VERI_DEPOSU)
+    ayristirici.add_argument("--kuru", action="store_true", help="yalnızca doğrula, yazma (tekrar kontrolü yapılmaz)")
+    ayristirici.add_argument("--hata-dosyasi", help="hatalı satırların yazılacağı CSV dosyası")
+    ayristirici.add_argument("--parti", type=int, default=YAZMA_PARTISI, help="tek yazmadaki en fazla kayıt")
+    argumanlar = ayristirici.parse_args()
+    
+    def ilerleme(sonuc, oran):
+        yuzde = f"%{oran * 100:.0f} " if oran is not None else ""
+        print(f"\r{yuzde}{sonuc.okunan:,} satır okundu, {sonuc.hatali:,} hatalı", end="", flush=True)
+    
+    # Uygulamayla aynı kilit: çalışan uygulama varken de yazmalar sıralanır
+    gecmis = DegisiklikGecmisi()
+    yazici = VeriYazici(depo_olustur(argumanlar.depo), YAZMA_KILIDI, gecmis=gecmis)
+    try:
+        sonuc = toplu_aktar(
+            argumanlar.dosya, yazici, sayfa=argumanlar.sayfa, kuru=argumanlar.kuru,
+            ilerleme=ilerleme, yazma_partisi=argumanlar.parti
+        )
+    except ValueError as hata:
+        ayristirici.exit(1, f"Hata: {hata}\n")
+    finally:
+        # Süren taban görüntüsü yazımı tamamlanmadan çıkılmaz
+        gecmis.bekle()
+    print()
+    
+    eylem = "geçerli (yazılmadı)" if argumanlar.kuru else "eklendi"
+    print(
+        f"{sonuc.okunan:,} satır okundu, {sonuc.eklenen:,} kayıt {eylem}, {sonuc.tekrar:,} tekrar atlandı, "
+        f"{sonuc.hatali:,} satır hatalı ({sonuc.sure:.1f} sn)"
+    )
+    if sonuc.yazma_hatasi:
+        print(f"{sonuc.yazilamayan:,} kayıt yazılamadı: {sonuc.yazma_hatasi}")
+    if sonuc.hatali:
+        if argumanlar.hata_dosyasi:
+            with open(argumanlar.hata_dosyasi, "wb") as f:
+                f.write(sonuc.hata_csv())
+            print(f"Hatalı satırlar: {argumanlar.hata_dosyasi}")
+        else:
+            print(sonuc.hata_tablosu()[["Satır", "Hata"]].head(20).to_string(index=False))
+    if sonuc.yazma_hatasi:
+        ayristirici.exit(1)
+
+if __name__ == "__main__":
+    main()